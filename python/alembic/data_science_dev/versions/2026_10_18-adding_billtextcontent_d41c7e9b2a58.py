@@ -0,0 +1,99 @@
+"""adding BillTextContent.
+
+Moves bill text out of bill_text into bill_text_content, where every distinct text is
+stored once and bill_text points at it. Existing texts are copied over uncompressed and
+left to TOAST, which compresses them with lz4.
+
+Downgrading copies the texts back, except those ingested with --compress-text: they are
+zstd frames that Postgres cannot decompress, and come back NULL.
+
+Revision ID: d41c7e9b2a58
+Revises: 9c4e2d7a1f36
+Create Date: 2026-10-18 19:12:44.508213
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+from python.orm import DataScienceDevBase
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# revision identifiers, used by Alembic.
+revision: str = "d41c7e9b2a58"
+down_revision: str | None = "9c4e2d7a1f36"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+schema = DataScienceDevBase.schema_name
+
+
+def upgrade() -> None:
+    """Upgrade."""
+    op.create_table(
+        "bill_text_content",
+        sa.Column("content_hash", sa.LargeBinary(), nullable=False),
+        sa.Column("compression", sa.String(), nullable=True),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("content", sa.LargeBinary(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_bill_text_content")),
+        sa.UniqueConstraint("content_hash", name=op.f("uq_bill_text_content_content_hash")),
+        schema=schema,
+    )
+    op.execute(f"ALTER TABLE {schema}.bill_text_content ALTER COLUMN content SET COMPRESSION lz4")
+    op.add_column("bill_text", sa.Column("content_id", sa.Integer(), nullable=True), schema=schema)
+    op.create_foreign_key(
+        op.f("fk_bill_text_content_id_bill_text_content"),
+        "bill_text",
+        "bill_text_content",
+        ["content_id"],
+        ["id"],
+        source_schema=schema,
+        referent_schema=schema,
+    )
+
+    op.execute(
+        f"""
+        INSERT INTO {schema}.bill_text_content (content_hash, size, content)
+        SELECT sha256(content), length(content), content
+        FROM (SELECT convert_to(text_content, 'UTF8') AS content FROM {schema}.bill_text) AS texts
+        WHERE content IS NOT NULL
+        ON CONFLICT (content_hash) DO NOTHING
+        """  # noqa: S608
+    )
+    op.execute(
+        f"""
+        UPDATE {schema}.bill_text AS bill_text
+        SET content_id = bill_text_content.id
+        FROM {schema}.bill_text_content
+        WHERE bill_text_content.content_hash = sha256(convert_to(bill_text.text_content, 'UTF8'))
+        """  # noqa: S608
+    )
+    op.drop_column("bill_text", "text_content", schema=schema)
+
+
+def downgrade() -> None:
+    """Downgrade."""
+    op.add_column("bill_text", sa.Column("text_content", sa.String(), nullable=True), schema=schema)
+    op.execute(
+        f"""
+        UPDATE {schema}.bill_text AS bill_text
+        SET text_content = convert_from(bill_text_content.content, 'UTF8')
+        FROM {schema}.bill_text_content
+        WHERE bill_text_content.id = bill_text.content_id AND bill_text_content.compression IS NULL
+        """  # noqa: S608
+    )
+    op.drop_constraint(
+        op.f("fk_bill_text_content_id_bill_text_content"), "bill_text", schema=schema, type_="foreignkey"
+    )
+    op.drop_column("bill_text", "content_id", schema=schema)
+    op.drop_table("bill_text_content", schema=schema)
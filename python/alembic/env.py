@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import re
 import sys
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
@@ -27,6 +28,7 @@ if base_class is None:
     raise RuntimeError(error)
 
 target_metadata = base_class.metadata
+unmanaged_tables = config.attributes.get("unmanaged_tables")
 logging.basicConfig(
     level="DEBUG",
     datefmt="%Y-%m-%dT%H:%M:%S%z",
@@ -83,6 +85,9 @@ def include_name(
     if type_ == "schema":
         # allows a database with multiple schemas to have separate alembic revisions
         return name == target_metadata.schema
+    if type_ == "table" and unmanaged_tables and name and re.fullmatch(unmanaged_tables, name):
+        # tables created at runtime are only compared when a model maps them
+        return any(table.name == name for table in target_metadata.tables.values())
     return True
 
 
@@ -2,38 +2,79 @@
 
 Loads legislators, bills, votes, vote records, and bill text into the data_science_dev database.
 Expects the parent directory to contain congress-tracker/ and congress-legislators/ as siblings.
+Bill and vote files are found and parsed in a process pool (see ingest_congress_files).
+Bills and votes are incremental: main.congress_file_manifest remembers the size, mtime and
+content hash of every file loaded, so later runs only parse the files that changed and
+upsert what they contain. Bill text documents are stored once per distinct content in
+main.bill_text_content, optionally zstd-compressed, and written with COPY.
 
 Usage:
     ingest-congress /path/to/parent/
     ingest-congress /path/to/parent/ --congress 118
     ingest-congress /path/to/parent/ --congress 118 --only bills
+    ingest-congress /path/to/parent/ --workers 4
+    ingest-congress /path/to/parent/ --only votes --full-scan
+    ingest-congress /path/to/parent/ --only bill-text --compress-text
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import sys
+from functools import partial
 from pathlib import Path  # noqa: TC003 needed at runtime for typer CLI argument
-from typing import TYPE_CHECKING, Annotated
+from typing import TYPE_CHECKING, Annotated, NamedTuple
 
-import orjson
 import typer
 import yaml
-from sqlalchemy import select
+from compression import zstd
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from python.common import configure_logger
+from python.data_science.ingest_congress_files import (
+    ManifestEntry,
+    ParsedBill,
+    iter_parsed,
+    read_json,
+    scan_bills,
+    scan_votes,
+    shard_dirs,
+    shard_key,
+)
 from python.orm.common import get_postgres_engine
-from python.orm.data_science_dev.congress import Bill, BillText, Legislator, LegislatorSocialMedia, Vote, VoteRecord
+from python.orm.data_science_dev.congress import (
+    Bill,
+    BillText,
+    BillTextContent,
+    CongressFileManifest,
+    Legislator,
+    LegislatorSocialMedia,
+    Vote,
+    VoteRecord,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
 
+    from sqlalchemy import Row, Select
+    from sqlalchemy.dialects.postgresql import Insert
     from sqlalchemy.engine import Engine
 
+    from python.data_science.ingest_congress_files import ParsedVote
+
 logger = logging.getLogger(__name__)
 
 BATCH_SIZE = 10_000
 
+# Rows fetched per round trip by the lookup queries, which stream instead of loading whole tables.
+LOOKUP_BATCH_SIZE = 50_000
+
+BILL_KEY = ("congress", "bill_type", "number")
+VOTE_KEY = ("congress", "chamber", "session", "number")
+
 app = typer.Typer(help="Ingest unitedstates/congress data into data_science_dev.")
 
 
@@ -43,11 +84,24 @@ def main(
         Path,
         typer.Argument(help="Parent directory containing congress-tracker/ and congress-legislators/"),
     ],
+    *,
     congress: Annotated[int | None, typer.Option(help="Only ingest a specific congress number")] = None,
     only: Annotated[
         str | None,
         typer.Option(help="Only run a specific step: legislators, social-media, bills, votes, bill-text"),
     ] = None,
+    workers: Annotated[
+        int | None,
+        typer.Option(help="Processes that parse bill and vote files. Defaults to the number of CPUs"),
+    ] = None,
+    full_scan: Annotated[
+        bool,
+        typer.Option(help="Parse every bill and vote file, not only those the manifest does not know"),
+    ] = False,
+    compress_text: Annotated[
+        bool,
+        typer.Option(help="Store new bill texts zstd-compressed instead of leaving it to TOAST"),
+    ] = False,
 ) -> None:
     """Ingest congress data from unitedstates/congress JSON files."""
     configure_logger(level="INFO")
@@ -75,9 +129,9 @@ def main(
     steps: dict[str, tuple] = {
         "legislators": (ingest_legislators, (engine, legislators_dir)),
         "legislators-social-media": (ingest_social_media, (engine, legislators_dir)),
-        "bills": (ingest_bills, (engine, congress_dirs)),
-        "votes": (ingest_votes, (engine, congress_dirs)),
-        "bill-text": (ingest_bill_text, (engine, congress_dirs)),
+        "bills": (partial(ingest_bills, full_scan=full_scan), (engine, congress_dirs, workers)),
+        "votes": (partial(ingest_votes, full_scan=full_scan), (engine, congress_dirs, workers)),
+        "bill-text": (partial(ingest_bill_text, compress=compress_text), (engine, congress_dirs)),
     }
 
     if only:
@@ -102,16 +156,9 @@ def _resolve_congress_dirs(data_dir: Path, congress: int | None) -> list[Path]:
     return sorted(path for path in data_dir.iterdir() if path.is_dir() and path.name.isdigit())
 
 
-def _flush_batch(session: Session, batch: list[object], label: str) -> int:
-    """Add a batch of ORM objects to the session and commit. Returns count added."""
-    if not batch:
-        return 0
-    session.add_all(batch)
-    session.commit()
-    count = len(batch)
-    logger.info("Committed %d %s", count, label)
-    batch.clear()
-    return count
+def _stream(session: Session, statement: Select) -> Iterator[Row]:
+    """Run a column-only select, fetching LOOKUP_BATCH_SIZE rows at a time."""
+    return iter(session.execute(statement.execution_options(yield_per=LOOKUP_BATCH_SIZE)))
 
 
 # ---------------------------------------------------------------------------
@@ -234,8 +281,10 @@ def ingest_social_media(engine: Engine, legislators_dir: Path) -> None:
     with Session(engine) as session:
         legislator_map = _build_legislator_map(session)
         existing_accounts = {
-            (account.legislator_id, account.platform)
-            for account in session.scalars(select(LegislatorSocialMedia)).all()
+            (legislator_id, sys.intern(platform))
+            for legislator_id, platform in _stream(
+                session, select(LegislatorSocialMedia.legislator_id, LegislatorSocialMedia.platform)
+            )
         }
         logger.info("Found %d existing social media accounts in DB", len(existing_accounts))
 
@@ -277,266 +326,399 @@ def ingest_social_media(engine: Engine, legislators_dir: Path) -> None:
     logger.info("Inserted %d new social media accounts, updated %d existing", total_inserted, total_updated)
 
 
-def _iter_voters(position_group: object) -> Iterator[dict]:
-    """Yield voter dicts from a vote position group (handles list, single dict, or string)."""
-    if isinstance(position_group, dict):
-        yield position_group
-    elif isinstance(position_group, list):
-        for voter in position_group:
-            if isinstance(voter, dict):
-                yield voter
-
-
 # ---------------------------------------------------------------------------
 # Bills
 # ---------------------------------------------------------------------------
 
 
-def ingest_bills(engine: Engine, congress_dirs: list[Path]) -> None:
-    """Load bill data.json files."""
+def ingest_bills(
+    engine: Engine,
+    congress_dirs: list[Path],
+    max_workers: int | None = None,
+    *,
+    full_scan: bool = False,
+) -> None:
+    """Upsert the bills of new and changed data.json files, parsed in max_workers processes."""
     with Session(engine) as session:
-        existing_bills = {(bill.congress, bill.bill_type, bill.number) for bill in session.scalars(select(Bill)).all()}
-        logger.info("Found %d existing bills in DB", len(existing_bills))
+        manifest = {} if full_scan else _load_manifest(session, congress_dirs, "bills")
+        scans = iter_parsed(
+            scan_bills,
+            shard_dirs(congress_dirs, "bills"),
+            max_workers,
+            root=_data_dir(congress_dirs),
+            manifest=manifest,
+        )
+
+        total_upserted = 0
+        unchanged = 0
+        batch: dict[tuple[int, str, int], ParsedBill] = {}
+        files: list[ManifestEntry] = []
+        for scan in scans:
+            batch.update((bill.key, bill) for bill in scan.records)
+            files.extend(scan.files)
+            unchanged += scan.unchanged
+            if len(files) >= BATCH_SIZE:
+                total_upserted += _upsert_bills(session, batch, files)
+
+        total_upserted += _upsert_bills(session, batch, files)
+    logger.info("Upserted %d bills total, %d files unchanged", total_upserted, unchanged)
+
+
+def _upsert_bills(session: Session, batch: dict[tuple[int, str, int], ParsedBill], files: list[ManifestEntry]) -> int:
+    """Upsert a batch of bills with one multi-row INSERT ... ON CONFLICT, record their files and commit.
+
+    Returns count upserted.
+    """
+    if batch:
+        statement = insert(Bill.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=BILL_KEY,
+            set_=_updated_columns(statement, ParsedBill._fields, BILL_KEY),
+        )
+        session.execute(statement, [bill._asdict() for bill in batch.values()])
+    _record_files(session, files)
+    session.commit()
+
+    count = len(batch)
+    logger.info("Committed %d bills from %d files", count, len(files))
+    batch.clear()
+    files.clear()
+    return count
 
-        total_inserted = 0
-        batch: list[Bill] = []
-        for congress_dir in congress_dirs:
-            bills_dir = congress_dir / "bills"
-            if not bills_dir.is_dir():
-                continue
-            logger.info("Scanning bills from %s", congress_dir.name)
-            for bill_file in bills_dir.rglob("data.json"):
-                data = _read_json(bill_file)
-                if data is None:
-                    continue
-                bill = _parse_bill(data, existing_bills)
-                if bill is not None:
-                    batch.append(bill)
-                    if len(batch) >= BATCH_SIZE:
-                        total_inserted += _flush_batch(session, batch, "bills")
-
-        total_inserted += _flush_batch(session, batch, "bills")
-    logger.info("Inserted %d new bills total", total_inserted)
-
-
-def _parse_bill(data: dict, existing_bills: set[tuple[int, str, int]]) -> Bill | None:
-    """Parse a bill data.json dict into a Bill ORM object, skipping existing."""
-    raw_congress = data.get("congress")
-    bill_type = data.get("bill_type")
-    raw_number = data.get("number")
-    if raw_congress is None or bill_type is None or raw_number is None:
-        return None
-    congress = int(raw_congress)
-    number = int(raw_number)
-    if (congress, bill_type, number) in existing_bills:
-        return None
 
-    sponsor_bioguide = None
-    sponsor = data.get("sponsor")
-    if sponsor:
-        sponsor_bioguide = sponsor.get("bioguide_id")
-
-    return Bill(
-        congress=congress,
-        bill_type=bill_type,
-        number=number,
-        title=data.get("short_title") or data.get("official_title"),
-        title_short=data.get("short_title"),
-        official_title=data.get("official_title"),
-        status=data.get("status"),
-        status_at=data.get("status_at"),
-        sponsor_bioguide_id=sponsor_bioguide,
-        subjects_top_term=data.get("subjects_top_term"),
+# ---------------------------------------------------------------------------
+# Manifest of ingested files
+# ---------------------------------------------------------------------------
+
+
+def _data_dir(congress_dirs: list[Path]) -> Path | None:
+    """Directory holding the congress directories, which manifest paths are relative to."""
+    return congress_dirs[0].parent if congress_dirs else None
+
+
+def _load_manifest(session: Session, congress_dirs: list[Path], kind: str) -> dict[str, dict[str, ManifestEntry]]:
+    """Load the manifest entries of kind ("bills" or "votes") for congress_dirs, grouped by shard_key."""
+    manifest: dict[str, dict[str, ManifestEntry]] = {}
+    if not congress_dirs:
+        return manifest
+    statement = select(
+        CongressFileManifest.path,
+        CongressFileManifest.size,
+        CongressFileManifest.mtime_ns,
+        CongressFileManifest.content_hash,
+    ).where(or_(*(CongressFileManifest.path.startswith(f"{path.name}/{kind}/") for path in congress_dirs)))
+    for row in _stream(session, statement):
+        entry = ManifestEntry(*row)
+        manifest.setdefault(shard_key(entry.path), {})[entry.path] = entry
+    logger.info("Loaded %d %s manifest entries", sum(map(len, manifest.values())), kind)
+    return manifest
+
+
+def _record_files(session: Session, files: list[ManifestEntry]) -> None:
+    """Upsert manifest entries in the session's transaction, so they commit with the rows read from them."""
+    if not files:
+        return
+    statement = insert(CongressFileManifest.__table__)
+    statement = statement.on_conflict_do_update(
+        index_elements=["path"],
+        set_=_updated_columns(statement, ManifestEntry._fields, ("path",)),
     )
+    session.execute(statement, [entry._asdict() for entry in files])
+
+
+def _updated_columns(statement: Insert, columns: Iterable[str], key: Iterable[str]) -> dict[str, object]:
+    """SET clause of an upsert: every non-key column from the proposed row, and a fresh updated timestamp."""
+    return {column: statement.excluded[column] for column in columns if column not in key} | {"updated": func.now()}
 
 
 # ---------------------------------------------------------------------------
 # Votes (and vote records)
 # ---------------------------------------------------------------------------
 
+VOTE_RECORD_COLUMNS = ("vote_id", "legislator_id", "position")
+VOTE_RECORD_STAGING = "vote_record_staging"
+
 
-def ingest_votes(engine: Engine, congress_dirs: list[Path]) -> None:
-    """Load vote data.json files with their vote records."""
+def ingest_votes(
+    engine: Engine,
+    congress_dirs: list[Path],
+    max_workers: int | None = None,
+    *,
+    full_scan: bool = False,
+) -> None:
+    """Upsert the votes and vote records of new and changed data.json files, parsed in max_workers processes."""
     with Session(engine) as session:
         legislator_map = _build_legislator_map(session)
         logger.info("Loaded %d legislators into lookup map", len(legislator_map))
         bill_map = _build_bill_map(session)
         logger.info("Loaded %d bills into lookup map", len(bill_map))
-        existing_votes = {
-            (vote.congress, vote.chamber, vote.session, vote.number) for vote in session.scalars(select(Vote)).all()
-        }
-        logger.info("Found %d existing votes in DB", len(existing_votes))
+        manifest = {} if full_scan else _load_manifest(session, congress_dirs, "votes")
+        scans = iter_parsed(
+            scan_votes,
+            shard_dirs(congress_dirs, "votes"),
+            max_workers,
+            root=_data_dir(congress_dirs),
+            manifest=manifest,
+        )
 
-        total_inserted = 0
-        batch: list[Vote] = []
-        for congress_dir in congress_dirs:
-            votes_dir = congress_dir / "votes"
-            if not votes_dir.is_dir():
-                continue
-            logger.info("Scanning votes from %s", congress_dir.name)
-            for vote_file in votes_dir.rglob("data.json"):
-                data = _read_json(vote_file)
-                if data is None:
-                    continue
-                vote = _parse_vote(data, legislator_map, bill_map, existing_votes)
-                if vote is not None:
-                    batch.append(vote)
-                    if len(batch) >= BATCH_SIZE:
-                        total_inserted += _flush_batch(session, batch, "votes")
+        total_upserted = 0
+        unchanged = 0
+        batch: dict[tuple[int, str, int, int], ParsedVote] = {}
+        files: list[ManifestEntry] = []
+        for scan in scans:
+            batch.update((vote.key, vote) for vote in scan.records)
+            files.extend(scan.files)
+            unchanged += scan.unchanged
+            if len(files) >= BATCH_SIZE:
+                total_upserted += _upsert_votes(session, batch, files, legislator_map, bill_map)
 
-        total_inserted += _flush_batch(session, batch, "votes")
-    logger.info("Inserted %d new votes total", total_inserted)
+        total_upserted += _upsert_votes(session, batch, files, legislator_map, bill_map)
+    logger.info("Upserted %d votes total, %d files unchanged", total_upserted, unchanged)
 
 
 def _build_legislator_map(session: Session) -> dict[str, int]:
     """Build a mapping of bioguide_id -> legislator.id."""
-    return {legislator.bioguide_id: legislator.id for legislator in session.scalars(select(Legislator)).all()}
+    statement = select(Legislator.bioguide_id, Legislator.id)
+    return dict(_stream(session, statement))
 
 
 def _build_bill_map(session: Session) -> dict[tuple[int, str, int], int]:
-    """Build a mapping of (congress, bill_type, number) -> bill.id."""
-    return {(bill.congress, bill.bill_type, bill.number): bill.id for bill in session.scalars(select(Bill)).all()}
+    """Build a mapping of (congress, bill_type, number) -> bill.id.
+
+    There are only a handful of bill types, so they are interned rather than kept as one
+    string per bill.
+    """
+    statement = select(Bill.congress, Bill.bill_type, Bill.number, Bill.id)
+    return {
+        (congress, sys.intern(bill_type), number): bill_id
+        for congress, bill_type, number, bill_id in _stream(session, statement)
+    }
 
 
-def _parse_vote(
-    data: dict,
+def _upsert_votes(
+    session: Session,
+    batch: dict[tuple[int, str, int, int], ParsedVote],
+    files: list[ManifestEntry],
     legislator_map: dict[str, int],
     bill_map: dict[tuple[int, str, int], int],
-    existing_votes: set[tuple[int, str, int, int]],
-) -> Vote | None:
-    """Parse a vote data.json dict into a Vote ORM object with records."""
-    raw_congress = data.get("congress")
-    chamber = data.get("chamber")
-    raw_number = data.get("number")
-    vote_date = data.get("date")
-    if raw_congress is None or chamber is None or raw_number is None or vote_date is None:
-        return None
+) -> int:
+    """Upsert a batch of votes, replace their records, record their files and commit. Returns count upserted.
+
+    The votes go in with INSERT ... ON CONFLICT DO UPDATE RETURNING, which maps each vote's
+    natural key to its id. Records of updated votes are deleted, and the records of the
+    whole batch are COPYed in one go.
+    """
+    vote_ids: dict[tuple[int, str, int, int], int] = {}
+    records: list[tuple[int, int, str]] = []
+    if batch:
+        rows = _vote_rows(batch.values(), bill_map)
+        statement = insert(Vote.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=VOTE_KEY,
+            set_=_updated_columns(statement, rows[0], VOTE_KEY),
+        ).returning(Vote.id, Vote.congress, Vote.chamber, Vote.session, Vote.number)
+        vote_ids = {
+            (congress, chamber, session_number, number): vote_id
+            for vote_id, congress, chamber, session_number, number in session.execute(statement, rows)
+        }
+        session.execute(delete(VoteRecord.__table__).where(VoteRecord.vote_id.in_(vote_ids.values())))
+        records = _vote_record_rows(batch.values(), vote_ids, legislator_map)
+        _copy_vote_records(session, records)
+    _record_files(session, files)
+    session.commit()
 
-    raw_session = data.get("session")
-    if raw_session is None:
-        return None
+    logger.info("Committed %d votes with %d vote records from %d files", len(vote_ids), len(records), len(files))
+    batch.clear()
+    files.clear()
+    return len(vote_ids)
 
-    congress = int(raw_congress)
-    number = int(raw_number)
-    session_number = int(raw_session)
 
-    # Normalize chamber from "h"/"s" to "House"/"Senate"
-    chamber_normalized = {"h": "House", "s": "Senate"}.get(chamber, chamber)
+def _vote_rows(batch: Iterable[ParsedVote], bill_map: dict[tuple[int, str, int], int]) -> list[dict]:
+    """Build vote table rows, resolving each vote's bill to its id."""
+    rows: list[dict] = []
+    for vote in batch:
+        row = vote._asdict()
+        bill = row.pop("bill")
+        del row["positions"]
+        row["bill_id"] = bill_map.get(bill) if bill else None
+        rows.append(row)
+    return rows
 
-    if (congress, chamber_normalized, session_number, number) in existing_votes:
-        return None
 
-    # Resolve linked bill
-    bill_id = None
-    bill_ref = data.get("bill")
-    if bill_ref:
-        bill_key = (
-            int(bill_ref.get("congress", congress)),
-            bill_ref.get("type"),
-            int(bill_ref.get("number", 0)),
+def _vote_record_rows(
+    batch: Iterable[ParsedVote],
+    vote_ids: dict[tuple[int, str, int, int], int],
+    legislator_map: dict[str, int],
+) -> list[tuple[int, int, str]]:
+    """Build (vote_id, legislator_id, position) rows for the inserted votes' voters that are known legislators."""
+    records: list[tuple[int, int, str]] = []
+    for vote in batch:
+        vote_id = vote_ids.get(vote.key)
+        if vote_id is None:
+            continue
+        for bioguide_id, position in vote.positions:
+            legislator_id = legislator_map.get(bioguide_id)
+            if legislator_id is not None:
+                records.append((vote_id, legislator_id, position))
+    return records
+
+
+def _copy_vote_records(session: Session, records: list[tuple[int, int, str]]) -> None:
+    """COPY vote records into a temporary table and move them into vote_record, skipping duplicates.
+
+    COPY cannot skip conflicting rows itself, and a voter listed under two positions would
+    otherwise abort the whole batch.
+    """
+    if not records:
+        return
+    table = VoteRecord.__table__.fullname
+    columns = ", ".join(VOTE_RECORD_COLUMNS)
+    connection = session.connection().connection.driver_connection
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE IF NOT EXISTS {VOTE_RECORD_STAGING} (LIKE {table}) ON COMMIT DELETE ROWS"
+        )
+        with cursor.copy(f"COPY {VOTE_RECORD_STAGING} ({columns}) FROM STDIN") as copy:
+            for record in records:
+                copy.write_row(record)
+        cursor.execute(
+            f"""
+            INSERT INTO {table} ({columns})
+            SELECT {columns} FROM {VOTE_RECORD_STAGING}
+            ON CONFLICT DO NOTHING
+            """  # noqa: S608
         )
-        bill_id = bill_map.get(bill_key)
 
-    raw_votes = data.get("votes", {})
-    vote_counts = _count_votes(raw_votes)
-    vote_records = _build_vote_records(raw_votes, legislator_map)
-
-    return Vote(
-        congress=congress,
-        chamber=chamber_normalized,
-        session=session_number,
-        number=number,
-        vote_type=data.get("type"),
-        question=data.get("question"),
-        result=data.get("result"),
-        result_text=data.get("result_text"),
-        vote_date=vote_date[:10] if isinstance(vote_date, str) else vote_date,
-        bill_id=bill_id,
-        vote_records=vote_records,
-        **vote_counts,
-    )
 
+# ---------------------------------------------------------------------------
+# Bill Text
+# ---------------------------------------------------------------------------
 
-def _count_votes(raw_votes: dict) -> dict[str, int]:
-    """Count voters per position category, correctly handling dict and list formats."""
-    yea_count = 0
-    nay_count = 0
-    not_voting_count = 0
-    present_count = 0
-
-    for position, position_group in raw_votes.items():
-        voter_count = sum(1 for _ in _iter_voters(position_group))
-        if position in ("Yea", "Aye"):
-            yea_count += voter_count
-        elif position in ("Nay", "No"):
-            nay_count += voter_count
-        elif position == "Not Voting":
-            not_voting_count += voter_count
-        elif position == "Present":
-            present_count += voter_count
+BILL_TEXT_COLUMNS = ("bill_id", "version_code", "version_name", "date", "content_id")
+BILL_TEXT_CONTENT_COLUMNS = ("content_hash", "compression", "size", "content")
 
-    return {
-        "yea_count": yea_count,
-        "nay_count": nay_count,
-        "not_voting_count": not_voting_count,
-        "present_count": present_count,
-    }
+# Documents held in memory before a batch is written, in bytes.
+BILL_TEXT_BATCH_BYTES = 64 * 1024 * 1024
 
 
-def _build_vote_records(raw_votes: dict, legislator_map: dict[str, int]) -> list[VoteRecord]:
-    """Build VoteRecord objects from raw vote data."""
-    records: list[VoteRecord] = []
-    for position, position_group in raw_votes.items():
-        for voter in _iter_voters(position_group):
-            bioguide_id = voter.get("id")
-            if not bioguide_id:
-                continue
-            legislator_id = legislator_map.get(bioguide_id)
-            if legislator_id is None:
-                continue
-            records.append(
-                VoteRecord(
-                    legislator_id=legislator_id,
-                    position=position,
-                )
-            )
-    return records
+class BillTextVersion(NamedTuple):
+    """A bill_text row, with the SHA-256 of its document in place of the content id."""
 
+    bill_id: int
+    version_code: str
+    version_name: str | None
+    date: str | None
+    content_hash: bytes | None
 
-# ---------------------------------------------------------------------------
-# Bill Text
-# ---------------------------------------------------------------------------
 
+def ingest_bill_text(engine: Engine, congress_dirs: list[Path], *, compress: bool = False) -> None:
+    """Load bill text from text-versions directories, storing each distinct document once.
 
-def ingest_bill_text(engine: Engine, congress_dirs: list[Path]) -> None:
-    """Load bill text from text-versions directories."""
+    Args:
+        engine (Engine): data_science_dev engine.
+        congress_dirs (list[Path]): Congress directories to scan.
+        compress (bool, optional): Store new documents as zstd frames rather than leaving compression to TOAST.
+    """
     with Session(engine) as session:
         bill_map = _build_bill_map(session)
         logger.info("Loaded %d bills into lookup map", len(bill_map))
-        existing_bill_texts = {
-            (bill_text.bill_id, bill_text.version_code) for bill_text in session.scalars(select(BillText)).all()
-        }
+        existing_bill_texts = _load_bill_text_keys(session)
         logger.info("Found %d existing bill text versions in DB", len(existing_bill_texts))
+        content_ids = _load_content_ids(session)
+        logger.info("Found %d distinct bill texts in DB", len(content_ids))
 
         total_inserted = 0
-        batch: list[BillText] = []
+        versions: list[BillTextVersion] = []
+        contents: dict[bytes, bytes] = {}
+        content_bytes = 0
         for congress_dir in congress_dirs:
             logger.info("Scanning bill texts from %s", congress_dir.name)
-            for bill_text in _iter_bill_texts(congress_dir, bill_map, existing_bill_texts):
-                batch.append(bill_text)
-                if len(batch) >= BATCH_SIZE:
-                    total_inserted += _flush_batch(session, batch, "bill texts")
-
-        total_inserted += _flush_batch(session, batch, "bill texts")
+            for version, document in _iter_bill_texts(congress_dir, bill_map, existing_bill_texts):
+                versions.append(version)
+                content_hash = version.content_hash
+                if document is not None and content_hash not in content_ids and content_hash not in contents:
+                    contents[content_hash] = document
+                    content_bytes += len(document)
+                if len(versions) >= BATCH_SIZE or content_bytes >= BILL_TEXT_BATCH_BYTES:
+                    total_inserted += _copy_bill_texts(session, versions, contents, content_ids, compress=compress)
+                    content_bytes = 0
+
+        total_inserted += _copy_bill_texts(session, versions, contents, content_ids, compress=compress)
     logger.info("Inserted %d new bill text versions total", total_inserted)
 
 
+def _load_bill_text_keys(session: Session) -> set[tuple[int, str]]:
+    """Load the (bill_id, version_code) of every stored bill text, without the text itself."""
+    statement = select(BillText.bill_id, BillText.version_code)
+    return {(bill_id, sys.intern(version_code)) for bill_id, version_code in _stream(session, statement)}
+
+
+def _load_content_ids(session: Session) -> dict[bytes, int]:
+    """Map the hash of every stored bill text document to its bill_text_content id, without the document."""
+    return dict(_stream(session, select(BillTextContent.content_hash, BillTextContent.id)))
+
+
+def _copy_bill_texts(
+    session: Session,
+    versions: list[BillTextVersion],
+    contents: dict[bytes, bytes],
+    content_ids: dict[bytes, int],
+    *,
+    compress: bool,
+) -> int:
+    """COPY a batch of new documents into bill_text_content, then the versions pointing at them into bill_text.
+
+    content_ids gains the ids of the new documents, so later batches do not store them again.
+    Returns the number of versions inserted.
+    """
+    if not versions:
+        return 0
+    connection = session.connection().connection.driver_connection
+    with connection.cursor() as cursor:
+        if contents:
+            columns = ", ".join(BILL_TEXT_CONTENT_COLUMNS)
+            with cursor.copy(
+                f"COPY {BillTextContent.__table__.fullname} ({columns}) FROM STDIN (FORMAT BINARY)"
+            ) as copy:
+                copy.set_types(["bytea", "text", "int4", "bytea"])
+                for content_hash, document in contents.items():
+                    copy.write_row(_content_row(content_hash, document, compress=compress))
+            statement = select(BillTextContent.content_hash, BillTextContent.id).where(
+                BillTextContent.content_hash.in_(list(contents))
+            )
+            content_ids.update(session.execute(statement).tuples())
+
+        columns = ", ".join(BILL_TEXT_COLUMNS)
+        with cursor.copy(f"COPY {BillText.__table__.fullname} ({columns}) FROM STDIN") as copy:
+            for version in versions:
+                copy.write_row((*version[:-1], content_ids.get(version.content_hash)))
+    session.commit()
+
+    count = len(versions)
+    logger.info("Committed %d bill text versions with %d new documents", count, len(contents))
+    versions.clear()
+    contents.clear()
+    return count
+
+
+def _content_row(content_hash: bytes, document: bytes, *, compress: bool) -> tuple[bytes, str | None, int, bytes]:
+    """Build a (content_hash, compression, size, content) bill_text_content row."""
+    if not compress:
+        return content_hash, None, len(document), document
+    return content_hash, "zstd", len(document), zstd.compress(document)
+
+
 def _iter_bill_texts(
     congress_dir: Path,
     bill_map: dict[tuple[int, str, int], int],
     existing_bill_texts: set[tuple[int, str]],
-) -> Iterator[BillText]:
-    """Yield BillText objects for a single congress directory, skipping existing."""
+) -> Iterator[tuple[BillTextVersion, bytes | None]]:
+    """Yield each new text version in a congress directory with its document.
+
+    Documents are not streamed: each is read whole and decoded once to check it is UTF-8.
+    ingest_bill_text then holds a batch's new documents, up to BILL_TEXT_BATCH_BYTES, until
+    it writes them.
+    """
     bills_dir = congress_dir / "bills"
     if not bills_dir.is_dir():
         return
@@ -556,15 +738,16 @@ def _iter_bill_texts(
                 continue
             if (bill_id, version_dir.name) in existing_bill_texts:
                 continue
-            text_content = _read_bill_text(version_dir)
-            version_data = _read_json(version_dir / "data.json")
-            yield BillText(
+            document = _read_bill_text(version_dir)
+            version_data = read_json(version_dir / "data.json")
+            version = BillTextVersion(
                 bill_id=bill_id,
                 version_code=version_dir.name,
                 version_name=version_data.get("version_name") if version_data else None,
                 date=version_data.get("issued_on") if version_data else None,
-                text_content=text_content,
+                content_hash=hashlib.sha256(document).digest() if document is not None else None,
             )
+            yield version, document
 
 
 def _bill_key_from_dir(bill_dir: Path, congress_dir: Path) -> tuple[int, str, int] | None:
@@ -579,35 +762,22 @@ def _bill_key_from_dir(bill_dir: Path, congress_dir: Path) -> tuple[int, str, in
     return (congress, bill_type, int(number_str))
 
 
-def _read_bill_text(version_dir: Path) -> str | None:
-    """Read bill text from a version directory, preferring .txt over .xml."""
+def _read_bill_text(version_dir: Path) -> bytes | None:
+    """Read a UTF-8 bill text document from a version directory, preferring .txt over .xml."""
     for extension in ("txt", "htm", "html", "xml"):
         candidates = list(version_dir.glob(f"document.{extension}"))
         if not candidates:
             candidates = list(version_dir.glob(f"*.{extension}"))
         if candidates:
             try:
-                return candidates[0].read_text(encoding="utf-8")
+                document = candidates[0].read_bytes()
+                document.decode()
             except Exception:
                 logger.exception("Failed to read %s", candidates[0])
+            else:
+                return document
     return None
 
 
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-
-def _read_json(path: Path) -> dict | None:
-    """Read and parse a JSON file, returning None on failure."""
-    try:
-        return orjson.loads(path.read_bytes())
-    except FileNotFoundError:
-        return None
-    except Exception:
-        logger.exception("Failed to parse %s", path)
-        return None
-
-
 if __name__ == "__main__":
     app()
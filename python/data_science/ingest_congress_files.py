@@ -0,0 +1,350 @@
+"""Parallel discovery and parsing of the unitedstates/congress data.json files.
+
+A full congress tree holds hundreds of thousands of data.json files. The bills and votes
+directories are split into shards (bills/<bill_type>/ and votes/<session>/), and every
+shard is walked and parsed with orjson in a worker process. Workers send back ParsedBill
+and ParsedVote tuples of plain values, so the main process is left with deduplication
+and database writes.
+
+Given the manifest of files already ingested, a worker skips files whose size and mtime
+are unchanged without reading them, and files whose content hash is unchanged without
+parsing them. Every file it did read comes back as a ManifestEntry, to be recorded once
+its records are written.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import orjson
+
+from python.parallelize import iter_parallelize_process
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Mapping
+
+logger = logging.getLogger(__name__)
+
+DATA_FILE = "data.json"
+
+# Per-version data.json files under a bill, which describe text versions rather than bills.
+BILL_TEXT_DIR = "text-versions"
+
+CHAMBERS = {"h": "House", "s": "Senate"}
+
+# Shards sit at <congress>/<kind>/<shard> below the data directory.
+SHARD_DEPTH = 3
+
+
+class ManifestEntry(NamedTuple):
+    """Size, mtime and content hash of a data.json; path is relative to the data directory."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+
+class ShardScan[T](NamedTuple):
+    """What a worker found in one shard.
+
+    records holds the parsed new and changed files, files the manifest entries of every
+    file that was read, and unchanged counts the files skipped thanks to the manifest.
+    """
+
+    records: list[T]
+    files: list[ManifestEntry]
+    unchanged: int
+
+
+class ParsedBill(NamedTuple):
+    """Fields of a Bill read from a bill's data.json."""
+
+    congress: int
+    bill_type: str
+    number: int
+    title: str | None
+    title_short: str | None
+    official_title: str | None
+    status: str | None
+    status_at: str | None
+    sponsor_bioguide_id: str | None
+    subjects_top_term: str | None
+
+    @property
+    def key(self) -> tuple[int, str, int]:
+        """Natural key (congress, bill_type, number)."""
+        return self.congress, self.bill_type, self.number
+
+
+class ParsedVote(NamedTuple):
+    """Fields of a Vote read from a vote's data.json.
+
+    bill is the (congress, bill_type, number) key of the bill voted on, and positions
+    holds a (bioguide_id, position) pair for every voter.
+    """
+
+    congress: int
+    chamber: str
+    session: int
+    number: int
+    vote_type: str | None
+    question: str | None
+    result: str | None
+    result_text: str | None
+    vote_date: str
+    bill: tuple[int, str, int] | None
+    yea_count: int
+    nay_count: int
+    not_voting_count: int
+    present_count: int
+    positions: tuple[tuple[str, str], ...]
+
+    @property
+    def key(self) -> tuple[int, str, int, int]:
+        """Natural key (congress, chamber, session, number)."""
+        return self.congress, self.chamber, self.session, self.number
+
+
+def shard_dirs(congress_dirs: Iterable[Path], kind: str) -> list[Path]:
+    """Return the subdirectories of each congress's bills/ or votes/ directory, the unit of work for a worker."""
+    shards: list[Path] = []
+    for congress_dir in congress_dirs:
+        kind_dir = congress_dir / kind
+        if kind_dir.is_dir():
+            shards.extend(sorted(path for path in kind_dir.iterdir() if path.is_dir()))
+    return shards
+
+
+def iter_data_files(directory: Path | str, skip: frozenset[str] = frozenset()) -> Iterator[Path]:
+    """Yield every data.json below directory, without descending into directories named in skip."""
+    for root, dirs, files in os.walk(directory):
+        if skip:
+            dirs[:] = [name for name in dirs if name not in skip]
+        if DATA_FILE in files:
+            yield Path(root, DATA_FILE)
+
+
+def read_json(path: Path) -> dict | None:
+    """Read and parse a JSON file, returning None on failure."""
+    try:
+        content = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    except OSError:
+        logger.exception("Failed to read %s", path)
+        return None
+    return _loads(content, path)
+
+
+def _loads(content: bytes, path: Path) -> dict | None:
+    try:
+        return orjson.loads(content)
+    except Exception:
+        logger.exception("Failed to parse %s", path)
+        return None
+
+
+def content_hash(content: bytes) -> str:
+    """Hash of a file's content as stored in the manifest."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def scan_bills(
+    directory: str,
+    root: str | None = None,
+    known: Mapping[str, ManifestEntry] | None = None,
+) -> ShardScan[ParsedBill]:
+    """Parse the new and changed bill data.json files in a shard. Runs in a worker process."""
+    return _scan(directory, parse_bill, root, known, skip=frozenset({BILL_TEXT_DIR}))
+
+
+def scan_votes(
+    directory: str,
+    root: str | None = None,
+    known: Mapping[str, ManifestEntry] | None = None,
+) -> ShardScan[ParsedVote]:
+    """Parse the new and changed vote data.json files in a shard. Runs in a worker process."""
+    return _scan(directory, parse_vote, root, known)
+
+
+def _scan[T](
+    directory: str,
+    parse: Callable[[dict], T | None],
+    root: str | None,
+    known: Mapping[str, ManifestEntry] | None,
+    skip: frozenset[str] = frozenset(),
+) -> ShardScan[T]:
+    """Parse the data.json files in directory that known does not list with the same size, mtime or content.
+
+    Manifest paths are relative to root, or absolute when root is None.
+    """
+    records: list[T] = []
+    files: list[ManifestEntry] = []
+    unchanged = 0
+    for path in iter_data_files(directory, skip):
+        relative = path.relative_to(root).as_posix() if root else str(path)
+        entry = known.get(relative) if known else None
+        try:
+            stat = path.stat()
+            if entry is not None and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                unchanged += 1
+                continue
+            content = path.read_bytes()
+        except FileNotFoundError:
+            continue
+
+        digest = content_hash(content)
+        files.append(ManifestEntry(relative, stat.st_size, stat.st_mtime_ns, digest))
+        if entry is not None and entry.content_hash == digest:
+            unchanged += 1
+            continue
+        data = _loads(content, path)
+        if data is not None and (record := parse(data)) is not None:
+            records.append(record)
+    return ShardScan(records, files, unchanged)
+
+
+def shard_key(path: str) -> str:
+    """The shard a manifest path belongs to, e.g. 118/bills/hr for 118/bills/hr/hr1/data.json."""
+    return "/".join(path.split("/", SHARD_DEPTH)[:SHARD_DEPTH])
+
+
+def iter_parsed[T](
+    func: Callable[..., ShardScan[T]],
+    shards: list[Path],
+    max_workers: int | None = None,
+    *,
+    root: Path | None = None,
+    manifest: Mapping[str, Mapping[str, ManifestEntry]] | None = None,
+) -> Iterator[ShardScan[T]]:
+    """Run scan_bills or scan_votes over shards in a process pool, yielding each shard's scan as it finishes.
+
+    Each worker only receives the manifest entries of its own shard. A shard that fails is
+    logged and skipped.
+
+    Args:
+        func (Callable[..., ShardScan[T]]): scan_bills or scan_votes.
+        shards (list[Path]): Directories from shard_dirs.
+        max_workers (int, optional): Worker processes. Defaults to the number of CPUs.
+        root (Path, optional): Data directory that manifest paths are relative to.
+        manifest (Mapping[str, Mapping[str, ManifestEntry]], optional): Entries grouped by shard_key.
+    """
+    logger.info("Parsing %d directories with %s", len(shards), func.__name__)
+
+    def kwargs_list() -> Iterator[dict]:
+        for shard in shards:
+            kwargs: dict = {"directory": str(shard)}
+            if root is not None:
+                kwargs["root"] = str(root)
+                if manifest:
+                    kwargs["known"] = manifest.get(shard.relative_to(root).as_posix())
+            yield kwargs
+
+    for outcome in iter_parallelize_process(func=func, kwargs_list=kwargs_list(), max_workers=max_workers):
+        if outcome.exception is not None:
+            logger.error("Failed to parse %s: %s", shards[outcome.index], outcome.exception)
+            continue
+        yield outcome.result
+
+
+def parse_bill(data: dict) -> ParsedBill | None:
+    """Parse a bill data.json dict, or return None if it lacks the natural key."""
+    raw_congress = data.get("congress")
+    bill_type = data.get("bill_type")
+    raw_number = data.get("number")
+    if raw_congress is None or bill_type is None or raw_number is None:
+        return None
+
+    sponsor = data.get("sponsor")
+    return ParsedBill(
+        congress=int(raw_congress),
+        bill_type=bill_type,
+        number=int(raw_number),
+        title=data.get("short_title") or data.get("official_title"),
+        title_short=data.get("short_title"),
+        official_title=data.get("official_title"),
+        status=data.get("status"),
+        status_at=data.get("status_at"),
+        sponsor_bioguide_id=sponsor.get("bioguide_id") if sponsor else None,
+        subjects_top_term=data.get("subjects_top_term"),
+    )
+
+
+def parse_vote(data: dict) -> ParsedVote | None:
+    """Parse a vote data.json dict, or return None if it lacks the natural key or date."""
+    raw_congress = data.get("congress")
+    chamber = data.get("chamber")
+    raw_number = data.get("number")
+    vote_date = data.get("date")
+    raw_session = data.get("session")
+    if raw_congress is None or chamber is None or raw_number is None or vote_date is None or raw_session is None:
+        return None
+
+    congress = int(raw_congress)
+    bill = None
+    if bill_ref := data.get("bill"):
+        bill = (int(bill_ref.get("congress", congress)), bill_ref.get("type"), int(bill_ref.get("number", 0)))
+
+    raw_votes = data.get("votes", {})
+    positions = tuple(
+        (voter["id"], position)
+        for position, position_group in raw_votes.items()
+        for voter in _iter_voters(position_group)
+        if voter.get("id")
+    )
+
+    return ParsedVote(
+        congress=congress,
+        chamber=CHAMBERS.get(chamber, chamber),
+        session=int(raw_session),
+        number=int(raw_number),
+        vote_type=data.get("type"),
+        question=data.get("question"),
+        result=data.get("result"),
+        result_text=data.get("result_text"),
+        vote_date=vote_date[:10] if isinstance(vote_date, str) else vote_date,
+        bill=bill,
+        positions=positions,
+        **count_votes(raw_votes),
+    )
+
+
+def count_votes(raw_votes: dict) -> dict[str, int]:
+    """Count voters per position category, correctly handling dict and list formats."""
+    yea_count = 0
+    nay_count = 0
+    not_voting_count = 0
+    present_count = 0
+
+    for position, position_group in raw_votes.items():
+        voter_count = sum(1 for _ in _iter_voters(position_group))
+        if position in ("Yea", "Aye"):
+            yea_count += voter_count
+        elif position in ("Nay", "No"):
+            nay_count += voter_count
+        elif position == "Not Voting":
+            not_voting_count += voter_count
+        elif position == "Present":
+            present_count += voter_count
+
+    return {
+        "yea_count": yea_count,
+        "nay_count": nay_count,
+        "not_voting_count": not_voting_count,
+        "present_count": present_count,
+    }
+
+
+def _iter_voters(position_group: object) -> Iterator[dict]:
+    """Yield voter dicts from a vote position group (handles list, single dict, or string)."""
+    if isinstance(position_group, dict):
+        yield position_group
+    elif isinstance(position_group, list):
+        for voter in position_group:
+            if isinstance(voter, dict):
+                yield voter
@@ -4,48 +4,225 @@ Usage:
     ingest-posts /path/to/files/
     ingest-posts /path/to/single_file.jsonl
     ingest-posts /data/dir/ --workers 4 --batch-size 5000
+    ingest-posts /data/dir/ --copy-format binary
+    ingest-posts /data/dir/ --no-resume
+    ingest-posts /data/dir/ --route partition
+    ingest-posts /data/big_file.jsonl --workers 8 --chunk-size-mb 128
+    ingest-posts /data/archive/  # also picks up *.jsonl.zst, *.jsonl.gz and *.jsonl.xz
+    ingest-posts /data/dir/ --pipeline-depth 4
+    ingest-posts /data/dir/ --columnar
+    ingest-posts /data/dir/ --build-indexes --maintenance-workers 8
+    ingest-posts /data/2019/ --initial-load --workers 8
+
+Files are split into newline-aligned byte-range chunks that are scheduled largest
+first. Progress is checkpointed per chunk in main.ingestion_ledger, so an interrupted
+run resumes each chunk at its last committed byte offset and skips finished ones.
+
+Compressed files (zstd, gzip, xz) are detected by extension or magic bytes and
+decompressed as a stream in a reader thread, so decompression overlaps with COPY.
+They are never split into chunks and their ledger offsets count decompressed bytes.
+
+Missing weekly partitions are created on demand before each COPY, so a new week or year
+needs no migration; --default-partition also adds a DEFAULT partition for any other date.
+Once every chunk is done, the partitions the run touched are ANALYZEd, and with
+--build-indexes their secondary indexes are built concurrently.
+
+Rows are validated on the client before COPY (NOT NULL, integer ranges, NUL bytes and
+partition range), so a bad row costs a failed_ingestion record instead of repeated
+bisecting round trips. --no-validate sends every row and relies on bisection alone.
+
+--initial-load is for backfilling weeks that have no partition yet: their rows are COPYed
+into UNLOGGED tables without indexes, then deduplicated and attached as partitions once
+every chunk is done (see ingest_posts_initial_load). It always parses with the dict path.
 """
 
 from __future__ import annotations
 
+import gzip
 import logging
-from datetime import UTC, datetime
+import lzma
+import mmap
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from enum import StrEnum
+from multiprocessing import cpu_count
 from pathlib import Path  # noqa: TC003 this is needed for typer
+from queue import Empty, Full, Queue
 from typing import TYPE_CHECKING, Annotated
 
 import orjson
 import psycopg
 import typer
+from compression import zstd
 
 from python.common import configure_logger
+from python.data_science.ingest_posts_finalize import finalize_partitions
+from python.data_science.partition_manager import PartitionManager
 from python.orm.common import get_connection_info
-from python.parallelize import parallelize_process
+from python.orm.data_science_dev.posts.partitions import (
+    PARTITION_END_YEAR,
+    PARTITION_START_YEAR,
+    partition_key,
+    partition_name,
+)
+from python.parallelize import WorkerPool, worker_state
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Container, Iterator, Sequence
+    from typing import BinaryIO
 
 logger = logging.getLogger(__name__)
 
 
 app = typer.Typer(help="Ingest JSONL post files into the partitioned posts table.")
 
+DEFAULT_CHUNK_MB = 256
+MEBIBYTE = 1024 * 1024
+DECOMPRESS_BLOCK_BYTES = 4 * MEBIBYTE
+DECOMPRESS_QUEUE_DEPTH = 4
+
+
+class CopyFormat(StrEnum):
+    """Wire format used to COPY batches into the staging table."""
+
+    TEXT = "text"
+    BINARY = "binary"
+
+
+class Compression(StrEnum):
+    """Compression of an input file."""
+
+    NONE = "none"
+    GZIP = "gzip"
+    XZ = "xz"
+    ZSTD = "zstd"
+
+
+COMPRESSION_SUFFIXES = {
+    ".gz": Compression.GZIP,
+    ".xz": Compression.XZ,
+    ".zst": Compression.ZSTD,
+}
+
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": Compression.GZIP,
+    b"\xfd7zXZ\x00": Compression.XZ,
+    b"\x28\xb5\x2f\xfd": Compression.ZSTD,
+}
+
+
+class Route(StrEnum):
+    """Where staged rows are inserted.
+
+    parent: INSERT into main.posts and let PostgreSQL route each row to its partition.
+    partition: group rows by ISO week on the client and INSERT into each posts_YYYY_WW directly.
+    """
+
+    PARENT = "parent"
+    PARTITION = "partition"
+
+
+@dataclass(frozen=True)
+class IngestOptions:
+    """Settings shared by every file, chunk and batch of an ingest-posts run."""
+
+    batch_size: int = 10000
+    copy_format: CopyFormat = CopyFormat.TEXT
+    route: Route = Route.PARENT
+    resume: bool = True
+    pipeline_depth: int = 2
+    columnar: bool = False
+    validate: bool = True
+    provision_partitions: bool = True
+    default_partition: bool = False
+    analyze: bool = True
+    build_indexes: bool = False
+    maintenance_workers: int = 4
+    initial_load: bool = False
+
 
 @app.command()
-def main(
+def main(  # noqa: PLR0913
     path: Annotated[Path, typer.Argument(help="Directory containing JSONL files, or a single JSONL file")],
+    *,
     batch_size: Annotated[int, typer.Option(help="Rows per INSERT batch")] = 10000,
-    workers: Annotated[int, typer.Option(help="Parallel workers for multi-file ingestion")] = 4,
-    pattern: Annotated[str, typer.Option(help="Glob pattern for JSONL files")] = "*.jsonl",
+    workers: Annotated[
+        int,
+        typer.Option(help="Parallel workers ingesting file chunks; capped at the chunk and CPU counts"),
+    ] = 4,
+    pattern: Annotated[
+        str,
+        typer.Option(help="Glob pattern for JSONL files; compressed variants (.zst, .gz, .xz) also match"),
+    ] = "*.jsonl",
+    copy_format: Annotated[CopyFormat, typer.Option(help="COPY wire format")] = CopyFormat.TEXT,
+    resume: Annotated[bool, typer.Option(help="Resume from the ingestion ledger and skip finished files")] = True,
+    route: Annotated[Route, typer.Option(help="Insert via the parent table or into partitions")] = Route.PARENT,
+    chunk_size_mb: Annotated[
+        int,
+        typer.Option(help="Split files larger than this into newline-aligned chunks; 0 disables splitting"),
+    ] = DEFAULT_CHUNK_MB,
+    pipeline_depth: Annotated[
+        int,
+        typer.Option(help="Parsed batches buffered ahead of COPY by a parser thread; 0 parses and copies in turn"),
+    ] = 2,
+    columnar: Annotated[
+        bool,
+        typer.Option(help="Parse and transform whole batches with Polars and COPY them as CSV"),
+    ] = False,
+    validate: Annotated[
+        bool,
+        typer.Option(help="Reject rows that would fail the INSERT before sending them to the server"),
+    ] = True,
+    provision_partitions: Annotated[
+        bool,
+        typer.Option(help="Create missing weekly partitions before each COPY"),
+    ] = True,
+    default_partition: Annotated[
+        bool,
+        typer.Option(help="Create a DEFAULT partition for rows outside the weekly partitions"),
+    ] = False,
+    analyze: Annotated[bool, typer.Option(help="ANALYZE the partitions this run touched once it finishes")] = True,
+    build_indexes: Annotated[
+        bool,
+        typer.Option(help="CREATE INDEX CONCURRENTLY on user_id, thread_root and reply_to of touched partitions"),
+    ] = False,
+    maintenance_workers: Annotated[
+        int,
+        typer.Option(help="Partitions merged, analyzed or indexed at the same time"),
+    ] = 4,
+    initial_load: Annotated[
+        bool,
+        typer.Option(help="Load new weeks into UNLOGGED tables and attach them as partitions at the end"),
+    ] = False,
 ) -> None:
     """Ingest JSONL post files into the weekly-partitioned posts table."""
     configure_logger(level="INFO")
 
+    options = IngestOptions(
+        batch_size=batch_size,
+        copy_format=copy_format,
+        route=route,
+        resume=resume,
+        pipeline_depth=pipeline_depth,
+        columnar=columnar,
+        validate=validate,
+        provision_partitions=provision_partitions,
+        default_partition=default_partition,
+        analyze=analyze,
+        build_indexes=build_indexes,
+        maintenance_workers=maintenance_workers,
+        initial_load=initial_load,
+    )
     logger.info("starting ingest-posts")
-    logger.info("path=%s batch_size=%d workers=%d pattern=%s", path, batch_size, workers, pattern)
+    logger.info("path=%s workers=%d pattern=%s chunk_size_mb=%d %s", path, workers, pattern, chunk_size_mb, options)
     if path.is_file():
-        ingest_file(path, batch_size=batch_size)
+        ingest_files([path], options, max_workers=workers, chunk_bytes=chunk_size_mb * MEBIBYTE)
     elif path.is_dir():
-        ingest_directory(path, batch_size=batch_size, max_workers=workers, pattern=pattern)
+        ingest_directory(path, options, max_workers=workers, pattern=pattern, chunk_bytes=chunk_size_mb * MEBIBYTE)
     else:
         typer.echo(f"Path does not exist: {path}", err=True)
         raise typer.Exit(code=1)
@@ -55,21 +232,344 @@ def main(
 
 def ingest_directory(
     directory: Path,
+    options: IngestOptions,
     *,
-    batch_size: int,
     max_workers: int,
     pattern: str = "*.jsonl",
+    chunk_bytes: int = DEFAULT_CHUNK_MB * MEBIBYTE,
 ) -> None:
     """Ingest all JSONL files in a directory using parallel workers."""
-    files = sorted(directory.glob(pattern))
+    files = find_files(directory, pattern)
     if not files:
         logger.warning("No JSONL files found in %s", directory)
         return
 
     logger.info("Found %d JSONL files to ingest", len(files))
+    ingest_files(files, options, max_workers=max_workers, chunk_bytes=chunk_bytes)
+
+
+def find_files(directory: Path, pattern: str) -> list[Path]:
+    """Glob for pattern and its compressed variants (pattern + .zst/.gz/.xz)."""
+    files = set(directory.glob(pattern))
+    for suffix in COMPRESSION_SUFFIXES:
+        files.update(directory.glob(pattern + suffix))
+    return sorted(files)
+
+
+def detect_compression(path: Path) -> Compression:
+    """Detect a file's compression from its extension, falling back to its magic bytes."""
+    if compression := COMPRESSION_SUFFIXES.get(path.suffix):
+        return compression
+    with path.open("rb") as handle:
+        header = handle.read(6)
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return compression
+    return Compression.NONE
+
+
+def open_decompressed(path: Path, compression: Compression) -> BinaryIO:
+    """Open a compressed file for streaming reads of its decompressed bytes."""
+    if compression == Compression.GZIP:
+        return gzip.open(path, "rb")
+    if compression == Compression.XZ:
+        return lzma.open(path, "rb")
+    if compression == Compression.ZSTD:
+        return zstd.open(path, "rb")
+    return path.open("rb")
+
+
+def iter_decompressed_blocks(
+    path: Path,
+    compression: Compression,
+    *,
+    skip: int = 0,
+    block_size: int = DECOMPRESS_BLOCK_BYTES,
+    queue_depth: int = DECOMPRESS_QUEUE_DEPTH,
+) -> Iterator[bytes]:
+    """Yield decompressed blocks produced by a background reader thread.
+
+    zlib, lzma and zstd release the GIL while decompressing, so the reader thread keeps
+    decompressing the next blocks while the caller parses rows and waits on COPY. The
+    bounded queue caps how far ahead it reads.
+    """
+    return background_iter(
+        _decompressed_blocks(path, compression, skip, block_size),
+        depth=queue_depth,
+        name=f"decompress-{path.name}",
+    )
+
+
+def _decompressed_blocks(path: Path, compression: Compression, skip: int, block_size: int) -> Iterator[bytes]:
+    with open_decompressed(path, compression) as handle:
+        if skip:
+            handle.seek(skip)
+        while block := handle.read(block_size):
+            yield block
+
+
+@dataclass
+class StageTimings:
+    """Seconds a producer/consumer pipeline spent working and blocked on the other side.
+
+    A producer blocked on a full queue means the consumer is the bottleneck, and the
+    consumer blocked on an empty queue means the producer is.
+    """
+
+    produce_seconds: float = 0.0
+    produce_blocked_seconds: float = 0.0
+    consume_seconds: float = 0.0
+    consume_blocked_seconds: float = 0.0
+
+
+def background_iter[T](  # noqa: C901, PLR0915
+    items: Iterator[T],
+    *,
+    depth: int,
+    name: str,
+    timings: StageTimings | None = None,
+) -> Iterator[T]:
+    """Run an iterator in a background thread, handing items over through a bounded queue.
+
+    The producer thread blocks once depth items are waiting, which bounds memory. Exceptions
+    raised by the iterator are re-raised in the consuming thread, and closing the returned
+    generator stops the producer and closes the source iterator.
+
+    Args:
+        items (Iterator[T]): Iterator to drain in the background thread.
+        depth (int): Maximum number of items waiting in the queue.
+        name (str): Name of the background thread.
+        timings (StageTimings, optional): Accumulates produce time, and time each side spends blocked.
+    """
+    timings = timings if timings is not None else StageTimings()
+    queue: Queue[tuple[T] | BaseException | None] = Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: tuple[T] | BaseException | None) -> None:
+        started = time.perf_counter()
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+            except Full:
+                continue
+            break
+        timings.produce_blocked_seconds += time.perf_counter() - started
+
+    def produce() -> None:
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    item = next(items)
+                except StopIteration:
+                    break
+                finally:
+                    timings.produce_seconds += time.perf_counter() - started
+                put((item,))
+        except BaseException as error:  # noqa: BLE001 re-raised in the consuming thread
+            put(error)
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+        put(None)
+
+    producer = threading.Thread(target=produce, name=name, daemon=True)
+    producer.start()
+    try:
+        while True:
+            started = time.perf_counter()
+            entry = queue.get()
+            timings.consume_blocked_seconds += time.perf_counter() - started
+            if entry is None:
+                return
+            if isinstance(entry, BaseException):
+                raise entry
+            yield entry[0]
+    finally:
+        stop.set()
+        while producer.is_alive():
+            try:
+                queue.get_nowait()
+            except Empty:
+                producer.join(timeout=0.1)
+
+
+def ingest_files(
+    files: Sequence[Path],
+    options: IngestOptions,
+    *,
+    max_workers: int,
+    chunk_bytes: int = DEFAULT_CHUNK_MB * MEBIBYTE,
+) -> None:
+    """Split files into byte-range chunks and ingest them largest first, logging progress as chunks finish.
+
+    Handing the biggest chunks out first keeps every worker busy until the tail of the run
+    instead of leaving one worker grinding through a huge file at the end.
+    """
+    chunks = plan_chunks(files, chunk_bytes)
+    if options.resume:
+        chunks = pending_chunks(chunks, initial_load=options.initial_load)
+    if not chunks:
+        logger.info("Nothing left to ingest")
+        return
+
+    # WorkerPool refuses more workers than CPUs, and workers beyond the chunk count would sit idle
+    workers = min(max_workers, len(chunks), cpu_count())
+    progress = IngestProgress(total_chunks=len(chunks), total_bytes=sum(chunk.size for chunk in chunks))
+    logger.info("Scheduling %d chunks (%d bytes) across %d workers", len(chunks), progress.total_bytes, workers)
+
+    failed_chunks: list[FileChunk] = []
+    touched_weeks: set[tuple[int, int]] = set()
+    # each worker opens one connection and reuses it for every chunk it ingests
+    with WorkerPool(max_workers=workers, initializer=get_psycopg_connection) as pool:
+        outcomes = pool.imap(
+            func=ingest_chunk,
+            kwargs_list=({"chunk": chunk, "options": options} for chunk in chunks),
+        )
+        for outcome in outcomes:
+            chunk = chunks[outcome.index]
+            rows = 0
+            if outcome.exception is None:
+                rows = outcome.result.rows
+                touched_weeks.update(outcome.result.weeks)
+            else:
+                failed_chunks.append(chunk)
+            progress.update(chunk.size, rows)
+            logger.info("%s", progress)
+
+    if failed_chunks:
+        logger.error("%d chunks failed: %s", len(failed_chunks), ", ".join(map(str, failed_chunks)))
+
+    if options.initial_load:
+        from python.data_science.ingest_posts_initial_load import merge_load_tables  # noqa: PLC0415
+
+        merge_load_tables(connect=get_psycopg_connection, schema=SCHEMA, max_workers=options.maintenance_workers)
+
+    finalize_partitions(
+        touched_weeks,
+        connect=get_psycopg_connection,
+        schema=SCHEMA,
+        max_workers=options.maintenance_workers,
+        analyze=options.analyze,
+        build_indexes=options.build_indexes,
+    )
+
+
+@dataclass(frozen=True)
+class ChunkResult:
+    """What ingest_chunk did: rows sent and the (ISO year, ISO week) keys they fell in."""
+
+    rows: int
+    weeks: frozenset[tuple[int, int]] = frozenset()
+
+
+@dataclass(frozen=True)
+class FileState:
+    """Identity of a file version on disk, as recorded in the ingestion ledger."""
+
+    path: str
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_path(cls, path: Path) -> FileState:
+        """Stat a file and key it by its absolute path."""
+        stat = path.stat()
+        return cls(path=str(path.resolve()), size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+
+@dataclass(frozen=True)
+class FileChunk:
+    """A newline-aligned byte range [start, end) of a JSONL file, ingested as one task."""
+
+    path: Path
+    state: FileState
+    start: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        """Number of bytes in the chunk."""
+        return self.end - self.start
+
+    @property
+    def is_whole_file(self) -> bool:
+        """True when the chunk covers the entire file."""
+        return self.start == 0 and self.end == self.state.size
 
-    kwargs_list = [{"path": fp, "batch_size": batch_size} for fp in files]
-    parallelize_process(ingest_file, kwargs_list, max_workers=max_workers)
+    @property
+    def ledger_key(self) -> str:
+        """Ledger path for the chunk: the file path, plus the byte range when it is only part of the file."""
+        if self.is_whole_file:
+            return self.state.path
+        return f"{self.state.path}#{self.start}-{self.end}"
+
+    def __str__(self) -> str:
+        """Return the file name and byte range."""
+        return f"{self.path.name}[{self.start}:{self.end}]"
+
+
+@dataclass
+class IngestProgress:
+    """Running totals for a scheduled ingest, logged as each chunk finishes."""
+
+    total_chunks: int
+    total_bytes: int
+    done_chunks: int = 0
+    done_bytes: int = 0
+    rows: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    def update(self, chunk_bytes: int, rows: int) -> None:
+        """Record a finished chunk."""
+        self.done_chunks += 1
+        self.done_bytes += chunk_bytes
+        self.rows += rows
+
+    def __str__(self) -> str:
+        """Return a progress line with rates and ETA."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        bytes_per_second = self.done_bytes / elapsed
+        remaining = self.total_bytes - self.done_bytes
+        eta = timedelta(seconds=round(remaining / bytes_per_second)) if bytes_per_second else "unknown"
+        return (
+            f"Progress: {self.done_chunks}/{self.total_chunks} chunks, {self.rows} rows, "
+            f"{self.rows / elapsed:.0f} rows/s, {bytes_per_second / MEBIBYTE:.1f} MB/s, ETA {eta}"
+        )
+
+
+def split_byte_ranges(path: Path, size: int, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Split a file into [start, end) byte ranges of about chunk_bytes, each ending just past a newline."""
+    if chunk_bytes <= 0 or size <= chunk_bytes:
+        return [(0, size)]
+
+    ranges: list[tuple[int, int]] = []
+    start = 0
+    with path.open("rb") as handle:
+        while start < size:
+            handle.seek(start + chunk_bytes - 1)
+            handle.readline()
+            end = min(handle.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def plan_chunks(files: Sequence[Path], chunk_bytes: int) -> list[FileChunk]:
+    """Split every file into chunks and order them largest first."""
+    chunks: list[FileChunk] = []
+    for file in files:
+        state = FileState.from_path(file)
+        # compressed streams can only be read from the start, so they stay whole
+        ranges = (
+            split_byte_ranges(file, state.size, chunk_bytes)
+            if detect_compression(file) == Compression.NONE
+            else [(0, state.size)]
+        )
+        chunks.extend(FileChunk(path=file, state=state, start=start, end=end) for start, end in ranges)
+    chunks.sort(key=lambda chunk: chunk.size, reverse=True)
+    return chunks
 
 
 SCHEMA = "main"
@@ -97,17 +597,142 @@ COLUMNS = (
     "sent_score",
 )
 
-INSERT_FROM_STAGING = f"""
-    INSERT INTO {SCHEMA}.posts ({", ".join(COLUMNS)})
-    SELECT {", ".join(COLUMNS)} FROM pg_temp.staging
-    ON CONFLICT (post_id, date) DO NOTHING
-"""  # noqa: S608
+# Postgres types used to pick psycopg's binary dumpers, in COLUMNS order.
+# Binary COPY carries no type information, so a value only needs to match the column's wire format:
+# - date is sent as timestamptz; parse_date returns UTC datetimes and timestamp/timestamptz share the same
+#   int64 microseconds encoding, so the naive timestamp column receives the UTC wall-clock time.
+# - langs is sent as bytea; transform_row leaves it as orjson bytes and varchar's binary input is raw UTF-8.
+BINARY_COPY_TYPES = {
+    "post_id": "int8",
+    "user_id": "int8",
+    "instance": "text",
+    "date": "timestamptz",
+    "text": "text",
+    "langs": "bytea",
+    "like_count": "int4",
+    "reply_count": "int4",
+    "repost_count": "int4",
+    "reply_to": "int8",
+    "replied_author": "int8",
+    "thread_root": "int8",
+    "thread_root_author": "int8",
+    "repost_from": "int8",
+    "reposted_author": "int8",
+    "quotes": "int8",
+    "quoted_author": "int8",
+    "labels": "text",
+    "sent_label": "int2",
+    "sent_score": "float8",
+}
+
+NOT_NULL_COLUMNS = ("post_id", "user_id", "instance", "date", "text", "like_count", "reply_count", "repost_count")
+
+# Largest value of each integer column's Postgres type.
+INTEGER_LIMITS = {
+    column: 2 ** (bits - 1) - 1
+    for column, bits in (
+        ("post_id", 64),
+        ("user_id", 64),
+        ("like_count", 32),
+        ("reply_count", 32),
+        ("repost_count", 32),
+        ("reply_to", 64),
+        ("replied_author", 64),
+        ("thread_root", 64),
+        ("thread_root_author", 64),
+        ("repost_from", 64),
+        ("reposted_author", 64),
+        ("quotes", 64),
+        ("quoted_author", 64),
+        ("sent_label", 16),
+    )
+}
+
+TEXT_COLUMNS = ("instance", "text", "labels")
+
+# ISO years of the partitions created by migrations, assumed when no PartitionManager is used.
+PARTITION_YEARS = (PARTITION_START_YEAR, PARTITION_END_YEAR)
+
+
+def copy_statement(table: str, copy_format: CopyFormat) -> str:
+    """Build the COPY ... FROM STDIN of COLUMNS into table in the given wire format."""
+    statement = f"COPY {table} ({', '.join(COLUMNS)}) FROM STDIN"
+    return f"{statement} (FORMAT BINARY)" if copy_format == CopyFormat.BINARY else statement
+
+
+CREATE_STAGING = f"""
+    CREATE TEMP TABLE IF NOT EXISTS staging
+    (LIKE {SCHEMA}.posts INCLUDING DEFAULTS)
+    ON COMMIT DELETE ROWS
+"""
+
+
+def insert_from_staging(table: str) -> str:
+    """Build the INSERT ... ON CONFLICT that moves pg_temp.staging into a posts table or partition."""
+    return f"""
+        INSERT INTO {SCHEMA}.{table} ({", ".join(COLUMNS)})
+        SELECT {", ".join(COLUMNS)} FROM pg_temp.staging
+        ON CONFLICT (post_id, date) DO NOTHING
+    """  # noqa: S608
+
+
+INSERT_FROM_STAGING = insert_from_staging("posts")
 
 FAILED_INSERT = f"""
     INSERT INTO {SCHEMA}.failed_ingestion (raw_line, error)
     VALUES (%(raw_line)s, %(error)s)
 """  # noqa: S608
 
+LEDGER_SELECT = f"""
+    SELECT path, size, mtime_ns, committed_offset, row_count, completed
+    FROM {SCHEMA}.ingestion_ledger
+    WHERE path = ANY(%(paths)s)
+"""  # noqa: S608
+
+LEDGER_UPSERT = f"""
+    INSERT INTO {SCHEMA}.ingestion_ledger (path, size, mtime_ns, committed_offset, row_count, completed)
+    VALUES (%(path)s, %(size)s, %(mtime_ns)s, %(committed_offset)s, %(row_count)s, %(completed)s)
+    ON CONFLICT (path) DO UPDATE SET
+        size = EXCLUDED.size,
+        mtime_ns = EXCLUDED.mtime_ns,
+        committed_offset = EXCLUDED.committed_offset,
+        row_count = EXCLUDED.row_count,
+        completed = EXCLUDED.completed,
+        updated = now()
+"""  # noqa: S608
+
+
+@dataclass
+class BatchStats:
+    """Round trips spent inserting batches, and the partition weeks the rows were sent to."""
+
+    batches: int = 0
+    round_trips: int = 0
+    rejected_rows: int = 0
+    failed_rows: int = 0
+    weeks: set[tuple[int, int]] = field(default_factory=set)
+
+    @property
+    def round_trips_per_batch(self) -> float:
+        """Average INSERT transactions attempted per batch."""
+        return self.round_trips / self.batches if self.batches else 0.0
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    """A committed checkpoint from the ingestion ledger."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    committed_offset: int
+    row_count: int
+    completed: bool
+
+    def matches(self, state: FileState) -> bool:
+        """Return True if the checkpoint was taken against this version of the file."""
+        return self.size == state.size and self.mtime_ns == state.mtime_ns
+
 
 def get_psycopg_connection() -> psycopg.Connection:
     """Create a raw psycopg3 connection from environment variables."""
@@ -122,103 +747,592 @@ def get_psycopg_connection() -> psycopg.Connection:
     )
 
 
-def ingest_file(path: Path, *, batch_size: int) -> None:
+@contextmanager
+def worker_connection() -> Iterator[psycopg.Connection]:
+    """Yield the connection of the current WorkerPool worker, or a new one outside a pool.
+
+    The pooled connection stays open for the worker's next chunk; an error rolls back its
+    open transaction instead of closing it.
+    """
+    connection = worker_state()
+    if connection is None or connection.closed:
+        with get_psycopg_connection() as connection:
+            yield connection
+        return
+
+    try:
+        yield connection
+    except Exception:
+        connection.rollback()
+        raise
+
+
+def binary_copy_types(connection: psycopg.Connection) -> list[int]:
+    """Resolve the binary COPY type oids for COLUMNS against a connection's adapters."""
+    types = connection.adapters.types
+    return [types[BINARY_COPY_TYPES[column]].oid for column in COLUMNS]
+
+
+def read_ledger(connection: psycopg.Connection, keys: Sequence[str]) -> dict[str, LedgerEntry]:
+    """Load ledger entries for the given ledger keys."""
+    with connection.cursor() as cursor:
+        cursor.execute(LEDGER_SELECT, {"paths": list(keys)})
+        entries = {row[0]: LedgerEntry(*row) for row in cursor.fetchall()}
+    connection.commit()
+    return entries
+
+
+def pending_chunks(chunks: Sequence[FileChunk], *, initial_load: bool = False) -> list[FileChunk]:
+    """Drop chunks the ledger already records as completed for their file's current size and mtime.
+
+    With initial_load, warns when some chunks were left partly committed: their rows may have
+    been in load tables that a server crash emptied.
+    """
+    with get_psycopg_connection() as connection:
+        ledger = read_ledger(connection, [chunk.ledger_key for chunk in chunks])
+
+    pending: list[FileChunk] = []
+    partial = 0
+    for chunk in chunks:
+        entry = ledger.get(chunk.ledger_key)
+        if entry is not None and entry.matches(chunk.state):
+            if entry.completed:
+                logger.info("Skipping %s, already ingested (%d rows)", chunk, entry.row_count)
+                continue
+            partial += entry.committed_offset > chunk.start
+        pending.append(chunk)
+
+    if initial_load and partial:
+        logger.warning(
+            "Resuming %d partly committed chunks; crash recovery empties the initial-load tables, "
+            "so rerun with --no-resume after a server crash",
+            partial,
+        )
+    return pending
+
+
+def checkpoint(
+    connection: psycopg.Connection,
+    chunk: FileChunk,
+    *,
+    committed_offset: int,
+    row_count: int,
+    completed: bool,
+    failed_lines: list[dict],
+) -> None:
+    """Record progress for a chunk, together with the malformed lines read up to committed_offset."""
+    with connection.cursor() as cursor:
+        if failed_lines:
+            logger.warning("Recording %d failed lines from %s", len(failed_lines), chunk)
+            cursor.executemany(FAILED_INSERT, failed_lines)
+        cursor.execute(
+            LEDGER_UPSERT,
+            {
+                "path": chunk.ledger_key,
+                "size": chunk.state.size,
+                "mtime_ns": chunk.state.mtime_ns,
+                "committed_offset": committed_offset,
+                "row_count": row_count,
+                "completed": completed,
+            },
+        )
+    connection.commit()
+
+
+def ingest_file(path: Path, options: IngestOptions) -> ChunkResult:
     """Ingest a single JSONL file into the posts table."""
-    log_trigger = max(100_000 // batch_size, 1)
-    failed_lines: list[dict] = []
+    state = FileState.from_path(path)
+    return ingest_chunk(FileChunk(path=path, state=state, start=0, end=state.size), options)
+
+
+def ingest_chunk(chunk: FileChunk, options: IngestOptions) -> ChunkResult:  # noqa: C901, PLR0912, PLR0915
+    """Ingest one byte range of a JSONL file, checkpointing after every batch.
+
+    Returns:
+        ChunkResult: Rows sent by this call, not counting rows committed by an earlier run,
+            and the partition weeks they went to.
+    """
+    log_trigger = max(100_000 // options.batch_size, 1)
+    timings = StageTimings()
+    stats = BatchStats()
     try:
-        with get_psycopg_connection() as connection:
-            for index, batch in enumerate(read_jsonl_batches(path, batch_size, failed_lines), 1):
-                ingest_batch(connection, batch)
+        with worker_connection() as connection:
+            start_offset = chunk.start
+            row_count = 0
+            entry = read_ledger(connection, [chunk.ledger_key]).get(chunk.ledger_key) if options.resume else None
+            if entry is not None and entry.matches(chunk.state):
+                if entry.completed:
+                    logger.info("Skipping %s, already ingested (%d rows)", chunk, entry.row_count)
+                    return ChunkResult(rows=0)
+                start_offset = entry.committed_offset
+                row_count = entry.row_count
+                logger.info("Resuming %s at byte %d (%d rows committed)", chunk, start_offset, row_count)
+            elif entry is not None:
+                logger.info("%s changed since its last checkpoint, starting over", chunk.path.name)
+
+            resumed_rows = row_count
+            offset = start_offset
+            binary_types = binary_copy_types(connection) if options.copy_format == CopyFormat.BINARY else None
+            partitions = None
+            loader = None
+            if options.initial_load:
+                from python.data_science.ingest_posts_initial_load import InitialLoader  # noqa: PLC0415
+
+                loader = InitialLoader(connection, SCHEMA, binary_types=binary_types)
+            elif options.provision_partitions or options.default_partition:
+                partitions = PartitionManager(
+                    connection,
+                    SCHEMA,
+                    create_missing=options.provision_partitions,
+                    default_partition=options.default_partition,
+                )
+            end_offset = None if chunk.is_whole_file else chunk.end
+            if options.columnar and loader is None:
+                from python.data_science.ingest_posts_columnar import (  # noqa: PLC0415
+                    ingest_frame,
+                    read_frame_batches,
+                )
+
+                batches = read_frame_batches(
+                    chunk.path,
+                    options.batch_size,
+                    start_offset=start_offset,
+                    end_offset=end_offset,
+                )
+            else:
+                batches = read_batches_with_failures(
+                    chunk.path,
+                    options.batch_size,
+                    start_offset=start_offset,
+                    end_offset=end_offset,
+                )
+            if options.pipeline_depth > 0:
+                batches = background_iter(
+                    batches,
+                    depth=options.pipeline_depth,
+                    name=f"parse-{chunk.path.name}",
+                    timings=timings,
+                )
+            else:
+                batches = timed_iter(batches, timings)
+
+            for index, (batch, offset, failed_lines) in enumerate(batches, 1):
+                started = time.perf_counter()
+                if loader is not None:
+                    rejected = loader.load_batch(batch, validate=options.validate, stats=stats)
+                elif isinstance(batch, list):
+                    rejected = ingest_batch(
+                        connection,
+                        batch,
+                        binary_types=binary_types,
+                        route=options.route,
+                        validate=options.validate,
+                        stats=stats,
+                        partitions=partitions,
+                    )
+                else:
+                    rejected = ingest_frame(
+                        connection,
+                        batch,
+                        route=options.route,
+                        validate=options.validate,
+                        stats=stats,
+                        partitions=partitions,
+                    )
+                failed_lines.extend(rejected)
+                row_count += len(batch) - len(rejected)
+                checkpoint(
+                    connection,
+                    chunk,
+                    committed_offset=offset,
+                    row_count=row_count,
+                    completed=False,
+                    failed_lines=failed_lines,
+                )
+                timings.consume_seconds += time.perf_counter() - started
                 if index % log_trigger == 0:
-                    logger.info("Ingested %d batches (%d rows) from %s", index, index * batch_size, path)
+                    logger.info("Ingested %d batches (%d rows) from %s", index, row_count, chunk)
 
-            if failed_lines:
-                logger.warning("Recording %d malformed lines from %s", len(failed_lines), path.name)
-                with connection.cursor() as cursor:
-                    cursor.executemany(FAILED_INSERT, failed_lines)
-                connection.commit()
+            checkpoint(
+                connection,
+                chunk,
+                committed_offset=offset,
+                row_count=row_count,
+                completed=True,
+                failed_lines=[],
+            )
     except Exception:
-        logger.exception("Failed to ingest file: %s", path)
+        logger.exception("Failed to ingest %s", chunk)
         raise
+    logger.info(
+        "Stage timings for %s: parse %.1fs (blocked on COPY %.1fs), COPY %.1fs (blocked on parse %.1fs)",
+        chunk,
+        timings.produce_seconds,
+        timings.produce_blocked_seconds,
+        timings.consume_seconds,
+        timings.consume_blocked_seconds,
+    )
+    logger.info(
+        "Round trips for %s: %d over %d batches, %d rows rejected before COPY, %d by the server",
+        chunk,
+        stats.round_trips,
+        stats.batches,
+        stats.rejected_rows,
+        stats.failed_rows,
+    )
+    return ChunkResult(rows=row_count - resumed_rows, weeks=frozenset(stats.weeks))
+
+
+def read_batches_with_failures(
+    file_path: Path,
+    batch_size: int,
+    *,
+    start_offset: int = 0,
+    end_offset: int | None = None,
+) -> Iterator[tuple[list[dict], int, list[dict]]]:
+    """Wrap read_jsonl_batches so each batch carries the malformed lines read before it.
+
+    Handing failures over with their batch keeps them consistent with the checkpoint offset,
+    and means the list is never shared between a parser thread and the COPY thread. Malformed
+    lines after the last batch come through with an empty batch.
+    """
+    failed_lines: list[dict] = []
+    for batch, offset in read_jsonl_batches(
+        file_path,
+        batch_size,
+        failed_lines,
+        start_offset=start_offset,
+        end_offset=end_offset,
+    ):
+        failures = failed_lines.copy()
+        failed_lines.clear()
+        yield batch, offset, failures
+
+
+def timed_iter[T](items: Iterator[T], timings: StageTimings) -> Iterator[T]:
+    """Iterate in the calling thread, adding the time spent producing each item to timings."""
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        finally:
+            timings.produce_seconds += time.perf_counter() - started
+        yield item
+
+
+def ingest_batch(
+    connection: psycopg.Connection,
+    batch: list[dict],
+    *,
+    binary_types: Sequence[int] | None = None,
+    route: Route = Route.PARENT,
+    validate: bool = True,
+    stats: BatchStats | None = None,
+    partitions: PartitionManager | None = None,
+) -> list[dict]:
+    """Validate batch, COPY the valid rows into a temp staging table, then INSERT ... ON CONFLICT into posts.
+
+    Rows that validate_row rejects are never sent. They are returned as failed_ingestion records
+    so the caller can store them with its checkpoint, which leaves server-side isolation for
+    the rare failures that only the database can detect.
+
+    Args:
+        connection (psycopg.Connection): Open psycopg connection.
+        batch (list[dict]): Transformed rows keyed by column name.
+        binary_types (Sequence[int], optional): Type oids from binary_copy_types. Uses text COPY when None.
+        route (Route, optional): Insert through main.posts or straight into the weekly partitions.
+        validate (bool, optional): Check rows on the client before sending them.
+        stats (BatchStats, optional): Accumulates round trips and rejected rows.
+        partitions (PartitionManager, optional): Creates missing weekly partitions before the COPY.
+            Without one, only the partitions of PARTITION_YEARS are assumed to exist.
+
+    Returns:
+        list[dict]: failed_ingestion records for the rows rejected by validation.
+    """
+    if stats is None:
+        stats = BatchStats()
+    stats.batches += 1
+
+    rejected: list[dict] = []
+    if validate:
+        years = PARTITION_YEARS if partitions is None else partitions.validation_years
+        batch, rejected = split_valid_rows(batch, years=years)
+        stats.rejected_rows += len(rejected)
 
+    weeks = {partition_key(row["date"]) for row in batch if isinstance(row.get("date"), datetime)}
+    stats.weeks.update(weeks)
+    routable = None
+    if partitions is not None:
+        partitions.ensure_weeks(weeks)
+        routable = partitions.existing
+    insert_batch(connection, batch, binary_types=binary_types, route=route, stats=stats, routable=routable)
+    return rejected
 
-def ingest_batch(connection: psycopg.Connection, batch: list[dict]) -> None:
-    """COPY batch into a temp staging table, then INSERT ... ON CONFLICT into posts."""
+
+def insert_batch(
+    connection: psycopg.Connection,
+    batch: list[dict],
+    *,
+    binary_types: Sequence[int] | None,
+    route: Route,
+    stats: BatchStats,
+    routable: Container[str] | None = None,
+) -> None:
+    """COPY and INSERT batch in one transaction, halving it on failure to isolate bad rows.
+
+    routable is passed on to group_by_partition when rows are routed to partitions directly.
+    """
     if not batch:
         return
 
+    stats.round_trips += 1
     try:
         with connection.cursor() as cursor:
-            cursor.execute(f"""
-                CREATE TEMP TABLE IF NOT EXISTS staging
-                (LIKE {SCHEMA}.posts INCLUDING DEFAULTS)
-                ON COMMIT DELETE ROWS
-            """)
-            cursor.execute("TRUNCATE pg_temp.staging")
-
-            with cursor.copy(f"COPY pg_temp.staging ({', '.join(COLUMNS)}) FROM STDIN") as copy:
-                for row in batch:
-                    copy.write_row(tuple(row.get(column) for column in COLUMNS))
-
-            cursor.execute(INSERT_FROM_STAGING)
+            cursor.execute(CREATE_STAGING)
+            groups = group_by_partition(batch, routable) if route == Route.PARTITION else {"posts": batch}
+            for table, rows in groups.items():
+                cursor.execute("TRUNCATE pg_temp.staging")
+                copy_to_staging(cursor, rows, binary_types)
+                cursor.execute(INSERT_FROM_STAGING if table == "posts" else insert_from_staging(table))
         connection.commit()
     except Exception as error:
         connection.rollback()
 
         if len(batch) == 1:
             logger.exception("Skipping bad row post_id=%s", batch[0].get("post_id"))
-            with connection.cursor() as cursor:
-                cursor.execute(
-                    FAILED_INSERT,
-                    {
-                        "raw_line": orjson.dumps(batch[0], default=str).decode(),
-                        "error": str(error),
-                    },
-                )
-            connection.commit()
+            record_failed_row(connection, batch[0], error, stats)
             return
 
         midpoint = len(batch) // 2
-        ingest_batch(connection, batch[:midpoint])
-        ingest_batch(connection, batch[midpoint:])
+        for half in (batch[:midpoint], batch[midpoint:]):
+            insert_batch(connection, half, binary_types=binary_types, route=route, stats=stats, routable=routable)
+
+
+def record_failed_row(connection: psycopg.Connection, row: dict, error: Exception, stats: BatchStats) -> None:
+    """Store a row the server rejected on its own in failed_ingestion."""
+    stats.failed_rows += 1
+    stats.round_trips += 1
+    with connection.cursor() as cursor:
+        cursor.execute(FAILED_INSERT, failed_record(row, str(error)))
+    connection.commit()
+
+
+def split_valid_rows(
+    batch: list[dict],
+    *,
+    years: tuple[int, int] | None = PARTITION_YEARS,
+) -> tuple[list[dict], list[dict]]:
+    """Split batch into rows that pass validate_row and failed_ingestion records for the rest."""
+    valid: list[dict] = []
+    rejected: list[dict] = []
+    for row in batch:
+        if (reason := validate_row(row, years=years)) is None:
+            valid.append(row)
+        else:
+            logger.warning("Rejecting row post_id=%s: %s", row.get("post_id"), reason)
+            rejected.append(failed_record(row, reason))
+    return valid, rejected
+
+
+def validate_row(row: dict, *, years: tuple[int, int] | None = PARTITION_YEARS) -> str | None:  # noqa: C901, PLR0911
+    """Return why the posts INSERT would reject row, or None if it looks valid.
+
+    Checks NOT NULL columns, integer types and ranges, text types and NUL bytes, and that
+    the date's ISO year is within years. Pass years=None when a DEFAULT partition accepts
+    any date. Constraint violations that need the table contents are left to the server.
+    """
+    for column in NOT_NULL_COLUMNS:
+        if row.get(column) is None:
+            return f"{column} is null"
+    for column, limit in INTEGER_LIMITS.items():
+        value = row.get(column)
+        if value is not None and (type(value) is not int or not -limit - 1 <= value <= limit):
+            return f"{column} is not an integer within its column type: {value!r}"
+    for column in TEXT_COLUMNS:
+        value = row.get(column)
+        if isinstance(value, str) and "\x00" in value:
+            return f"{column} contains a NUL byte"
+    if not isinstance(row["instance"], str) or not isinstance(row["text"], str):
+        return "instance and text must be strings"
+    sent_score = row.get("sent_score")
+    if sent_score is not None and (isinstance(sent_score, bool) or not isinstance(sent_score, int | float)):
+        return f"sent_score is not a number: {sent_score!r}"
+    date = row["date"]
+    if not isinstance(date, datetime):
+        return f"date is not a datetime: {date!r}"
+    if years is not None and not years[0] <= partition_key(date)[0] <= years[1]:
+        return f"date {date.isoformat()} has no partition"
+    return None
 
 
-def read_jsonl_batches(file_path: Path, batch_size: int, failed_lines: list[dict]) -> Iterator[list[dict]]:
-    """Stream a JSONL file and yield batches of transformed rows."""
+def failed_record(row: dict, error: str) -> dict:
+    """Build the failed_ingestion parameters for a row that could not be inserted."""
+    return {"raw_line": orjson.dumps(row, default=str).decode(), "error": error}
+
+
+def copy_to_staging(cursor: psycopg.Cursor, rows: list[dict], binary_types: Sequence[int] | None) -> None:
+    """COPY rows into pg_temp.staging, in binary when type oids are given."""
+    copy_rows(cursor, "pg_temp.staging", rows, binary_types)
+
+
+def copy_rows(cursor: psycopg.Cursor, table: str, rows: list[dict], binary_types: Sequence[int] | None) -> None:
+    """COPY rows into table, in binary when type oids are given."""
+    copy_format = CopyFormat.TEXT if binary_types is None else CopyFormat.BINARY
+    with cursor.copy(copy_statement(table, copy_format)) as copy:
+        if binary_types is not None:
+            copy.set_types(binary_types)
+        for row in rows:
+            copy.write_row(tuple(map(row.get, COLUMNS)))
+
+
+def group_by_partition(batch: list[dict], routable: Container[str] | None = None) -> dict[str, list[dict]]:
+    """Group rows by the weekly partition their date falls in.
+
+    Rows whose partition is not in routable (by default, any outside PARTITION_YEARS) are kept
+    under "posts" so they go through the parent table, landing in the DEFAULT partition if there
+    is one and failing there exactly as they would without partition routing otherwise.
+    """
+    groups: dict[str, list[dict]] = {}
+    for row in batch:
+        year, week = partition_key(row["date"])
+        name = partition_name(year, week)
+        in_range = name in routable if routable is not None else PARTITION_YEARS[0] <= year <= PARTITION_YEARS[1]
+        table = name if in_range else "posts"
+        groups.setdefault(table, []).append(row)
+    return groups
+
+
+def read_jsonl_batches(
+    file_path: Path,
+    batch_size: int,
+    failed_lines: list[dict],
+    *,
+    start_offset: int = 0,
+    end_offset: int | None = None,
+) -> Iterator[tuple[list[dict], int]]:
+    """Stream a JSONL file and yield batches of transformed rows.
+
+    Plain files are memory-mapped and each line is handed to orjson as a memoryview slice
+    of the mapping, so lines are never copied into bytes or decoded into str. Compressed
+    files are decompressed by a reader thread; their offsets count decompressed bytes.
+
+    Args:
+        file_path (Path): JSONL file to read.
+        batch_size (int): Rows per yielded batch.
+        failed_lines (list[dict]): Collects malformed lines as they are read.
+        start_offset (int, optional): Byte offset to seek to first; must be at a line boundary.
+        end_offset (int, optional): Stop once this byte offset is reached; must be at a line boundary.
+            Not supported for compressed files.
+
+    Yields:
+        tuple[list[dict], int]: A batch and the byte offset just past its last line. If malformed
+            lines follow the last row and failed_lines is not empty, a final empty batch reports
+            the offset past them.
+    """
+    compression = detect_compression(file_path)
+    if compression == Compression.NONE:
+        yield from _read_mapped_batches(file_path, batch_size, failed_lines, start_offset, end_offset)
+        return
+
+    if end_offset is not None:
+        error = f"Cannot read a byte range of compressed file {file_path}"
+        raise ValueError(error)
+    yield from _read_stream_batches(file_path, compression, batch_size, failed_lines, start_offset)
+
+
+def _read_mapped_batches(
+    file_path: Path,
+    batch_size: int,
+    failed_lines: list[dict],
+    start_offset: int,
+    end_offset: int | None,
+) -> Iterator[tuple[list[dict], int]]:
+    with file_path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            if hasattr(mapped, "madvise"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            limit = size if end_offset is None else min(end_offset, size)
+            batch: list[dict] = []
+            offset = start_offset
+            while offset < limit:
+                newline = mapped.find(b"\n", offset)
+                line_end = size if newline == -1 else newline
+                if line_end > offset:
+                    with view[offset:line_end] as line:
+                        batch.extend(parse_line(line, file_path, failed_lines))
+                offset = line_end + 1 if newline != -1 else size
+                if len(batch) >= batch_size:
+                    yield batch, offset
+                    batch = []
+            if batch or failed_lines:
+                yield batch, offset
+
+
+def _read_stream_batches(
+    file_path: Path,
+    compression: Compression,
+    batch_size: int,
+    failed_lines: list[dict],
+    start_offset: int,
+) -> Iterator[tuple[list[dict], int]]:
     batch: list[dict] = []
-    with file_path.open("r", encoding="utf-8") as handle:
-        for raw_line in handle:
-            line = raw_line.strip()
-            if not line:
-                continue
-            batch.extend(parse_line(line, file_path, failed_lines))
-            if len(batch) >= batch_size:
-                yield batch
-                batch = []
-    if batch:
-        yield batch
+    offset = start_offset
+    remainder = b""
+    for block in iter_decompressed_blocks(file_path, compression, skip=start_offset):
+        data = remainder + block if remainder else block
+        position = 0
+        with memoryview(data) as view:
+            while (newline := data.find(b"\n", position)) != -1:
+                if newline > position:
+                    with view[position:newline] as line:
+                        batch.extend(parse_line(line, file_path, failed_lines))
+                offset += newline + 1 - position
+                position = newline + 1
+                if len(batch) >= batch_size:
+                    yield batch, offset
+                    batch = []
+        remainder = data[position:]
 
+    if remainder:
+        batch.extend(parse_line(remainder, file_path, failed_lines))
+        offset += len(remainder)
+    if batch or failed_lines:
+        yield batch, offset
 
-def parse_line(line: str, file_path: Path, failed_lines: list[dict]) -> Iterator[dict]:
-    """Parse a JSONL line, handling concatenated JSON objects."""
+
+def parse_line(line: bytes | memoryview, file_path: Path, failed_lines: list[dict]) -> Iterator[dict]:
+    """Parse a JSONL line, handling concatenated JSON objects.
+
+    The line is only copied and decoded when it fails to parse.
+    """
     try:
         yield transform_row(orjson.loads(line))
     except orjson.JSONDecodeError:
-        if "}{" not in line:
-            logger.warning("Skipping malformed line in %s: %s", file_path.name, line[:120])
-            failed_lines.append({"raw_line": line, "error": "malformed JSON"})
+        raw_line = bytes(line).strip()
+        if not raw_line:
+            return
+        if b"}{" not in raw_line:
+            text = raw_line.decode("utf-8", "replace")
+            logger.warning("Skipping malformed line in %s: %s", file_path.name, text[:120])
+            failed_lines.append({"raw_line": text, "error": "malformed JSON"})
             return
-        fragments = line.replace("}{", "}\n{").split("\n")
+        fragments = raw_line.replace(b"}{", b"}\n{").split(b"\n")
         for fragment in fragments:
             try:
                 yield transform_row(orjson.loads(fragment))
             except (orjson.JSONDecodeError, KeyError, ValueError) as error:
-                logger.warning("Skipping malformed fragment in %s: %s", file_path.name, fragment[:120])
-                failed_lines.append({"raw_line": fragment, "error": str(error)})
+                text = fragment.decode("utf-8", "replace")
+                logger.warning("Skipping malformed fragment in %s: %s", file_path.name, text[:120])
+                failed_lines.append({"raw_line": text, "error": str(error)})
     except Exception as error:
-        logger.exception("Skipping bad row in %s: %s", file_path.name, line[:120])
-        failed_lines.append({"raw_line": line, "error": str(error)})
+        text = bytes(line).decode("utf-8", "replace")
+        logger.exception("Skipping bad row in %s: %s", file_path.name, text[:120])
+        failed_lines.append({"raw_line": text, "error": str(error)})
 
 
 def transform_row(raw: dict) -> dict:
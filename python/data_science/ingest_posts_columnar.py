@@ -0,0 +1,329 @@
+"""Columnar ingest path that parses and transforms whole JSONL blocks with Polars.
+
+Each batch of lines is handed to Polars as one contiguous block of the memory-mapped file.
+The date decode, NUL stripping and langs serialization run as vectorized expressions, and the
+frame is written to COPY as a single CSV payload instead of row by row.
+
+Blocks Polars cannot parse (malformed or concatenated JSON, unexpected types) go through the
+dict path in ingest_posts, which isolates bad lines one at a time. Compressed files always use
+the dict path.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import mmap
+import os
+import re
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from python.data_science.ingest_posts import (
+    COLUMNS,
+    CREATE_STAGING,
+    INTEGER_LIMITS,
+    NOT_NULL_COLUMNS,
+    PARTITION_YEARS,
+    TEXT_COLUMNS,
+    BatchStats,
+    Compression,
+    Route,
+    detect_compression,
+    failed_record,
+    insert_batch,
+    insert_from_staging,
+    parse_line,
+    read_batches_with_failures,
+)
+from python.orm.data_science_dev.posts.partitions import partition_name
+
+if TYPE_CHECKING:
+    from collections.abc import Container, Iterator
+    from pathlib import Path
+
+    import psycopg
+
+    from python.data_science.partition_manager import PartitionManager
+
+logger = logging.getLogger(__name__)
+
+# Lenient source types: counts are read as Int64 and narrowed by Postgres on INSERT.
+RAW_SCHEMA = {
+    "post_id": pl.Int64,
+    "user_id": pl.Int64,
+    "instance": pl.String,
+    "date": pl.Int64,
+    "text": pl.String,
+    "langs": pl.List(pl.String),
+    "like_count": pl.Int64,
+    "reply_count": pl.Int64,
+    "repost_count": pl.Int64,
+    "reply_to": pl.Int64,
+    "replied_author": pl.Int64,
+    "thread_root": pl.Int64,
+    "thread_root_author": pl.Int64,
+    "repost_from": pl.Int64,
+    "reposted_author": pl.Int64,
+    "quotes": pl.Int64,
+    "quoted_author": pl.Int64,
+    "labels": pl.String,
+    "sent_label": pl.Int64,
+    "sent_score": pl.Float64,
+}
+
+# A text column key followed by anything but a string or null. Polars would silently cast such a
+# value to a string, so a block containing one takes the dict path and is loaded exactly as
+# without --columnar. Quotes inside JSON strings are escaped, so string values cannot match.
+NON_STRING_TEXT = re.compile(rb'"(?:%s)"\s*:\s*[^"\sn]' % "|".join(TEXT_COLUMNS).encode())
+
+# CSV keeps NULL (unquoted empty field) apart from the empty string, which Polars writes as "".
+COPY_CSV_TO_STAGING = f"COPY pg_temp.staging ({', '.join(COLUMNS)}) FROM STDIN (FORMAT CSV)"
+
+
+def read_frame_batches(
+    file_path: Path,
+    batch_size: int,
+    *,
+    start_offset: int = 0,
+    end_offset: int | None = None,
+) -> Iterator[tuple[pl.DataFrame | list[dict], int, list[dict]]]:
+    """Yield blocks of batch_size lines as transformed frames, like read_batches_with_failures.
+
+    Blocks that Polars rejects are parsed line by line with parse_line and yielded as a list of
+    dicts, together with the malformed lines found in them.
+
+    Args:
+        file_path (Path): JSONL file to read.
+        batch_size (int): Lines per block.
+        start_offset (int, optional): Byte offset to start at; must be at a line boundary.
+        end_offset (int, optional): Stop once this byte offset is reached; must be at a line boundary.
+
+    Yields:
+        tuple[pl.DataFrame | list[dict], int, list[dict]]: A frame or fallback batch, the byte offset
+            just past its last line, and the malformed lines read with it.
+    """
+    if detect_compression(file_path) != Compression.NONE:
+        logger.info("%s is compressed, using the dict path", file_path.name)
+        yield from read_batches_with_failures(file_path, batch_size, start_offset=start_offset, end_offset=end_offset)
+        return
+
+    with file_path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            if hasattr(mapped, "madvise"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            limit = size if end_offset is None else min(end_offset, size)
+            offset = start_offset
+            while offset < limit:
+                block_end = advance_lines(mapped, offset, batch_size, limit)
+                with view[offset:block_end] as block:
+                    frame = frame_from_block(block)
+                if frame is not None:
+                    yield frame, block_end, []
+                else:
+                    failed_lines: list[dict] = []
+                    batch = parse_block_lines(mapped, view, offset, block_end, file_path, failed_lines)
+                    yield batch, block_end, failed_lines
+                offset = block_end
+
+
+def advance_lines(mapped: mmap.mmap, offset: int, lines: int, limit: int) -> int:
+    """Return the offset just past the next `lines` lines, stopping at limit or the end of the file."""
+    position = offset
+    for _ in range(lines):
+        newline = mapped.find(b"\n", position)
+        if newline == -1:
+            return len(mapped)
+        position = newline + 1
+        if position >= limit:
+            break
+    return position
+
+
+def parse_block_lines(
+    mapped: mmap.mmap,
+    view: memoryview,
+    start: int,
+    end: int,
+    file_path: Path,
+    failed_lines: list[dict],
+) -> list[dict]:
+    """Parse the lines in mapped[start:end] one by one through the dict path."""
+    logger.info("Polars rejected a block of %s at byte %d, parsing it line by line", file_path.name, start)
+    batch: list[dict] = []
+    position = start
+    while position < end:
+        newline = mapped.find(b"\n", position, end)
+        line_end = end if newline == -1 else newline
+        if line_end > position:
+            with view[position:line_end] as line:
+                batch.extend(parse_line(line, file_path, failed_lines))
+        position = line_end + 1
+    return batch
+
+
+def frame_from_block(block: memoryview) -> pl.DataFrame | None:
+    """Parse a block of JSONL into a transformed frame, or None if Polars cannot read or transform it.
+
+    A date that is not a valid datetime (month 13, Feb 31) makes transform_frame raise, and
+    the block then goes through the dict path, which records that line as failed. So does a
+    block with a non-string instance, text or labels value, which Polars would cast to a string.
+    """
+    if NON_STRING_TEXT.search(block):
+        return None
+    try:
+        return transform_frame(pl.read_ndjson(io.BytesIO(block), schema=RAW_SCHEMA))
+    except (pl.exceptions.PolarsError, ValueError):
+        return None
+
+
+def transform_frame(raw: pl.DataFrame) -> pl.DataFrame:
+    """Vectorized transform_row: decode dates, strip NUL bytes and serialize langs as JSON."""
+    date = pl.col("date")
+    langs_json = pl.struct("langs").struct.json_encode().str.strip_prefix('{"langs":').str.strip_suffix("}")
+    return raw.with_columns(
+        pl.datetime(
+            date // 100000000,
+            (date // 1000000) % 100,
+            (date // 10000) % 100,
+            (date // 100) % 100,
+            date % 100,
+        ).alias("date"),
+        pl.col("text").str.replace_all("\x00", "", literal=True),
+        pl.when(pl.col("langs").is_not_null()).then(langs_json).alias("langs"),
+    ).select(COLUMNS)
+
+
+def group_frame_by_partition(
+    frame: pl.DataFrame,
+    routable: Container[str] | None = None,
+) -> dict[str, pl.DataFrame]:
+    """Split a frame by weekly partition, like group_by_partition for dict rows."""
+    keyed = frame.with_columns(
+        pl.col("date").dt.iso_year().alias("iso_year"),
+        pl.col("date").dt.week().alias("iso_week"),
+    )
+    groups: dict[str, list[pl.DataFrame]] = {}
+    for (year, week), group in keyed.group_by("iso_year", "iso_week", maintain_order=True):
+        if year is None:
+            table = "posts"
+        else:
+            name = partition_name(year, week)
+            in_range = name in routable if routable is not None else PARTITION_YEARS[0] <= year <= PARTITION_YEARS[1]
+            table = name if in_range else "posts"
+        groups.setdefault(table, []).append(group.drop("iso_year", "iso_week"))
+    return {table: pl.concat(parts) for table, parts in groups.items()}
+
+
+def frame_to_rows(frame: pl.DataFrame) -> list[dict]:
+    """Convert a transformed frame back into dict rows, with UTC-aware dates."""
+    return frame.with_columns(pl.col("date").dt.replace_time_zone("UTC")).to_dicts()
+
+
+def copy_frame_to_staging(cursor: psycopg.Cursor, frame: pl.DataFrame) -> None:
+    """COPY a transformed frame into pg_temp.staging as one CSV payload."""
+    payload = frame.write_csv(include_header=False, datetime_format="%Y-%m-%d %H:%M:%S")
+    with cursor.copy(COPY_CSV_TO_STAGING) as copy:
+        copy.write(payload)
+
+
+def ingest_frame(
+    connection: psycopg.Connection,
+    frame: pl.DataFrame,
+    *,
+    route: Route = Route.PARENT,
+    validate: bool = True,
+    stats: BatchStats | None = None,
+    partitions: PartitionManager | None = None,
+) -> list[dict]:
+    """Validate a transformed frame, COPY the valid rows into staging, then INSERT ... ON CONFLICT into posts.
+
+    If the bulk insert fails the frame is converted to rows and handed to insert_batch,
+    which bisects it to find and record the bad rows.
+
+    Args:
+        connection (psycopg.Connection): Open psycopg connection.
+        frame (pl.DataFrame): Frame from transform_frame.
+        route (Route, optional): Insert through main.posts or straight into the weekly partitions.
+        validate (bool, optional): Check rows on the client before sending them.
+        stats (BatchStats, optional): Accumulates round trips and rejected rows.
+        partitions (PartitionManager, optional): Creates missing weekly partitions before the COPY.
+
+    Returns:
+        list[dict]: failed_ingestion records for the rows rejected by validation.
+    """
+    if stats is None:
+        stats = BatchStats()
+    stats.batches += 1
+
+    rejected: list[dict] = []
+    if validate:
+        years = PARTITION_YEARS if partitions is None else partitions.validation_years
+        frame, rejected = split_valid_frame(frame, years=years)
+        stats.rejected_rows += len(rejected)
+    if frame.is_empty():
+        return rejected
+
+    date = pl.col("date")
+    weeks = set(frame.select(date.dt.iso_year(), date.dt.week().alias("week")).drop_nulls().unique().rows())
+    stats.weeks.update(weeks)
+    routable = None
+    if partitions is not None:
+        partitions.ensure_weeks(weeks)
+        routable = partitions.existing
+
+    stats.round_trips += 1
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(CREATE_STAGING)
+            groups = group_frame_by_partition(frame, routable) if route == Route.PARTITION else {"posts": frame}
+            for table, group in groups.items():
+                cursor.execute("TRUNCATE pg_temp.staging")
+                copy_frame_to_staging(cursor, group)
+                cursor.execute(insert_from_staging(table))
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        logger.warning("Columnar insert of %d rows failed, retrying through the dict path", len(frame), exc_info=True)
+        rows = frame_to_rows(frame)
+        insert_batch(connection, rows, binary_types=None, route=route, stats=stats, routable=routable)
+    return rejected
+
+
+def split_valid_frame(
+    frame: pl.DataFrame,
+    *,
+    years: tuple[int, int] | None = PARTITION_YEARS,
+) -> tuple[pl.DataFrame, list[dict]]:
+    """Vectorized split_valid_rows: return the valid rows and failed_ingestion records for the rest.
+
+    Types are already enforced by RAW_SCHEMA and NON_STRING_TEXT, so only nulls, integer ranges,
+    NUL bytes and, unless years is None, the partition years are checked.
+    """
+    checks = [
+        *((pl.col(column).is_null(), f"{column} is null") for column in NOT_NULL_COLUMNS),
+        *(
+            (~pl.col(column).is_between(-limit - 1, limit), f"{column} is not an integer within its column type")
+            for column, limit in INTEGER_LIMITS.items()
+        ),
+        *(
+            (pl.col(column).str.contains("\x00", literal=True), f"{column} contains a NUL byte")
+            for column in TEXT_COLUMNS
+        ),
+    ]
+    if years is not None:
+        checks.append((~pl.col("date").dt.iso_year().is_between(*years), "date has no partition"))
+    error = pl.coalesce(pl.when(check).then(pl.lit(reason)) for check, reason in checks)
+    checked = frame.with_columns(error.alias("error"))
+    invalid = checked.filter(pl.col("error").is_not_null())
+    if invalid.is_empty():
+        return frame, []
+
+    logger.warning("Rejecting %d rows that would fail the INSERT", len(invalid))
+    rows = frame_to_rows(invalid.drop("error"))
+    rejected = [failed_record(row, error) for row, error in zip(rows, invalid["error"], strict=True)]
+    return checked.filter(pl.col("error").is_null()).drop("error"), rejected
@@ -0,0 +1,123 @@
+"""Post-ingest maintenance for the weekly posts partitions a run touched.
+
+Bulk loads leave the planner statistics of the loaded partitions stale until autovacuum
+gets to them, so analytic queries pick bad plans in the meantime. finalize_partitions runs
+ANALYZE on just the touched partitions, a few at a time, and can build the secondary
+indexes after the load with CREATE INDEX CONCURRENTLY instead of maintaining them during it.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from python.data_science.partition_manager import DEFAULT_PARTITION, PartitionManager
+from python.orm.data_science_dev.posts.partitions import partition_name
+from python.parallelize import parallelize_thread
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    import psycopg
+
+logger = logging.getLogger(__name__)
+
+SECONDARY_INDEX_COLUMNS = ("user_id", "thread_root", "reply_to")
+
+INDEX_VALID_SELECT = """
+    SELECT pg_index.indisvalid
+    FROM pg_index
+    JOIN pg_class ON pg_class.oid = pg_index.indexrelid
+    JOIN pg_namespace ON pg_namespace.oid = pg_class.relnamespace
+    WHERE pg_namespace.nspname = %(schema)s AND pg_class.relname = %(index)s
+"""
+
+
+def touched_tables(weeks: Iterable[tuple[int, int]], attached: set[str]) -> list[str]:
+    """Map touched (ISO year, ISO week) keys to the partitions that received their rows.
+
+    Weeks without a partition of their own went to the DEFAULT partition, if there is one.
+    """
+    tables: set[str] = set()
+    for year, week in weeks:
+        name = partition_name(year, week)
+        if name in attached:
+            tables.add(name)
+        elif DEFAULT_PARTITION in attached:
+            tables.add(DEFAULT_PARTITION)
+    return sorted(tables)
+
+
+def finalize_partitions(
+    weeks: Iterable[tuple[int, int]],
+    *,
+    connect: Callable[[], psycopg.Connection],
+    schema: str,
+    max_workers: int = 4,
+    analyze: bool = True,
+    build_indexes: bool = False,
+) -> None:
+    """ANALYZE, and optionally index, the partitions a run touched.
+
+    Args:
+        weeks (Iterable[tuple[int, int]]): (ISO year, ISO week) keys of the ingested rows.
+        connect (Callable[[], psycopg.Connection]): Opens a new connection; one is used per partition.
+        schema (str): Schema of the posts table.
+        max_workers (int, optional): Partitions maintained at the same time.
+        analyze (bool, optional): Run ANALYZE on each touched partition.
+        build_indexes (bool, optional): CREATE INDEX CONCURRENTLY on SECONDARY_INDEX_COLUMNS first.
+    """
+    if not analyze and not build_indexes:
+        return
+
+    with connect() as connection:
+        attached = PartitionManager(connection, schema, create_missing=False).existing
+    tables = touched_tables(weeks, attached)
+    if not tables:
+        return
+
+    logger.info("Finalizing %d partitions with %d workers: %s", len(tables), max_workers, ", ".join(tables))
+    results = parallelize_thread(
+        func=maintain_partition,
+        kwargs_list=[
+            {"connect": connect, "schema": schema, "table": table, "analyze": analyze, "build_indexes": build_indexes}
+            for table in tables
+        ],
+        max_workers=max_workers,
+    )
+    for error in results.exceptions:
+        logger.error("Partition maintenance failed: %s", error)
+
+
+def maintain_partition(
+    *,
+    connect: Callable[[], psycopg.Connection],
+    schema: str,
+    table: str,
+    analyze: bool,
+    build_indexes: bool,
+) -> str:
+    """Build the secondary indexes of one partition and/or ANALYZE it. Returns the table name."""
+    with connect() as connection:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        connection.autocommit = True
+        if build_indexes:
+            for column in SECONDARY_INDEX_COLUMNS:
+                create_index_concurrently(connection, schema, table, column)
+        if analyze:
+            connection.execute(f"ANALYZE {schema}.{table}")
+            logger.info("Analyzed %s.%s", schema, table)
+    return table
+
+
+def create_index_concurrently(connection: psycopg.Connection, schema: str, table: str, column: str) -> None:
+    """CREATE INDEX CONCURRENTLY on table(column), replacing an invalid index left by an interrupted build."""
+    index = f"ix_{table}_{column}"
+    row = connection.execute(INDEX_VALID_SELECT, {"schema": schema, "index": index}).fetchone()
+    if row is not None and row[0]:
+        return
+    if row is not None:
+        logger.warning("Rebuilding invalid index %s.%s", schema, index)
+        connection.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema}.{index}")
+    connection.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {schema}.{table} ({column})")
+    logger.info("Created index %s.%s", schema, index)
@@ -0,0 +1,260 @@
+"""Initial-load path that bulk loads brand-new weeks of posts without ON CONFLICT.
+
+With --initial-load, rows of every week that has no partition yet are COPYed into an
+UNLOGGED load_posts_YYYY_WW table with no indexes, so the load pays for neither WAL nor
+unique-index probes. Once every chunk is done, merge_load_tables turns the load tables into
+partitions a few at a time: each is deduplicated on the server with DISTINCT ON into a new
+posts_YYYY_WW table, its primary key is built in one pass, and it is attached to main.posts.
+A CHECK constraint matching the week's bounds lets ATTACH PARTITION skip its validation scan.
+
+Rows of weeks that already have a partition go through the usual INSERT ... ON CONFLICT.
+
+Crash recovery empties unlogged tables. If the server crashes before the merge, rows the
+ledger has already checkpointed are lost, so rerun the load with --no-resume.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from python.data_science.ingest_posts import (
+    COLUMNS,
+    BatchStats,
+    Route,
+    copy_rows,
+    insert_batch,
+    record_failed_row,
+    split_valid_rows,
+)
+from python.data_science.partition_manager import (
+    PARENT_TABLE,
+    PARTITION_LOCK,
+    PARTITIONS_SELECT,
+    PartitionManager,
+    partition_bounds,
+)
+from python.orm.data_science_dev.posts.partitions import partition_key, partition_name
+from python.parallelize import parallelize_thread
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    import psycopg
+
+logger = logging.getLogger(__name__)
+
+LOAD_TABLE = re.compile(r"load_posts_(?P<year>\d{4})_(?P<week>\d{2})")
+
+LOAD_TABLES_SELECT = """
+    SELECT pg_class.relname
+    FROM pg_class
+    JOIN pg_namespace ON pg_namespace.oid = pg_class.relnamespace
+    WHERE pg_namespace.nspname = %(schema)s AND pg_class.relkind = 'r' AND pg_class.relname ~ %(pattern)s
+    ORDER BY pg_class.relname
+"""
+
+
+def load_table_name(year: int, week: int) -> str:
+    """Name of the UNLOGGED table that collects an ISO week's rows during an initial load."""
+    return f"load_{partition_name(year, week)}"
+
+
+class InitialLoader:
+    """COPYs a worker's batches into the load tables of the weeks that have no partition yet.
+
+    Args:
+        connection (psycopg.Connection): Connection used for the COPYs; each batch commits.
+        schema (str): Schema of the posts table.
+        binary_types (Sequence[int], optional): Type oids from binary_copy_types. Uses text COPY when None.
+    """
+
+    def __init__(
+        self,
+        connection: psycopg.Connection,
+        schema: str,
+        *,
+        binary_types: Sequence[int] | None = None,
+    ) -> None:
+        """Initialize the loader with the partitions attached when it starts."""
+        self.connection = connection
+        self.schema = schema
+        self.binary_types = binary_types
+        self.attached = PartitionManager(connection, schema, create_missing=False).existing
+        self._load_tables: set[str] = set()
+
+    def load_batch(self, batch: list[dict], *, validate: bool = True, stats: BatchStats | None = None) -> list[dict]:
+        """Validate batch, COPY the rows of new weeks into load tables and insert the rest into posts.
+
+        Args:
+            batch (list[dict]): Transformed rows keyed by column name.
+            validate (bool, optional): Check rows on the client before sending them.
+            stats (BatchStats, optional): Accumulates round trips and rejected rows.
+
+        Returns:
+            list[dict]: failed_ingestion records for the rows rejected by validation.
+        """
+        if stats is None:
+            stats = BatchStats()
+        stats.batches += 1
+
+        rejected: list[dict] = []
+        if validate:
+            # every week gets a table of its own, so any date is loadable
+            batch, rejected = split_valid_rows(batch, years=None)
+            stats.rejected_rows += len(rejected)
+
+        existing: list[dict] = []
+        new: list[dict] = []
+        for row in batch:
+            date = row.get("date")
+            if not isinstance(date, datetime):
+                existing.append(row)
+                continue
+            key = partition_key(date)
+            stats.weeks.add(key)
+            (existing if partition_name(*key) in self.attached else new).append(row)
+
+        insert_batch(
+            self.connection,
+            existing,
+            binary_types=self.binary_types,
+            route=Route.PARTITION,
+            stats=stats,
+            routable=self.attached,
+        )
+        self.copy_to_load_tables(new, stats)
+        return rejected
+
+    def copy_to_load_tables(self, rows: list[dict], stats: BatchStats) -> None:
+        """COPY rows into their weeks' load tables in one transaction, halving on failure to isolate bad rows."""
+        if not rows:
+            return
+
+        groups: dict[str, list[dict]] = {}
+        for row in rows:
+            groups.setdefault(load_table_name(*partition_key(row["date"])), []).append(row)
+        self.ensure_load_tables(groups)
+
+        stats.round_trips += 1
+        try:
+            with self.connection.cursor() as cursor:
+                for table, group in groups.items():
+                    copy_rows(cursor, f"{self.schema}.{table}", group, self.binary_types)
+            self.connection.commit()
+        except Exception as error:
+            self.connection.rollback()
+
+            if len(rows) == 1:
+                logger.exception("Skipping bad row post_id=%s", rows[0].get("post_id"))
+                record_failed_row(self.connection, rows[0], error, stats)
+                return
+
+            midpoint = len(rows) // 2
+            for half in (rows[:midpoint], rows[midpoint:]):
+                self.copy_to_load_tables(half, stats)
+
+    def ensure_load_tables(self, tables: Iterable[str]) -> None:
+        """Create the load tables this connection has not used yet."""
+        missing = sorted(set(tables) - self._load_tables)
+        if not missing:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(PARTITION_LOCK, {"parent": f"{self.schema}.{PARENT_TABLE}"})
+            for table in missing:
+                cursor.execute(
+                    f"CREATE UNLOGGED TABLE IF NOT EXISTS {self.schema}.{table} "
+                    f"(LIKE {self.schema}.{PARENT_TABLE} INCLUDING DEFAULTS)"
+                )
+        self.connection.commit()
+        self._load_tables.update(missing)
+
+
+def merge_load_tables(
+    *,
+    connect: Callable[[], psycopg.Connection],
+    schema: str,
+    max_workers: int = 4,
+) -> list[str]:
+    """Turn every load table in schema into an attached partition of posts.
+
+    Load tables left behind by an earlier run that failed to merge are picked up as well.
+
+    Args:
+        connect (Callable[[], psycopg.Connection]): Opens a new connection; one is used per load table.
+        schema (str): Schema of the posts table.
+        max_workers (int, optional): Load tables merged at the same time.
+
+    Returns:
+        list[str]: The partitions that were merged.
+    """
+    with connect() as connection:
+        rows = connection.execute(LOAD_TABLES_SELECT, {"schema": schema, "pattern": f"^{LOAD_TABLE.pattern}$"})
+        tables = [table for (table,) in rows.fetchall()]
+    if not tables:
+        return []
+
+    logger.info("Merging %d load tables with %d workers", len(tables), max_workers)
+    results = parallelize_thread(
+        func=merge_load_table,
+        kwargs_list=[{"connect": connect, "schema": schema, "table": table} for table in tables],
+        max_workers=max_workers,
+    )
+    for error in results.exceptions:
+        logger.error("Merging a load table failed, it is kept for the next run: %s", error)
+    return results.results
+
+
+def merge_load_table(*, connect: Callable[[], psycopg.Connection], schema: str, table: str) -> str:
+    """Deduplicate one load table into its week's partition, attach it and drop the load table.
+
+    If the week got a partition since the load started, the rows are inserted into it with
+    ON CONFLICT instead. Returns the partition name.
+    """
+    match = LOAD_TABLE.fullmatch(table)
+    if match is None:
+        error = f"{table} is not a load table"
+        raise ValueError(error)
+    year, week = int(match["year"]), int(match["week"])
+    name = partition_name(year, week)
+    partition = f"{schema}.{name}"
+    parent = f"{schema}.{PARENT_TABLE}"
+    start, end = partition_bounds(year, week)
+    columns = ", ".join(COLUMNS)
+
+    with connect() as connection, connection.cursor() as cursor:
+        attached = {relname for relname, _ in cursor.execute(PARTITIONS_SELECT, {"parent": parent}).fetchall()}
+        if name in attached:
+            logger.info("%s already exists, merging %s with ON CONFLICT", partition, table)
+            cursor.execute(
+                f"""
+                INSERT INTO {partition} ({columns})
+                SELECT {columns} FROM {schema}.{table}
+                ON CONFLICT (post_id, date) DO NOTHING
+                """  # noqa: S608
+            )
+        else:
+            bounds = f"{name}_bounds"
+            cursor.execute(f"CREATE TABLE {partition} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+            cursor.execute(
+                f"""
+                INSERT INTO {partition} ({columns})
+                SELECT DISTINCT ON (post_id, date) {columns} FROM {schema}.{table}
+                ORDER BY post_id, date
+                """  # noqa: S608
+            )
+            cursor.execute(f"ALTER TABLE {partition} ADD CONSTRAINT pk_{name} PRIMARY KEY (post_id, date)")
+            cursor.execute(
+                f"ALTER TABLE {partition} ADD CONSTRAINT {bounds} CHECK (date >= '{start}' AND date < '{end}')"
+            )
+            cursor.execute(PARTITION_LOCK, {"parent": parent})
+            cursor.execute(
+                f"ALTER TABLE {parent} ATTACH PARTITION {partition} FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+            cursor.execute(f"ALTER TABLE {partition} DROP CONSTRAINT {bounds}")
+        cursor.execute(f"DROP TABLE {schema}.{table}")
+        connection.commit()
+    logger.info("Merged %s.%s into %s", schema, table, partition)
+    return partition
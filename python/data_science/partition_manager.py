@@ -0,0 +1,187 @@
+"""Create missing weekly partitions of the posts table on demand.
+
+Partition tables used to be added one year at a time with a hand-written alembic
+migration. PartitionManager instead looks at the weeks an incoming batch touches and
+creates whatever is missing, with the same names and ISO-week bounds as the migrated
+partitions, before the batch is copied.
+
+Creation is idempotent and serialized across processes with a transaction-level
+advisory lock, so parallel ingest workers can race on the same week safely.
+
+If a DEFAULT partition exists, rows for a new week may already sit in it. A new week is
+then built as a standalone table, filled with those rows and attached, because Postgres
+refuses to create a partition whose rows are still in the DEFAULT partition.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from python.orm.data_science_dev.posts.partitions import (
+    PARTITION_START_YEAR,
+    partition_name,
+    week_bounds,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import psycopg
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "posts"
+DEFAULT_PARTITION = "posts_default"
+
+PARTITIONS_SELECT = """
+    SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) = 'DEFAULT'
+    FROM pg_inherits
+    JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = %(parent)s::regclass
+"""
+
+PARTITION_LOCK = "SELECT pg_advisory_xact_lock(hashtext(%(parent)s))"
+
+
+def partition_bounds(year: int, week: int) -> tuple[str, str]:
+    """Return the FROM and TO literals of an ISO week partition, as naive UTC timestamps."""
+    start, end = week_bounds(year, week)
+    return start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class PartitionManager:
+    """Keeps track of the partitions attached to posts and creates missing weeks.
+
+    Args:
+        connection (psycopg.Connection): Connection used for the DDL; each call commits.
+        schema (str): Schema of the posts table.
+        first_year (int, optional): Earliest ISO year to create partitions for.
+        last_year (int, optional): Latest ISO year to create partitions for. Defaults to next year.
+        create_missing (bool, optional): Create missing weeks; otherwise only existing ones are used.
+        default_partition (bool, optional): Create a DEFAULT partition that takes every other row.
+    """
+
+    def __init__(
+        self,
+        connection: psycopg.Connection,
+        schema: str,
+        *,
+        first_year: int = PARTITION_START_YEAR,
+        last_year: int | None = None,
+        create_missing: bool = True,
+        default_partition: bool = False,
+    ) -> None:
+        """Initialize the manager; the partition list is read on first use."""
+        self.connection = connection
+        self.schema = schema
+        self.first_year = first_year
+        self.last_year = datetime.now(UTC).year + 1 if last_year is None else last_year
+        self.create_missing = create_missing
+        self.default_partition = default_partition
+        self._existing: set[str] | None = None
+        self._has_default = False
+
+    @property
+    def parent(self) -> str:
+        """Schema-qualified name of the partitioned table."""
+        return f"{self.schema}.{PARENT_TABLE}"
+
+    @property
+    def existing(self) -> set[str]:
+        """Names of the partitions currently attached to posts."""
+        if self._existing is None:
+            self.refresh()
+        return self._existing
+
+    def refresh(self) -> set[str]:
+        """Re-read the attached partitions, creating the DEFAULT partition if requested."""
+        with self.connection.cursor() as cursor:
+            rows = cursor.execute(PARTITIONS_SELECT, {"parent": self.parent}).fetchall()
+        self.connection.commit()
+        self._existing = {name for name, _ in rows}
+        self._has_default = any(is_default for _, is_default in rows)
+        if self.default_partition and not self._has_default:
+            self.ensure_default()
+        return self._existing
+
+    def covers(self, year: int) -> bool:
+        """Whether rows of this ISO year get a weekly partition of their own."""
+        return self.first_year <= year <= self.last_year
+
+    @property
+    def validation_years(self) -> tuple[int, int] | None:
+        """ISO years rows must fall in, or None when the DEFAULT partition takes everything else."""
+        if self.default_partition:
+            return None
+        return self.first_year, self.last_year
+
+    def ensure_weeks(self, keys: Iterable[tuple[int, int]]) -> list[str]:
+        """Create the missing partitions for (ISO year, ISO week) keys. Returns the created names."""
+        if not self.create_missing:
+            return []
+        existing = self.existing
+        missing = sorted(
+            (year, week) for year, week in keys if self.covers(year) and partition_name(year, week) not in existing
+        )
+        if not missing:
+            return []
+
+        created: list[str] = []
+        with self.connection.cursor() as cursor:
+            cursor.execute(PARTITION_LOCK, {"parent": self.parent})
+            rows = cursor.execute(PARTITIONS_SELECT, {"parent": self.parent}).fetchall()
+            attached = {name for name, _ in rows}
+            has_default = any(is_default for _, is_default in rows)
+            for year, week in missing:
+                name = partition_name(year, week)
+                if name in attached:
+                    continue
+                self._create_week(cursor, year, week, from_default=has_default)
+                created.append(name)
+        self.connection.commit()
+
+        if created:
+            logger.info("Created %d posts partitions: %s", len(created), ", ".join(created))
+        self._existing = attached | set(created)
+        self._has_default = has_default
+        return created
+
+    def _create_week(self, cursor: psycopg.Cursor, year: int, week: int, *, from_default: bool) -> None:
+        name = f"{self.schema}.{partition_name(year, week)}"
+        start, end = partition_bounds(year, week)
+        if not from_default:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {self.parent} FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+            return
+
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {name} (LIKE {self.parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {self.schema}.{DEFAULT_PARTITION}
+                WHERE date >= %(start)s AND date < %(end)s
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """,  # noqa: S608
+            {"start": start, "end": end},
+        )
+        cursor.execute(f"ALTER TABLE {self.parent} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')")
+
+    def ensure_default(self) -> None:
+        """Create the DEFAULT partition that catches rows outside every weekly partition."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(PARTITION_LOCK, {"parent": self.parent})
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.schema}.{DEFAULT_PARTITION} PARTITION OF {self.parent} DEFAULT"
+            )
+        self.connection.commit()
+        logger.info("Ensured DEFAULT partition %s.%s", self.schema, DEFAULT_PARTITION)
+        if self._existing is not None:
+            self._existing.add(DEFAULT_PARTITION)
+        self._has_default = True
@@ -19,6 +19,9 @@ logger = logging.getLogger(__name__)
 def safe_insert(orm_objects: Sequence[object], session: Session) -> list[tuple[Exception, object]]:
     """Safer insert at allows for partial rollbacks.
 
+    Objects that fail validate_orm_object are returned without being sent, so the bisecting
+    fallback only has to isolate failures that need the database to detect.
+
     Args:
         orm_objects (Sequence[object]): Tables to insert.
         session (Session): Database session.
@@ -26,7 +29,43 @@ def safe_insert(orm_objects: Sequence[object], session: Session) -> list[tuple[E
     if unmapped := [orm_object for orm_object in orm_objects if not _is_mapped_instance(orm_object)]:
         error = f"safe_insert expects ORM-mapped instances {unmapped}"
         raise TypeError(error)
-    return _safe_insert(orm_objects, session)
+
+    valid: list[object] = []
+    exceptions: list[tuple[Exception, object]] = []
+    for orm_object in orm_objects:
+        if (reason := validate_orm_object(orm_object)) is None:
+            valid.append(orm_object)
+        else:
+            logger.warning("Rejecting %r: %s", orm_object, reason)
+            exceptions.append((ValueError(reason), orm_object))
+
+    if valid:
+        exceptions.extend(_safe_insert(valid, session))
+    return exceptions
+
+
+def validate_orm_object(orm_object: object) -> str | None:
+    """Return why inserting orm_object would fail, or None if it looks valid.
+
+    Checks NOT NULL columns without a default, NUL bytes in strings and string lengths.
+    Primary keys and foreign keys are skipped, since the flush fills them in.
+    """
+    for attribute in inspect(orm_object).mapper.column_attrs:
+        column = attribute.columns[0]
+        if column.primary_key or column.foreign_keys:
+            continue
+        value = getattr(orm_object, attribute.key)
+        if value is None:
+            if not column.nullable and column.default is None and column.server_default is None:
+                return f"{attribute.key} is null"
+            continue
+        if isinstance(value, str):
+            if "\x00" in value:
+                return f"{attribute.key} contains a NUL byte"
+            length = getattr(column.type, "length", None)
+            if length is not None and len(value) > length:
+                return f"{attribute.key} is longer than {length} characters"
+    return None
 
 
 def _safe_insert(objects: Sequence[object], session: Session) -> list[tuple[Exception, object]]:
@@ -36,17 +36,26 @@ class DatabaseConfig:
     models_module: str
     script_location: str = "python/alembic"
     file_template: str = "%%(year)d_%%(month).2d_%%(day).2d-%%(slug)s_%%(rev)s"
+    autogenerate_models_module: str | None = None
+    unmanaged_tables: str | None = None
 
     def get_base(self) -> type[DeclarativeBase]:
         """Import and return the Base class."""
         module = import_module(self.base_module)
         return getattr(module, self.base_class_name)
 
-    def import_models(self) -> None:
-        """Import ORM models so alembic autogenerate can detect them."""
+    def import_models(self, *, autogenerate: bool = False) -> None:
+        """Import ORM models so alembic autogenerate can detect them.
+
+        Args:
+            autogenerate (bool, optional): Also import autogenerate_models_module, for commands
+                that compare the metadata with the database.
+        """
         import_module(self.models_module)
+        if autogenerate and self.autogenerate_models_module is not None:
+            import_module(self.autogenerate_models_module)
 
-    def alembic_config(self) -> Config:
+    def alembic_config(self, *, autogenerate: bool = False) -> Config:
         """Build an alembic Config for this database."""
         # Runtime import needed — Config is in TYPE_CHECKING for the return type annotation
         from alembic.config import Config as AlembicConfig  # noqa: PLC0415
@@ -64,7 +73,8 @@ class DatabaseConfig:
         cfg.set_section_option("post_write_hooks", "ruff.type", "ruff")
         cfg.attributes["base"] = self.get_base()
         cfg.attributes["env_prefix"] = self.env_prefix
-        self.import_models()
+        cfg.attributes["unmanaged_tables"] = self.unmanaged_tables
+        self.import_models(autogenerate=autogenerate)
         return cfg
 
 
@@ -96,6 +106,9 @@ DATABASES: dict[str, DatabaseConfig] = {
         base_module="python.orm.data_science_dev.base",
         base_class_name="DataScienceDevBase",
         models_module="python.orm.data_science_dev.models",
+        autogenerate_models_module="python.orm.data_science_dev.autogenerate_models",
+        # weekly partitions created by ingest-posts at runtime
+        unmanaged_tables=r"(load_)?posts_\d{4}_\d{2}|posts_default",
     ),
 }
 
@@ -117,7 +130,8 @@ def main(
         typer.echo(f"Unknown database: {db_name!r}. Available: {', '.join(DATABASES)}", err=True)
         raise typer.Exit(code=1)
 
-    alembic_cfg = db_config.alembic_config()
+    autogenerate = command == "check" or "--autogenerate" in ctx.args
+    alembic_cfg = db_config.alembic_config(autogenerate=autogenerate)
 
     cmd_line = CommandLine()
     options = cmd_line.parser.parse_args([command, *ctx.args])
@@ -0,0 +1,12 @@
+"""Models that only alembic autogenerate needs for the data science dev database.
+
+The database CLI imports this module for `revision --autogenerate` and `check`, so the
+hundreds of weekly partition classes are not built for every other command.
+"""
+
+from __future__ import annotations
+
+from python.orm.data_science_dev import models  # noqa: F401 — registers the regular tables in metadata
+from python.orm.data_science_dev.posts.partitions import build_partition_classes
+
+PARTITION_CLASSES = build_partition_classes()
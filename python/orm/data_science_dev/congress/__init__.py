@@ -1,12 +1,15 @@
 """init."""
 
-from python.orm.data_science_dev.congress.bill import Bill, BillText
+from python.orm.data_science_dev.congress.bill import Bill, BillText, BillTextContent
+from python.orm.data_science_dev.congress.file_manifest import CongressFileManifest
 from python.orm.data_science_dev.congress.legislator import Legislator, LegislatorSocialMedia
 from python.orm.data_science_dev.congress.vote import Vote, VoteRecord
 
 __all__ = [
     "Bill",
     "BillText",
+    "BillTextContent",
+    "CongressFileManifest",
     "Legislator",
     "LegislatorSocialMedia",
     "Vote",
@@ -5,7 +5,8 @@ from __future__ import annotations
 from datetime import date
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Index, UniqueConstraint
+from compression import zstd
+from sqlalchemy import ForeignKey, Index, LargeBinary, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from python.orm.data_science_dev.base import DataScienceDevTableBase
@@ -58,9 +59,34 @@ class BillText(DataScienceDevTableBase):
     bill_id: Mapped[int] = mapped_column(ForeignKey("main.bill.id", ondelete="CASCADE"))
     version_code: Mapped[str]
     version_name: Mapped[str | None]
-    text_content: Mapped[str | None]
+    content_id: Mapped[int | None] = mapped_column(ForeignKey("main.bill_text_content.id"))
     date: Mapped[date | None]
 
     bill: Mapped[Bill] = relationship("Bill", back_populates="bill_texts")
+    content: Mapped[BillTextContent | None] = relationship("BillTextContent")
 
     __table_args__ = (UniqueConstraint("bill_id", "version_code", name="uq_bill_text_bill_id_version_code"),)
+
+
+class BillTextContent(DataScienceDevTableBase):
+    """A distinct bill text, stored once however many versions share it.
+
+    content_hash is the SHA-256 of the document as read from disk and size its length.
+    content holds the document compressed with the codec named in compression, or as is
+    when compression is None.
+    """
+
+    __tablename__ = "bill_text_content"
+
+    content_hash: Mapped[bytes] = mapped_column(LargeBinary, unique=True)
+    compression: Mapped[str | None]
+    size: Mapped[int]
+    content: Mapped[bytes] = mapped_column(LargeBinary)
+
+    @property
+    def text(self) -> str:
+        """The document, decompressed and decoded."""
+        content = self.content
+        if self.compression == "zstd":
+            content = zstd.decompress(content)
+        return content.decode()
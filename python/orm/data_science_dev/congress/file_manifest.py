@@ -0,0 +1,23 @@
+"""Table recording the congress data files ingest-congress has already loaded."""
+
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from python.orm.data_science_dev.base import DataScienceDevTableBase
+
+
+class CongressFileManifest(DataScienceDevTableBase):
+    """Size, mtime and content hash of every bill and vote data.json that was ingested.
+
+    path is relative to the congress data directory. A file whose size and mtime still
+    match is not read again, and one whose content hash still matches is not parsed again.
+    """
+
+    __tablename__ = "congress_file_manifest"
+
+    path: Mapped[str] = mapped_column(Text, unique=True)
+    size: Mapped[int] = mapped_column(BigInteger)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger)
+    content_hash: Mapped[str]
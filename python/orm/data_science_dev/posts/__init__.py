@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 from python.orm.data_science_dev.posts.failed_ingestion import FailedIngestion
+from python.orm.data_science_dev.posts.ingestion_ledger import IngestionLedger
 from python.orm.data_science_dev.posts.tables import Posts
 
 __all__ = [
     "FailedIngestion",
+    "IngestionLedger",
     "Posts",
 ]
@@ -0,0 +1,26 @@
+"""Table tracking how far post ingestion has progressed through each JSONL file."""
+
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from python.orm.data_science_dev.base import DataScienceDevTableBase
+
+
+class IngestionLedger(DataScienceDevTableBase):
+    """Per-file checkpoint: the byte offset and row count committed so far.
+
+    size and mtime_ns identify the file version the checkpoint belongs to; a
+    file that changed on disk is ingested again from the start. Files split into
+    byte-range chunks get one row per chunk, keyed as "<path>#<start>-<end>".
+    """
+
+    __tablename__ = "ingestion_ledger"
+
+    path: Mapped[str] = mapped_column(Text, unique=True)
+    size: Mapped[int] = mapped_column(BigInteger)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger)
+    committed_offset: Mapped[int] = mapped_column(BigInteger)
+    row_count: Mapped[int] = mapped_column(BigInteger)
+    completed: Mapped[bool]
@@ -3,13 +3,17 @@
 Each class maps to a PostgreSQL partition table (e.g. posts_2024_01).
 These are real ORM models tracked by Alembic autogenerate.
 
+Classes are built on demand: accessing PostsWeek2024W01 builds that one class, and
+build_partition_classes() builds them all for autogenerate. Importing this module for
+the week helpers does not register hundreds of tables in the metadata.
+
 Uses ISO week numbering (datetime.isocalendar().week). ISO years can have
 52 or 53 weeks, and week boundaries are always Monday to Monday.
 """
 
 from __future__ import annotations
 
-import sys
+import re
 from datetime import UTC, datetime
 
 from python.orm.data_science_dev.base import DataScienceDevBase
@@ -18,7 +22,9 @@ from python.orm.data_science_dev.posts.columns import PostsColumns
 PARTITION_START_YEAR = 2023
 PARTITION_END_YEAR = 2026
 
-_current_module = sys.modules[__name__]
+_CLASS_NAME = re.compile(r"PostsWeek(?P<year>\d{4})W(?P<week>\d{2})")
+
+_partition_classes: dict[str, type] = {}
 
 
 def iso_weeks_in_year(year: int) -> int:
@@ -41,31 +47,63 @@ def week_bounds(year: int, week: int) -> tuple[datetime, datetime]:
     return start, end
 
 
-def _build_partition_classes() -> dict[str, type]:
-    """Generate one ORM class per ISO week partition."""
-    classes: dict[str, type] = {}
+def partition_name(year: int, week: int) -> str:
+    """Return the table name of an ISO week partition (e.g. posts_2024_01)."""
+    return f"posts_{year}_{week:02d}"
+
 
-    for year in range(PARTITION_START_YEAR, PARTITION_END_YEAR + 1):
-        for week in range(1, iso_weeks_in_year(year) + 1):
-            class_name = f"PostsWeek{year}W{week:02d}"
-            table_name = f"posts_{year}_{week:02d}"
+def partition_key(date: datetime) -> tuple[int, int]:
+    """Return the (ISO year, ISO week) partition a UTC datetime belongs to."""
+    iso_year, iso_week, _ = date.isocalendar()
+    return iso_year, iso_week
 
-            partition_class = type(
-                class_name,
-                (PostsColumns, DataScienceDevBase),
-                {
-                    "__tablename__": table_name,
-                    "__table_args__": ({"implicit_returning": False},),
-                },
-            )
 
-            classes[class_name] = partition_class
+def partition_class_name(year: int, week: int) -> str:
+    """Return the ORM class name of an ISO week partition (e.g. PostsWeek2024W01)."""
+    return f"PostsWeek{year}W{week:02d}"
 
-    return classes
 
+def partition_class(year: int, week: int) -> type:
+    """Return the ORM class for one ISO week partition, creating and caching it on first use."""
+    class_name = partition_class_name(year, week)
+    if (partition := _partition_classes.get(class_name)) is None:
+        partition = type(
+            class_name,
+            (PostsColumns, DataScienceDevBase),
+            {
+                "__tablename__": partition_name(year, week),
+                "__table_args__": ({"implicit_returning": False},),
+            },
+        )
+        _partition_classes[class_name] = partition
+    return partition
 
-# Generate all partition classes and register them on this module
-_partition_classes = _build_partition_classes()
-for _name, _cls in _partition_classes.items():
-    setattr(_current_module, _name, _cls)
-__all__ = list(_partition_classes.keys())
+
+def build_partition_classes() -> dict[str, type]:
+    """Generate one ORM class per ISO week partition from PARTITION_START_YEAR to PARTITION_END_YEAR.
+
+    This registers every partition table in the metadata, which only alembic autogenerate needs.
+    """
+    return {
+        partition_class_name(year, week): partition_class(year, week)
+        for year in range(PARTITION_START_YEAR, PARTITION_END_YEAR + 1)
+        for week in range(1, iso_weeks_in_year(year) + 1)
+    }
+
+
+def __getattr__(name: str) -> type:
+    """Build partition classes on attribute access, so importing this module stays cheap."""
+    if (match := _CLASS_NAME.fullmatch(name)) is not None:
+        year, week = int(match["year"]), int(match["week"])
+        if PARTITION_START_YEAR <= year <= PARTITION_END_YEAR and 1 <= week <= iso_weeks_in_year(year):
+            return partition_class(year, week)
+    error = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(error)
+
+
+# Names are resolved lazily by __getattr__.
+__all__ = [
+    partition_class_name(year, week)
+    for year in range(PARTITION_START_YEAR, PARTITION_END_YEAR + 1)
+    for week in range(1, iso_weeks_in_year(year) + 1)
+]
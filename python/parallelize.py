@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
-from dataclasses import dataclass
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from itertools import islice
 from multiprocessing import cpu_count
-from typing import TYPE_CHECKING, Any, Literal, TypeVar
+from typing import TYPE_CHECKING, Any, Literal, Self, TypeVar
+
+from python.parallelize_progress import ProgressMetrics
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Mapping, Sequence
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator, Mapping, Sequence
+    from concurrent.futures import Executor, Future
+
+    from python.parallelize_progress import ProgressCallback
 
 logger = logging.getLogger(__name__)
 
@@ -17,17 +27,82 @@ R = TypeVar("R")
 
 modes = Literal["normal", "early_error"]
 
+IN_FLIGHT_PER_WORKER = 4
+
+# How often running tasks are checked against task_timeout.
+TIMEOUT_POLL_SECONDS = 0.05
+
+# Adaptive concurrency: seconds per throughput sample, the change in throughput that counts as
+# better or worse, and how far median task latency may rise over its first sample before shrinking.
+ADAPTIVE_SAMPLE_SECONDS = 2.0
+ADAPTIVE_TOLERANCE = 0.05
+ADAPTIVE_LATENCY_FACTOR = 2.0
+
+# Chunks per worker when chunksize=None picks the size automatically, as multiprocessing.Pool.map does.
+CHUNKS_PER_WORKER = 4
+
 
 @dataclass
 class ExecutorResults[R]:
-    """Dataclass to store the results and exceptions of the parallel execution."""
+    """Dataclass to store the results and exceptions of the parallel execution.
+
+    timed_out holds the kwargs_list positions of the tasks that hit a timeout. Each timed out
+    task, or chunk of tasks with chunked dispatch, also has a TimeoutError in exceptions.
+    concurrency is the worker count an adaptive run settled on.
+    """
 
     results: list[R]
     exceptions: list[BaseException]
+    timed_out: list[int] = field(default_factory=list)
+    concurrency: int | None = None
 
     def __repr__(self) -> str:
         """Return a string representation of the object."""
-        return f"results={self.results} exceptions={self.exceptions}"
+        timed_out = f" timed_out={self.timed_out}" if self.timed_out else ""
+        concurrency = f" concurrency={self.concurrency}" if self.concurrency is not None else ""
+        return f"results={self.results} exceptions={self.exceptions}{timed_out}{concurrency}"
+
+
+@dataclass(frozen=True)
+class TaskOutcome[R]:
+    """The result or exception of one task, with the position of its kwargs in the input."""
+
+    index: int
+    result: R | None = None
+    exception: BaseException | None = None
+
+
+def _outcome[R](index: int, future: Future[R] | asyncio.Future[R]) -> TaskOutcome[R]:
+    if future.cancelled():
+        exception = asyncio.CancelledError() if isinstance(future, asyncio.Future) else CancelledError()
+        return TaskOutcome(index, exception=exception)
+    if exception := future.exception():
+        return TaskOutcome(index, exception=exception)
+    return TaskOutcome(index, result=future.result())
+
+
+def _iter_outcomes[R](
+    executor: Executor,
+    func: Callable[..., R],
+    kwargs_list: Iterable[Mapping[str, Any]],
+    in_flight: int,
+) -> Iterator[TaskOutcome[R]]:
+    """Submit kwargs_list lazily, keeping at most in_flight tasks pending, and yield outcomes as they finish."""
+    inputs = enumerate(kwargs_list)
+    pending: dict[Future[R], int] = {}
+    try:
+        while True:
+            for index, kwargs in islice(inputs, in_flight - len(pending)):
+                pending[executor.submit(func, **kwargs)] = index
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield _outcome(pending.pop(future), future)
+    finally:
+        for future in pending:
+            future.cancel()
 
 
 def _parallelize_base[R](
@@ -37,29 +112,172 @@ def _parallelize_base[R](
     max_workers: int | None,
     progress_tracker: int | None,
     mode: modes,
+    task_timeout: float | None = None,
+    timeout: float | None = None,
+    progress: ProgressCallback | None = None,
 ) -> ExecutorResults:
-    total_work = len(kwargs_list)
+    executor = executor_type(max_workers=max_workers)
+    try:
+        return _run_on_executor(executor, func, kwargs_list, progress_tracker, mode, task_timeout, timeout, progress)
+    finally:
+        # tasks abandoned by early_error or a timeout are not waited for
+        executor.shutdown(wait=False, cancel_futures=True)
 
-    with executor_type(max_workers=max_workers) as executor:
-        futures = [executor.submit(func, **kwarg) for kwarg in kwargs_list]
 
-    results = []
-    exceptions = []
-    for index, future in enumerate(futures, 1):
-        if exception := future.exception():
-            logger.error(f"{future} raised {exception.__class__.__name__}")
-            exceptions.append(exception)
-            if mode == "early_error":
-                executor.shutdown(wait=False)
-                raise exception
-            continue
+def _run_on_executor[R](  # noqa: C901, PLR0912
+    executor: Executor,
+    func: Callable[..., R],
+    kwargs_list: Sequence[Mapping[str, Any]],
+    progress_tracker: int | None,
+    mode: modes,
+    task_timeout: float | None = None,
+    timeout: float | None = None,
+    progress: ProgressCallback | None = None,
+    chunk_sizes: Sequence[int] | None = None,
+) -> ExecutorResults:
+    """Submit every task and handle them in completion order.
+
+    early_error cancels the queued tasks as soon as one fails. A task still running after
+    task_timeout seconds, or any task unfinished once timeout seconds have passed, is given
+    up on and reported as a TimeoutError. Running tasks cannot be interrupted, so a thread or
+    process may keep working on an abandoned task in the background. Process pools mark a
+    task as running once it is queued for a worker, so its clock may start a little early.
+
+    With a progress callback each task is timed inside its worker and ProgressMetrics reports
+    the run's throughput, latency and utilization as tasks finish.
+
+    chunk_sizes marks the tasks as _run_chunk calls and gives the number of calls in each, so
+    progress_tracker and the progress callback count calls rather than chunks.
+    """
+    total_work = len(kwargs_list) if chunk_sizes is None else sum(chunk_sizes)
+    finished_calls = 0
+    metrics = None
+    if progress is None:
+        futures = {executor.submit(func, **kwarg): index for index, kwarg in enumerate(kwargs_list)}
+    else:
+        workers = executor._max_workers  # noqa: SLF001 both pool types keep their resolved size here
+        metrics = ProgressMetrics(progress, total=total_work, workers=workers)
+        futures = {executor.submit(_timed_call, func, kwarg): index for index, kwarg in enumerate(kwargs_list)}
+    deadline = None if timeout is None else time.monotonic() + timeout
+    started: dict[Future[R], float] = {}
+    outcomes: dict[int, TaskOutcome[R]] = {}
+    timed_out: list[int] = []
+
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=_next_wait(deadline, task_timeout),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                outcome, seconds = _unwrap(_outcome(futures[future], future), timed=metrics is not None)
+                outcomes[outcome.index] = outcome
+                calls, failed = _count_calls(outcome, chunk_sizes)
+                if metrics is not None:
+                    metrics.task_finished(seconds, failed=failed, pending=len(pending), calls=calls)
+                if outcome.exception is not None:
+                    logger.error(f"Task {outcome.index} raised {outcome.exception.__class__.__name__}")
+                    if mode == "early_error":
+                        raise outcome.exception
+
+                finished_calls += calls
+                if (
+                    progress_tracker
+                    and finished_calls // progress_tracker > (finished_calls - calls) // progress_tracker
+                ):
+                    logger.info(f"Progress: {finished_calls}/{total_work}")
+
+            for future, outcome in _expire(pending, futures, started, deadline, timeout, task_timeout):
+                pending.discard(future)
+                future.cancel()
+                outcomes[outcome.index] = outcome
+                timed_out.append(outcome.index)
+                logger.error(f"Task {outcome.index} timed out: {outcome.exception}")
+                if metrics is not None:
+                    calls, _ = _count_calls(outcome, chunk_sizes)
+                    metrics.task_finished(None, failed=calls, pending=len(pending), calls=calls)
+                if mode == "early_error":
+                    raise outcome.exception
+    finally:
+        for future in pending:
+            future.cancel()
+        if metrics is not None:
+            metrics.finish(len(pending))
+
+    ordered = [outcomes[index] for index in sorted(outcomes)]
+    return ExecutorResults(
+        [outcome.result for outcome in ordered if outcome.exception is None],
+        [outcome.exception for outcome in ordered if outcome.exception is not None],
+        sorted(timed_out),
+    )
 
-        results.append(future.result())
 
-        if progress_tracker and index % progress_tracker == 0:
-            logger.info(f"Progress: {index}/{total_work}")
+def _count_calls(outcome: TaskOutcome[Any], chunk_sizes: Sequence[int] | None) -> tuple[int, int]:
+    """Return how many calls a finished task ran and how many of them failed."""
+    if chunk_sizes is None:
+        return 1, int(outcome.exception is not None)
+    calls = chunk_sizes[outcome.index]
+    if outcome.exception is not None:
+        return calls, calls
+    return calls, sum(exception is not None for _, exception in outcome.result)
 
-    return ExecutorResults(results, exceptions)
+
+def _timed_call[R](func: Callable[..., R], kwargs: Mapping[str, Any]) -> tuple[R, float]:
+    """Run func inside a worker and return its result with how many seconds it took."""
+    started = time.perf_counter()
+    result = func(**kwargs)
+    return result, time.perf_counter() - started
+
+
+def _unwrap[R](outcome: TaskOutcome[Any], *, timed: bool) -> tuple[TaskOutcome[R], float | None]:
+    """Split the run time off the result of a _timed_call task."""
+    if not timed or outcome.exception is not None:
+        return outcome, None
+    result, seconds = outcome.result
+    return TaskOutcome(outcome.index, result=result), seconds
+
+
+def _expire[R](
+    pending: set[Future[R]],
+    futures: Mapping[Future[R], int],
+    started: dict[Future[R], float],
+    deadline: float | None,
+    timeout: float | None,
+    task_timeout: float | None,
+) -> list[tuple[Future[R], TaskOutcome[R]]]:
+    """Find the pending tasks that hit a timeout, in input order, each with a TimeoutError outcome.
+
+    started records when each pending task was first seen running.
+    """
+    now = time.monotonic()
+    if deadline is not None and now >= deadline:
+        expired = list(pending)
+        reason = f"did not finish within the {timeout}s timeout"
+    elif task_timeout is not None:
+        expired = []
+        for future in pending:
+            if future.running() and now - started.setdefault(future, now) >= task_timeout:
+                expired.append(future)
+        reason = f"ran longer than the {task_timeout}s task timeout"
+    else:
+        return []
+
+    return [
+        (future, TaskOutcome(futures[future], exception=TimeoutError(f"Task {futures[future]} {reason}")))
+        for future in sorted(expired, key=futures.__getitem__)
+    ]
+
+
+def _next_wait(deadline: float | None, task_timeout: float | None) -> float | None:
+    """How long to wait for a task to finish before checking the timeouts again."""
+    waits = []
+    if deadline is not None:
+        waits.append(max(deadline - time.monotonic(), 0))
+    if task_timeout is not None:
+        waits.append(min(task_timeout, TIMEOUT_POLL_SECONDS))
+    return min(waits, default=None)
 
 
 def parallelize_thread[R](
@@ -68,6 +286,9 @@ def parallelize_thread[R](
     max_workers: int | None = None,
     progress_tracker: int | None = None,
     mode: modes = "normal",
+    task_timeout: float | None = None,
+    timeout: float | None = None,
+    progress: ProgressCallback | None = None,
 ) -> ExecutorResults:
     """Generic function to run a function with multiple arguments in threads.
 
@@ -76,7 +297,11 @@ def parallelize_thread[R](
         kwargs_list (Sequence[Mapping[str, Any]]): List of dictionaries with the arguments for the function.
         max_workers (int, optional): Number of workers to use. Defaults to 8.
         progress_tracker (int, optional): Number of tasks to complete before logging progress.
-        mode (modes, optional): Mode to use. Defaults to "normal".
+        mode (modes, optional): Mode to use. "early_error" raises the first exception as soon as it happens
+            and cancels the tasks that have not started. Defaults to "normal".
+        task_timeout (float, optional): Seconds a task may run before it is reported as timed out.
+        timeout (float, optional): Seconds until every unfinished task is reported as timed out.
+        progress (ProgressCallback, optional): Receives live ProgressSnapshots, e.g. a LogReporter.
 
     Returns:
         tuple[list[R], list[Exception]]: List with the results and a list with the exceptions.
@@ -88,15 +313,29 @@ def parallelize_thread[R](
         max_workers=max_workers,
         progress_tracker=progress_tracker,
         mode=mode,
+        task_timeout=task_timeout,
+        timeout=timeout,
+        progress=progress,
     )
 
 
+def _check_max_workers(max_workers: int | None) -> None:
+    """Refuse more worker processes than CPUs, which can make the system unresponsive."""
+    if max_workers and max_workers > cpu_count():
+        error = f"max_workers must be less than or equal to {cpu_count()}"
+        raise RuntimeError(error)
+
+
 def parallelize_process[R](
     func: Callable[..., R],
     kwargs_list: Sequence[Mapping[str, Any]],
     max_workers: int | None = None,
     progress_tracker: int | None = None,
     mode: modes = "normal",
+    chunksize: int | None = 1,
+    task_timeout: float | None = None,
+    timeout: float | None = None,
+    progress: ProgressCallback | None = None,
 ) -> ExecutorResults:
     """Generic function to run a function with multiple arguments in process.
 
@@ -106,13 +345,17 @@ def parallelize_process[R](
         max_workers (int, optional): Number of workers to use. Defaults to 4.
         progress_tracker (int, optional): Number of tasks to complete before logging progress.
         mode (modes, optional): Mode to use. Defaults to "normal".
+        chunksize (int, optional): Calls sent to a worker per task. Batching amortizes pickling and IPC
+            for cheap functions; None picks a size from the input length. Defaults to 1.
+        task_timeout (float, optional): Seconds a task may run before it is reported as timed out. Only
+            allowed with a chunksize of 1.
+        timeout (float, optional): Seconds until every unfinished task is reported as timed out.
+        progress (ProgressCallback, optional): Receives live ProgressSnapshots, e.g. a LogReporter.
 
     Returns:
         tuple[list[R], list[Exception]]: List with the results and a list with the exceptions.
     """
-    if max_workers and max_workers > cpu_count():
-        error = f"max_workers must be less than or equal to {cpu_count()}"
-        raise RuntimeError(error)
+    _check_max_workers(max_workers)
 
     return process_executor_unchecked(
         func=func,
@@ -120,6 +363,10 @@ def parallelize_process[R](
         max_workers=max_workers,
         progress_tracker=progress_tracker,
         mode=mode,
+        chunksize=chunksize,
+        task_timeout=task_timeout,
+        timeout=timeout,
+        progress=progress,
     )
 
 
@@ -129,6 +376,10 @@ def process_executor_unchecked[R](
     max_workers: int | None,
     progress_tracker: int | None,
     mode: modes = "normal",
+    chunksize: int | None = 1,
+    task_timeout: float | None = None,
+    timeout: float | None = None,
+    progress: ProgressCallback | None = None,
 ) -> ExecutorResults:
     """Generic function to run a function with multiple arguments in parallel.
 
@@ -141,15 +392,502 @@ def process_executor_unchecked[R](
         max_workers (int, optional): Number of workers to use. Defaults to 8.
         progress_tracker (int, optional): Number of tasks to complete before logging progress.
         mode (modes, optional): Mode to use. Defaults to "normal".
+        chunksize (int, optional): Calls sent to a worker per task; None picks a size. Defaults to 1.
+        task_timeout (float, optional): Seconds a task may run before it is reported as timed out. Only
+            allowed with a chunksize of 1.
+        timeout (float, optional): Seconds until every unfinished task is reported as timed out.
+        progress (ProgressCallback, optional): Receives live ProgressSnapshots, e.g. a LogReporter.
 
     Returns:
         tuple[list[R], list[Exception]]: List with the results and a list with the exceptions.
     """
-    return _parallelize_base(
-        executor_type=ProcessPoolExecutor,
-        func=func,
-        kwargs_list=kwargs_list,
-        max_workers=max_workers,
-        progress_tracker=progress_tracker,
-        mode=mode,
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        return _run_chunked(
+            executor, func, kwargs_list, max_workers, progress_tracker, mode, chunksize, task_timeout, timeout, progress
+        )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_chunked[R](  # noqa: PLR0913, PLR0917
+    executor: Executor,
+    func: Callable[..., R],
+    kwargs_list: Sequence[Mapping[str, Any]],
+    max_workers: int | None,
+    progress_tracker: int | None,
+    mode: modes,
+    chunksize: int | None,
+    task_timeout: float | None = None,
+    timeout: float | None = None,
+    progress: ProgressCallback | None = None,
+) -> ExecutorResults:
+    if task_timeout is not None and chunksize != 1:
+        error = "task_timeout limits single calls and cannot be combined with chunksize other than 1"
+        raise ValueError(error)
+    if chunksize is None:
+        chunksize = auto_chunksize(len(kwargs_list), max_workers or cpu_count())
+    if chunksize == 1:
+        return _run_on_executor(executor, func, kwargs_list, progress_tracker, mode, task_timeout, timeout, progress)
+
+    starts = range(0, len(kwargs_list), chunksize)
+    chunks = _run_on_executor(
+        executor,
+        _run_chunk,
+        [
+            {
+                "func": func,
+                "kwargs_chunk": kwargs_list[start : start + chunksize],
+                "stop_on_error": mode == "early_error",
+            }
+            for start in starts
+        ],
+        progress_tracker,
+        mode,
+        timeout=timeout,
+        progress=progress,
+        chunk_sizes=[min(chunksize, len(kwargs_list) - start) for start in starts],
+    )
+    results = []
+    exceptions = list(chunks.exceptions)
+    for chunk in chunks.results:
+        for result, exception in chunk:
+            if exception is None:
+                results.append(result)
+                continue
+            exceptions.append(exception)
+            if mode == "early_error":
+                raise exception
+    timed_out = [
+        index
+        for chunk_index in chunks.timed_out
+        for index in range(chunk_index * chunksize, min((chunk_index + 1) * chunksize, len(kwargs_list)))
+    ]
+    return ExecutorResults(results, exceptions, timed_out)
+
+
+def auto_chunksize(total_work: int, max_workers: int) -> int:
+    """Pick a chunksize that gives each worker about CHUNKS_PER_WORKER chunks."""
+    return max(1, -(-total_work // (max_workers * CHUNKS_PER_WORKER)))
+
+
+def _run_chunk[R](
+    func: Callable[..., R],
+    kwargs_chunk: Sequence[Mapping[str, Any]],
+    *,
+    stop_on_error: bool = False,
+) -> list[tuple[R | None, BaseException | None]]:
+    """Run func over a chunk of kwargs inside one worker, catching each call's exception separately.
+
+    With stop_on_error the first exception fails the whole chunk instead, so early_error can
+    cancel the remaining chunks straight away.
+    """
+    outcomes: list[tuple[R | None, BaseException | None]] = []
+    for kwargs in kwargs_chunk:
+        try:
+            outcomes.append((func(**kwargs), None))
+        except Exception as error:
+            if stop_on_error:
+                raise
+            outcomes.append((None, error))
+    return outcomes
+
+
+_worker_state: Any = None
+
+
+def worker_state() -> Any:  # noqa: ANN401
+    """Return what the WorkerPool initializer returned in this worker process, or None outside a pool."""
+    return _worker_state
+
+
+def _initialize_worker(initializer: Callable[..., Any], initargs: tuple[Any, ...]) -> None:
+    global _worker_state  # noqa: PLW0603 one value per worker process
+    _worker_state = initializer(*initargs)
+
+
+class WorkerPool:
+    """A process pool that is reused across map calls, with a per-worker initializer.
+
+    Starting processes and setting up their resources (a database connection, a loaded model)
+    happens once per worker instead of once per call or task. The initializer's return value
+    is kept in the worker and tasks reach it through worker_state().
+
+    Args:
+        max_workers (int, optional): Number of workers to use. Defaults to the number of CPUs.
+        initializer (Callable[..., Any], optional): Runs once in each worker process when it starts.
+        initargs (tuple[Any, ...], optional): Arguments for the initializer.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        initializer: Callable[..., Any] | None = None,
+        initargs: tuple[Any, ...] = (),
+    ) -> None:
+        """Start the pool; worker processes are spawned as tasks arrive."""
+        _check_max_workers(max_workers)
+
+        self.max_workers = max_workers or cpu_count()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=None if initializer is None else _initialize_worker,
+            initargs=(initializer, initargs),
+        )
+
+    def __enter__(self) -> Self:
+        """Use the pool as a context manager that shuts it down on exit."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Shut the pool down, waiting for running tasks."""
+        self.close()
+
+    def map[R](
+        self,
+        func: Callable[..., R],
+        kwargs_list: Sequence[Mapping[str, Any]],
+        progress_tracker: int | None = None,
+        mode: modes = "normal",
+        chunksize: int | None = 1,
+        task_timeout: float | None = None,
+        timeout: float | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> ExecutorResults:
+        """Run a function over kwargs_list on the pool's workers, like parallelize_process.
+
+        A worker busy with a timed out task stays busy until the task finishes.
+
+        Args:
+            func (Callable[..., R]): Function to run in the workers.
+            kwargs_list (Sequence[Mapping[str, Any]]): List of dictionaries with the arguments for the function.
+            progress_tracker (int, optional): Number of tasks to complete before logging progress.
+            mode (modes, optional): Mode to use. Defaults to "normal".
+            chunksize (int, optional): Calls sent to a worker per task; None picks a size. Defaults to 1.
+            task_timeout (float, optional): Seconds a task may run before it is reported as timed out. Only
+                allowed with a chunksize of 1.
+            timeout (float, optional): Seconds until every unfinished task is reported as timed out.
+            progress (ProgressCallback, optional): Receives live ProgressSnapshots, e.g. a LogReporter.
+
+        Returns:
+            ExecutorResults: The results and exceptions, in the order of kwargs_list.
+        """
+        return _run_chunked(
+            self._executor,
+            func,
+            kwargs_list,
+            self.max_workers,
+            progress_tracker,
+            mode,
+            chunksize,
+            task_timeout,
+            timeout,
+            progress,
+        )
+
+    def imap[R](
+        self,
+        func: Callable[..., R],
+        kwargs_list: Iterable[Mapping[str, Any]],
+        in_flight_per_worker: int = IN_FLIGHT_PER_WORKER,
+    ) -> Iterator[TaskOutcome[R]]:
+        """Run a function over a lazily read kwargs_list, like iter_parallelize_process.
+
+        Returns:
+            Iterator[TaskOutcome[R]]: The result or exception of each call, in completion order.
+        """
+        return _iter_outcomes(self._executor, func, kwargs_list, self.max_workers * in_flight_per_worker)
+
+    def close(self, *, cancel_pending: bool = False) -> None:
+        """Shut the pool down, waiting for running tasks and optionally cancelling queued ones."""
+        self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+
+
+def iter_parallelize_thread[R](
+    func: Callable[..., R],
+    kwargs_list: Iterable[Mapping[str, Any]],
+    max_workers: int | None = None,
+    in_flight_per_worker: int = IN_FLIGHT_PER_WORKER,
+) -> Iterator[TaskOutcome[R]]:
+    """Run a function over kwargs_list in threads, yielding each outcome as soon as it finishes.
+
+    kwargs_list is read lazily and only max_workers * in_flight_per_worker tasks are pending at
+    once, so a generator of any length runs in constant memory. Closing the iterator early
+    cancels the tasks that have not started.
+
+    Args:
+        func (Callable[..., R]): Function to run in threads.
+        kwargs_list (Iterable[Mapping[str, Any]]): Arguments for each call; may be a generator.
+        max_workers (int, optional): Number of workers to use. Defaults to the executor's default.
+        in_flight_per_worker (int, optional): Tasks queued per worker before input is read further.
+
+    Returns:
+        Iterator[TaskOutcome[R]]: The result or exception of each call, in completion order.
+    """
+    return _iter_pool(ThreadPoolExecutor, func, kwargs_list, max_workers, in_flight_per_worker)
+
+
+def iter_parallelize_process[R](
+    func: Callable[..., R],
+    kwargs_list: Iterable[Mapping[str, Any]],
+    max_workers: int | None = None,
+    in_flight_per_worker: int = IN_FLIGHT_PER_WORKER,
+) -> Iterator[TaskOutcome[R]]:
+    """Run a function over kwargs_list in processes, yielding each outcome as soon as it finishes.
+
+    Like iter_parallelize_thread, with the same worker limit as parallelize_process.
+
+    Args:
+        func (Callable[..., R]): Function to run in processes.
+        kwargs_list (Iterable[Mapping[str, Any]]): Arguments for each call; may be a generator.
+        max_workers (int, optional): Number of workers to use. Defaults to the number of CPUs.
+        in_flight_per_worker (int, optional): Tasks queued per worker before input is read further.
+
+    Returns:
+        Iterator[TaskOutcome[R]]: The result or exception of each call, in completion order.
+    """
+    _check_max_workers(max_workers)
+
+    return _iter_pool(ProcessPoolExecutor, func, kwargs_list, max_workers, in_flight_per_worker)
+
+
+def _iter_pool[R](
+    executor_type: type[ThreadPoolExecutor | ProcessPoolExecutor],
+    func: Callable[..., R],
+    kwargs_list: Iterable[Mapping[str, Any]],
+    max_workers: int | None,
+    in_flight_per_worker: int,
+) -> Iterator[TaskOutcome[R]]:
+    with executor_type(max_workers=max_workers) as executor:
+        in_flight = (max_workers or cpu_count()) * in_flight_per_worker
+        yield from _iter_outcomes(executor, func, kwargs_list, in_flight)
+
+
+async def iter_parallelize_async[R](
+    func: Callable[..., Awaitable[R]],
+    kwargs_list: Iterable[Mapping[str, Any]],
+    max_concurrency: int = 16,
+) -> AsyncIterator[TaskOutcome[R]]:
+    """Run an async function over kwargs_list, yielding each outcome as soon as it finishes.
+
+    kwargs_list is read lazily and at most max_concurrency calls are awaited at once, so a
+    large input never turns into a large number of pending tasks. Closing the iterator early
+    cancels the calls still running.
+
+    Args:
+        func (Callable[..., Awaitable[R]]): Async function to run.
+        kwargs_list (Iterable[Mapping[str, Any]]): Arguments for each call.
+        max_concurrency (int, optional): Calls in flight at the same time. Defaults to 16.
+
+    Yields:
+        TaskOutcome[R]: The result or exception of each call, in completion order.
+    """
+    if max_concurrency < 1:
+        error = "max_concurrency must be at least 1"
+        raise ValueError(error)
+
+    inputs = enumerate(kwargs_list)
+    pending: dict[asyncio.Future[R], int] = {}
+    try:
+        while True:
+            for index, kwargs in islice(inputs, max_concurrency - len(pending)):
+                pending[asyncio.ensure_future(func(**kwargs))] = index
+            if not pending:
+                return
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield _outcome(pending.pop(task), task)
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def parallelize_async[R](
+    func: Callable[..., Awaitable[R]],
+    kwargs_list: Iterable[Mapping[str, Any]],
+    max_concurrency: int = 16,
+    progress_tracker: int | None = None,
+    mode: modes = "normal",
+) -> ExecutorResults:
+    """Generic function to run an async function with multiple arguments concurrently.
+
+    Thousands of I/O bound calls share one event loop instead of needing a thread each.
+
+    Args:
+        func (Callable[..., Awaitable[R]]): Async function to run.
+        kwargs_list (Iterable[Mapping[str, Any]]): List of dictionaries with the arguments for the function.
+        max_concurrency (int, optional): Calls in flight at the same time. Defaults to 16.
+        progress_tracker (int, optional): Number of tasks to complete before logging progress.
+        mode (modes, optional): Mode to use. "early_error" cancels the remaining calls and raises the first
+            exception. Defaults to "normal".
+
+    Returns:
+        ExecutorResults: The results and exceptions, in the order of kwargs_list.
+    """
+    outcomes: list[TaskOutcome[R]] = []
+    async with aclosing(iter_parallelize_async(func, kwargs_list, max_concurrency)) as stream:
+        async for outcome in stream:
+            outcomes.append(outcome)
+            if outcome.exception is not None:
+                logger.error(f"Task {outcome.index} raised {outcome.exception.__class__.__name__}")
+                if mode == "early_error":
+                    raise outcome.exception
+
+            if progress_tracker and len(outcomes) % progress_tracker == 0:
+                logger.info(f"Progress: {len(outcomes)} tasks done")
+
+    outcomes.sort(key=lambda outcome: outcome.index)
+    return ExecutorResults(
+        [outcome.result for outcome in outcomes if outcome.exception is None],
+        [outcome.exception for outcome in outcomes if outcome.exception is not None],
+    )
+
+
+class AdaptiveConcurrency:
+    """Hill-climbing controller for the number of tasks run at once.
+
+    Each throughput sample is compared with the previous one: a clear gain keeps moving the
+    level in the same direction, a clear loss reverses it, and anything in between holds the
+    level. If the median task latency rises ADAPTIVE_LATENCY_FACTOR times above the first
+    sample's, the server behind the tasks is taken to be overloaded and the level shrinks.
+
+    Args:
+        min_workers (int): Lowest level.
+        max_workers (int): Highest level.
+        initial (int, optional): Starting level. Defaults to min_workers.
+    """
+
+    def __init__(self, min_workers: int, max_workers: int, initial: int | None = None) -> None:
+        """Start at the initial level, probing upwards."""
+        if not 1 <= min_workers <= max_workers:
+            error = f"need 1 <= min_workers <= max_workers, got {min_workers} and {max_workers}"
+            raise ValueError(error)
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.level = min(max(initial or min_workers, min_workers), max_workers)
+        self.direction = 1
+        self.history: list[tuple[int, float, float]] = []
+        self._baseline_latency: float | None = None
+        self._previous_throughput: float | None = None
+
+    def update(self, throughput: float, latency: float) -> int:
+        """Record a sample taken at the current level and return the next level.
+
+        Args:
+            throughput (float): Tasks finished per second during the sample.
+            latency (float): Median task run time during the sample, in seconds.
+        """
+        self.history.append((self.level, throughput, latency))
+        if self._baseline_latency is None:
+            self._baseline_latency = latency
+        previous = self._previous_throughput
+        self._previous_throughput = throughput
+
+        if latency > self._baseline_latency * ADAPTIVE_LATENCY_FACTOR:
+            self.direction = -1
+        elif previous is None or throughput > previous * (1 + ADAPTIVE_TOLERANCE):
+            pass
+        elif throughput < previous * (1 - ADAPTIVE_TOLERANCE):
+            self.direction = -self.direction
+        else:
+            return self.level
+
+        self.level = min(max(self.level + self.direction, self.min_workers), self.max_workers)
+        return self.level
+
+
+def _iter_adaptive[R](
+    executor: Executor,
+    func: Callable[..., R],
+    kwargs_list: Iterable[Mapping[str, Any]],
+    controller: AdaptiveConcurrency,
+) -> Iterator[TaskOutcome[R]]:
+    """Like _iter_outcomes, with controller.level tasks in flight, sampled every ADAPTIVE_SAMPLE_SECONDS."""
+    inputs = enumerate(kwargs_list)
+    pending: dict[Future[tuple[R, float]], int] = {}
+    sample_started = time.monotonic()
+    sample_done = 0
+    sample_latencies: list[float] = []
+    try:
+        while True:
+            for index, kwargs in islice(inputs, max(controller.level - len(pending), 0)):
+                pending[executor.submit(_timed_call, func, kwargs)] = index
+            if not pending:
+                return
+
+            done, _ = wait(pending, timeout=ADAPTIVE_SAMPLE_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                outcome, seconds = _unwrap(_outcome(pending.pop(future), future), timed=True)
+                sample_done += 1
+                if seconds is not None:
+                    sample_latencies.append(seconds)
+                yield outcome
+
+            elapsed = time.monotonic() - sample_started
+            if elapsed >= ADAPTIVE_SAMPLE_SECONDS and sample_latencies:
+                level = controller.level
+                controller.update(sample_done / elapsed, statistics.median(sample_latencies))
+                if controller.level != level:
+                    logger.info(f"Adaptive concurrency: {level} -> {controller.level} workers")
+                sample_started = time.monotonic()
+                sample_done = 0
+                sample_latencies = []
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def parallelize_process_adaptive[R](
+    func: Callable[..., R],
+    kwargs_list: Iterable[Mapping[str, Any]],
+    min_workers: int = 1,
+    max_workers: int | None = None,
+    progress_tracker: int | None = None,
+    mode: modes = "normal",
+) -> ExecutorResults:
+    """Run a function with multiple arguments in processes, adapting the worker count to throughput.
+
+    For partly I/O bound work (e.g. COPY into a busy Postgres) the best concurrency depends on
+    the load elsewhere, so the number of tasks in flight is tuned between min_workers and
+    max_workers by AdaptiveConcurrency while the run progresses. max_workers may exceed the
+    CPU count, since waiting workers do not use a CPU.
+
+    Args:
+        func (Callable[..., R]): Function to run in processes.
+        kwargs_list (Iterable[Mapping[str, Any]]): Arguments for each call; may be a generator.
+        min_workers (int, optional): Fewest tasks in flight. Defaults to 1.
+        max_workers (int, optional): Most tasks in flight. Defaults to twice the number of CPUs.
+        progress_tracker (int, optional): Number of tasks to complete before logging progress.
+        mode (modes, optional): Mode to use. Defaults to "normal".
+
+    Returns:
+        ExecutorResults: The results and exceptions in input order, and the concurrency settled on.
+    """
+    controller = AdaptiveConcurrency(min_workers, max_workers or 2 * cpu_count())
+    outcomes: list[TaskOutcome[R]] = []
+    executor = ProcessPoolExecutor(max_workers=controller.max_workers)
+    try:
+        for outcome in _iter_adaptive(executor, func, kwargs_list, controller):
+            outcomes.append(outcome)
+            if outcome.exception is not None:
+                logger.error(f"Task {outcome.index} raised {outcome.exception.__class__.__name__}")
+                if mode == "early_error":
+                    raise outcome.exception
+
+            if progress_tracker and len(outcomes) % progress_tracker == 0:
+                logger.info(f"Progress: {len(outcomes)} tasks done, {controller.level} workers")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(
+        f"Adaptive concurrency settled at {controller.level} workers "
+        f"(bounds {controller.min_workers}-{controller.max_workers}, {len(controller.history)} samples)"
+    )
+    outcomes.sort(key=lambda outcome: outcome.index)
+    return ExecutorResults(
+        [outcome.result for outcome in outcomes if outcome.exception is None],
+        [outcome.exception for outcome in outcomes if outcome.exception is not None],
+        concurrency=controller.level,
     )
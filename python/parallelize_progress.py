@@ -0,0 +1,225 @@
+"""Live progress metrics for the parallelize helpers.
+
+ProgressMetrics turns task completions into ProgressSnapshots (throughput, tasks in flight,
+recent p50/p95 latency and worker utilization) and hands them to a progress callback at
+most once per PROGRESS_INTERVAL_SECONDS, plus once when the run ends. LogReporter and
+PrometheusTextfileExporter are ready-made callbacks.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+# Latencies kept for the percentiles, so they describe recent tasks rather than the whole run.
+LATENCY_WINDOW = 1000
+
+
+@dataclass(frozen=True)
+class ProgressSnapshot:
+    """Progress of a parallel run at one point in time.
+
+    Latencies are the run times of the most recent successful tasks, in seconds.
+    Utilization is the share of worker time spent running those tasks.
+    """
+
+    total: int
+    completed: int
+    failed: int
+    in_flight: int
+    workers: int
+    elapsed: float
+    p50_latency: float | None
+    p95_latency: float | None
+    busy_seconds: float
+    final: bool = False
+
+    @property
+    def rate(self) -> float:
+        """Tasks finished per second, failures included."""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Worker time spent running tasks, from 0 to 1."""
+        capacity = self.workers * self.elapsed
+        return min(self.busy_seconds / capacity, 1.0) if capacity else 0.0
+
+
+type ProgressCallback = Callable[[ProgressSnapshot], None]
+
+
+class ProgressMetrics:
+    """Accumulates task completions and reports snapshots to a progress callback.
+
+    Args:
+        callback (ProgressCallback): Receives the snapshots.
+        total (int): Tasks in the run.
+        workers (int): Workers running them, used for the in-flight count and utilization.
+        interval (float, optional): Minimum seconds between two snapshots before the final one.
+    """
+
+    def __init__(
+        self,
+        callback: ProgressCallback,
+        total: int,
+        workers: int,
+        interval: float = PROGRESS_INTERVAL_SECONDS,
+    ) -> None:
+        """Start the clock."""
+        self.callback = callback
+        self.total = total
+        self.workers = workers
+        self.interval = interval
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._started = time.monotonic()
+        self._last_report = self._started
+
+    def task_finished(self, seconds: float | None, *, failed: int, pending: int, calls: int = 1) -> None:
+        """Record a finished task and report if the interval has passed.
+
+        Args:
+            seconds (float, optional): How long the task ran, if known.
+            failed (int): How many of its calls raised or timed out; a bool counts as 0 or 1.
+            pending (int): Tasks submitted but not finished yet.
+            calls (int, optional): Calls the task ran, more than one for a chunk. Its run time is
+                split evenly between them for the latencies.
+        """
+        self.completed += calls
+        self.failed += failed
+        if seconds is not None:
+            self.busy_seconds += seconds
+            self._latencies.extend([seconds / calls] * calls)
+
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.callback(self.snapshot(pending))
+
+    def finish(self, pending: int = 0) -> None:
+        """Report the final snapshot."""
+        self.callback(self.snapshot(pending, final=True))
+
+    def snapshot(self, pending: int, *, final: bool = False) -> ProgressSnapshot:
+        """Build a snapshot; at most one pending task per worker is running."""
+        latencies = sorted(self._latencies)
+        return ProgressSnapshot(
+            total=self.total,
+            completed=self.completed,
+            failed=self.failed,
+            in_flight=min(pending, self.workers),
+            workers=self.workers,
+            elapsed=time.monotonic() - self._started,
+            p50_latency=percentile(latencies, 0.5),
+            p95_latency=percentile(latencies, 0.95),
+            busy_seconds=self.busy_seconds,
+            final=final,
+        )
+
+
+def percentile(ordered: list[float], fraction: float) -> float | None:
+    """Nearest-rank percentile of an ascending list, or None when it is empty."""
+    if not ordered:
+        return None
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def _seconds(value: float | None) -> str:
+    return "n/a" if value is None else f"{value:.3f}s"
+
+
+class LogReporter:
+    """Progress callback that logs a snapshot every `every` seconds and at the end.
+
+    Args:
+        name (str, optional): Label for the run in the log lines.
+        every (float, optional): Minimum seconds between two log lines.
+    """
+
+    def __init__(self, name: str = "parallelize", every: float = 10.0) -> None:
+        """Initialize the reporter."""
+        self.name = name
+        self.every = every
+        self._last: float | None = None
+
+    def __call__(self, snapshot: ProgressSnapshot) -> None:
+        """Log the snapshot unless the previous line is too recent."""
+        if not snapshot.final and self._last is not None and snapshot.elapsed - self._last < self.every:
+            return
+        self._last = snapshot.elapsed
+        logger.info(
+            "%s progress: %d/%d done (%d failed), %.1f tasks/s, %d in flight, p50=%s p95=%s, utilization=%.0f%%",
+            self.name,
+            snapshot.completed,
+            snapshot.total,
+            snapshot.failed,
+            snapshot.rate,
+            snapshot.in_flight,
+            _seconds(snapshot.p50_latency),
+            _seconds(snapshot.p95_latency),
+            snapshot.utilization * 100,
+        )
+
+
+class PrometheusTextfileExporter:
+    """Progress callback that writes the snapshot for node_exporter's textfile collector.
+
+    The file is replaced atomically, so the collector never reads a half-written file.
+
+    Args:
+        path (Path | str): Output file; must end in .prom and sit in the collector's directory.
+        job (str): Value of the job label on every metric.
+    """
+
+    def __init__(self, path: Path | str, job: str) -> None:
+        """Initialize the exporter."""
+        self.path = Path(path)
+        self.job = job
+
+    def __call__(self, snapshot: ProgressSnapshot) -> None:
+        """Write the snapshot."""
+        temporary = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        temporary.write_text(self.render(snapshot))
+        temporary.replace(self.path)
+
+    def render(self, snapshot: ProgressSnapshot) -> str:
+        """Render the snapshot in the Prometheus text exposition format."""
+        label = f'job="{self.job}"'
+        metrics: list[tuple[str, str, list[tuple[str, float]]]] = [
+            ("parallelize_tasks_total", "Tasks in the run.", [(label, snapshot.total)]),
+            ("parallelize_tasks_completed", "Tasks finished, failures included.", [(label, snapshot.completed)]),
+            ("parallelize_tasks_failed", "Tasks that raised or timed out.", [(label, snapshot.failed)]),
+            ("parallelize_tasks_in_flight", "Tasks running right now.", [(label, snapshot.in_flight)]),
+            ("parallelize_task_rate", "Tasks finished per second.", [(label, snapshot.rate)]),
+            ("parallelize_worker_utilization", "Share of worker time spent busy.", [(label, snapshot.utilization)]),
+            ("parallelize_elapsed_seconds", "Seconds since the run started.", [(label, snapshot.elapsed)]),
+        ]
+        latencies = [
+            (f'{label},quantile="{quantile}"', value)
+            for quantile, value in (("0.5", snapshot.p50_latency), ("0.95", snapshot.p95_latency))
+            if value is not None
+        ]
+        if latencies:
+            metrics.append(("parallelize_task_latency_seconds", "Run time of recent tasks.", latencies))
+
+        lines: list[str] = []
+        for name, description, samples in metrics:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{{{labels}}} {value:g}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,217 @@
+"""Measure the peak memory of the lookup maps ingest-congress builds before each step.
+
+The legislator and bill maps and the set of stored bill text versions used to be built
+from full ORM entities, which for bill texts meant loading every document. This
+benchmark builds each lookup both that way and with the column-only streaming queries
+ingest_congress uses now, each in a fresh process, and reports that process's peak RSS.
+The documents now live in bill_text_content, so "content ids" is the lookup whose
+entities carry them.
+
+By default it fills a synthetic SQLite database shaped like data_science_dev; pass
+--dev-database to measure the real one from the DATA_SCIENCE_DEV_* environment variables.
+
+Usage:
+    python -m python.tools.congress_lookup_memory_benchmark
+    python -m python.tools.congress_lookup_memory_benchmark --bills 400000 --bill-texts 100000 --text-kib 32
+    python -m python.tools.congress_lookup_memory_benchmark --dev-database
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import multiprocessing
+import resource
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
+
+import typer
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from python.common import configure_logger
+from python.data_science.ingest_congress import (
+    _build_bill_map,
+    _build_legislator_map,
+    _load_bill_text_keys,
+    _load_content_ids,
+)
+from python.orm.common import get_postgres_engine
+from python.orm.data_science_dev.base import DataScienceDevBase
+from python.orm.data_science_dev.congress import Bill, BillText, BillTextContent, Legislator
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sized
+
+    from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer(help="Benchmark peak memory of the ingest-congress lookup maps.")
+
+BILL_TYPES = ("hr", "s", "hres", "sres", "hjres", "sjres", "hconres", "sconres")
+VERSION_CODES = ("ih", "rh", "eh", "rs", "es", "enr")
+INSERT_BATCH_SIZE = 10_000
+
+
+def _entity_legislator_map(session: Session) -> dict[str, int]:
+    return {legislator.bioguide_id: legislator.id for legislator in session.scalars(select(Legislator)).all()}
+
+
+def _entity_bill_map(session: Session) -> dict[tuple[int, str, int], int]:
+    return {(bill.congress, bill.bill_type, bill.number): bill.id for bill in session.scalars(select(Bill)).all()}
+
+
+def _entity_bill_text_keys(session: Session) -> set[tuple[int, str]]:
+    return {(bill_text.bill_id, bill_text.version_code) for bill_text in session.scalars(select(BillText)).all()}
+
+
+def _entity_content_ids(session: Session) -> dict[bytes, int]:
+    return {content.content_hash: content.id for content in session.scalars(select(BillTextContent)).all()}
+
+
+# name -> (full entities, column-only)
+LOOKUPS: dict[str, tuple[Callable[[Session], Sized], Callable[[Session], Sized]]] = {
+    "legislator map": (_entity_legislator_map, _build_legislator_map),
+    "bill map": (_entity_bill_map, _build_bill_map),
+    "bill text keys": (_entity_bill_text_keys, _load_bill_text_keys),
+    "content ids": (_entity_content_ids, _load_content_ids),
+}
+
+
+@dataclass(frozen=True)
+class LookupMemory:
+    """Entries in one lookup and the peak RSS of a process building it each way, in KiB.
+
+    baseline_kib is the peak RSS of that process before the lookup, once connected.
+    """
+
+    name: str
+    entries: int
+    baseline_kib: int
+    entities_kib: int
+    columns_kib: int
+
+    @property
+    def saved_kib(self) -> int:
+        """Peak RSS the column-only query saved."""
+        return self.entities_kib - self.columns_kib
+
+
+def write_synthetic_database(engine: Engine, legislators: int, bills: int, bill_texts: int, text_kib: int) -> None:
+    """Create the legislator, bill and bill text tables and fill them with synthetic rows, one document per text."""
+    tables = [Legislator.__table__, Bill.__table__, BillTextContent.__table__, BillText.__table__]
+    DataScienceDevBase.metadata.create_all(engine, tables=tables)
+    text = b"SEC. 1. SHORT TITLE. This Act may be cited as the Synthetic Act.\n" * (text_kib * 16)
+    with engine.begin() as connection:
+        rows = [
+            {"bioguide_id": f"S{index:06d}", "first_name": "First", "last_name": "Last"} for index in range(legislators)
+        ]
+        connection.execute(insert(Legislator), rows)
+        for start in range(0, bills, INSERT_BATCH_SIZE):
+            rows = [
+                {
+                    "congress": 93 + index % 26,
+                    "bill_type": BILL_TYPES[index % len(BILL_TYPES)],
+                    "number": index + 1,
+                    "title": f"Synthetic Act {index + 1}",
+                }
+                for index in range(start, min(start + INSERT_BATCH_SIZE, bills))
+            ]
+            connection.execute(insert(Bill), rows)
+        for start in range(0, bill_texts, INSERT_BATCH_SIZE):
+            indexes = range(start, min(start + INSERT_BATCH_SIZE, bill_texts))
+            documents = [b"%d\n" % index + text for index in indexes]
+            rows = [
+                {"content_hash": hashlib.sha256(document).digest(), "size": len(document), "content": document}
+                for document in documents
+            ]
+            connection.execute(insert(BillTextContent), rows)
+            rows = [
+                {
+                    "bill_id": index // len(VERSION_CODES) % bills + 1,
+                    "version_code": VERSION_CODES[index % len(VERSION_CODES)],
+                    "content_id": index + 1,
+                }
+                for index in indexes
+            ]
+            connection.execute(insert(BillText), rows)
+
+
+def measure(url: str, name: str, variant: int) -> tuple[int, int, int]:
+    """Build one lookup and return its entries and the peak RSS in KiB before and after. Runs in a fresh process."""
+    engine = create_engine(url)
+    with Session(engine) as session:
+        session.connection()
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        lookup = LOOKUPS[name][variant](session)
+        after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return len(lookup), before, after
+
+
+def in_fresh_process[T](func: Callable[..., T], *args: object) -> T:
+    """Call func in a new interpreter.
+
+    Linux carries a process's peak RSS over into its children, so everything measured or
+    memory hungry runs away from the main process to keep its peak low.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(func, *args).result()
+
+
+def _write_synthetic_url(url: str, legislators: int, bills: int, bill_texts: int, text_kib: int) -> None:
+    write_synthetic_database(create_engine(url), legislators, bills, bill_texts, text_kib)
+
+
+def run(engine: Engine) -> list[LookupMemory]:
+    """Measure every lookup both ways, each in its own process so peak RSS starts from scratch."""
+    url = engine.url.render_as_string(hide_password=False)
+    results: list[LookupMemory] = []
+    for name in LOOKUPS:
+        peaks: list[int] = []
+        entries = baseline = 0
+        for variant in (0, 1):
+            entries, baseline, peak = in_fresh_process(measure, url, name, variant)
+            peaks.append(peak)
+        results.append(LookupMemory(name, entries, baseline, *peaks))
+    return results
+
+
+@app.command()
+def main(
+    *,
+    dev_database: Annotated[
+        bool,
+        typer.Option(help="Measure the DATA_SCIENCE_DEV database instead of a synthetic one"),
+    ] = False,
+    legislators: Annotated[int, typer.Option(help="Synthetic legislators")] = 12_000,
+    bills: Annotated[int, typer.Option(help="Synthetic bills")] = 200_000,
+    bill_texts: Annotated[int, typer.Option(help="Synthetic bill text versions")] = 20_000,
+    text_kib: Annotated[int, typer.Option(help="Size of each synthetic bill text in KiB")] = 16,
+) -> None:
+    """Report the peak RSS of building each lookup from full entities and from selected columns."""
+    configure_logger(level="INFO")
+    with tempfile.TemporaryDirectory(prefix="congress-lookup-benchmark-") as temporary:
+        if dev_database:
+            engine = get_postgres_engine(name="DATA_SCIENCE_DEV")
+        else:
+            engine = create_engine(f"sqlite:///{Path(temporary) / 'data_science_dev.db'}")
+            typer.echo(
+                f"Writing {legislators} legislators, {bills} bills and {bill_texts} bill texts of {text_kib} KiB"
+            )
+            url = engine.url.render_as_string(hide_password=False)
+            in_fresh_process(_write_synthetic_url, url, legislators, bills, bill_texts, text_kib)
+
+        for result in run(engine):
+            typer.echo(
+                f"{result.name:<15} {result.entries:>8} entries  baseline={result.baseline_kib / 1024:>7.1f} MiB  "
+                f"entities={result.entities_kib / 1024:>7.1f} MiB  columns={result.columns_kib / 1024:>7.1f} MiB  "
+                f"saved={result.saved_kib / 1024:>7.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    app()
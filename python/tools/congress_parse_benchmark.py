@@ -0,0 +1,175 @@
+"""Measure how many bill and vote data.json files per second ingest-congress can parse.
+
+Builds a synthetic congress tree shaped like unitedstates/congress output (or reads a real
+one with --data-dir) and parses it once in the main process and once with the process
+pool used by ingest_bills and ingest_votes, reporting files/sec for each. A last pass
+hands the pool the manifest of the files just parsed, which is what a run without
+upstream changes does.
+
+Usage:
+    python -m python.tools.congress_parse_benchmark
+    python -m python.tools.congress_parse_benchmark --bills 50000 --votes 5000 --workers 8
+    python -m python.tools.congress_parse_benchmark --data-dir /path/to/congress-tracker/congress/data
+"""
+
+from __future__ import annotations
+
+import logging
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
+
+import orjson
+import typer
+
+from python.common import configure_logger
+from python.data_science.ingest_congress_files import (
+    ManifestEntry,
+    ShardScan,
+    iter_parsed,
+    scan_bills,
+    scan_votes,
+    shard_dirs,
+    shard_key,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer(help="Benchmark parsing of congress bill and vote files.")
+
+BILL_TYPES = ("hr", "s", "hres", "sres", "hjres", "sjres", "hconres", "sconres")
+POSITIONS = ("Yea", "Nay", "Not Voting", "Present")
+SYNTHETIC_CONGRESS = 118
+
+
+@dataclass(frozen=True)
+class ParseTiming:
+    """Files parsed and wall time of one pass over a tree."""
+
+    label: str
+    files: int
+    seconds: float
+
+    @property
+    def files_per_second(self) -> float:
+        """Parse throughput."""
+        return self.files / self.seconds if self.seconds else 0.0
+
+
+def write_synthetic_tree(data_dir: Path, bills: int, votes: int, voters: int) -> Path:
+    """Write one congress of bill and vote data.json files under data_dir and return its directory."""
+    congress_dir = data_dir / str(SYNTHETIC_CONGRESS)
+    for index in range(bills):
+        bill_type = BILL_TYPES[index % len(BILL_TYPES)]
+        number = index // len(BILL_TYPES) + 1
+        bill_dir = congress_dir / "bills" / bill_type / f"{bill_type}{number}"
+        bill_dir.mkdir(parents=True, exist_ok=True)
+        bill = {
+            "congress": str(SYNTHETIC_CONGRESS),
+            "bill_type": bill_type,
+            "number": str(number),
+            "official_title": f"To do synthetic thing number {number}. " * 4,
+            "short_title": f"Synthetic Act {number}",
+            "status": "REFERRED",
+            "status_at": "2023-01-09",
+            "sponsor": {"bioguide_id": f"S{index % 500:06d}"},
+            "subjects_top_term": "Government operations and politics",
+            "actions": [{"acted_at": "2023-01-09", "text": "Introduced in House", "type": "action"}] * 5,
+        }
+        (bill_dir / "data.json").write_bytes(orjson.dumps(bill))
+
+    for index in range(votes):
+        chamber = "hs"[index % 2]
+        vote_dir = congress_dir / "votes" / str(2023 + index % 2) / f"{chamber}{index + 1}"
+        vote_dir.mkdir(parents=True, exist_ok=True)
+        vote = {
+            "congress": SYNTHETIC_CONGRESS,
+            "chamber": chamber,
+            "session": str(2023 + index % 2),
+            "number": index + 1,
+            "date": "2023-03-01T12:00:00-05:00",
+            "type": "On Passage",
+            "question": f"On Passage: H R {index + 1}",
+            "result": "Passed",
+            "bill": {"congress": SYNTHETIC_CONGRESS, "type": "hr", "number": index + 1},
+            "votes": {
+                position: [
+                    {"id": f"S{voter:06d}", "display_name": "Member", "party": "D", "state": "CA"}
+                    for voter in range(offset, voters, len(POSITIONS))
+                ]
+                for offset, position in enumerate(POSITIONS)
+            },
+        }
+        (vote_dir / "data.json").write_bytes(orjson.dumps(vote))
+    return congress_dir
+
+
+def time_sequential(scan: Callable[..., ShardScan], shards: list[Path]) -> tuple[int, float]:
+    """Parse every shard in the main process. Returns files parsed and seconds."""
+    started = time.perf_counter()
+    files = sum(len(scan(str(shard)).records) for shard in shards)
+    return files, time.perf_counter() - started
+
+
+def time_parallel(
+    scan: Callable[..., ShardScan],
+    shards: list[Path],
+    workers: int | None,
+    manifest: dict[str, dict[str, ManifestEntry]],
+) -> tuple[int, float]:
+    """Scan every shard in the process pool, adding the files read to manifest. Returns files scanned and seconds."""
+    root = shards[0].parents[2]
+    started = time.perf_counter()
+    files = 0
+    for result in iter_parsed(scan, shards, workers, root=root, manifest=dict(manifest)):
+        files += len(result.records) + result.unchanged
+        for entry in result.files:
+            manifest.setdefault(shard_key(entry.path), {})[entry.path] = entry
+    return files, time.perf_counter() - started
+
+
+def run(congress_dirs: list[Path], workers: int | None) -> list[ParseTiming]:
+    """Time sequential, parallel and unchanged parsing of bills and votes."""
+    timings: list[ParseTiming] = []
+    for kind, scan in (("bills", scan_bills), ("votes", scan_votes)):
+        shards = shard_dirs(congress_dirs, kind)
+        if not shards:
+            continue
+        manifest: dict[str, dict[str, ManifestEntry]] = {}
+        timings.append(ParseTiming(f"{kind} sequential", *time_sequential(scan, shards)))
+        timings.append(ParseTiming(f"{kind} parallel", *time_parallel(scan, shards, workers, manifest)))
+        timings.append(ParseTiming(f"{kind} unchanged", *time_parallel(scan, shards, workers, manifest)))
+    return timings
+
+
+@app.command()
+def main(
+    data_dir: Annotated[Path | None, typer.Option(help="Existing congress data/ directory to parse")] = None,
+    bills: Annotated[int, typer.Option(help="Synthetic bill files")] = 20_000,
+    votes: Annotated[int, typer.Option(help="Synthetic vote files")] = 2_000,
+    voters: Annotated[int, typer.Option(help="Voters per synthetic vote")] = 435,
+    workers: Annotated[int | None, typer.Option(help="Worker processes; defaults to the number of CPUs")] = None,
+) -> None:
+    """Report files/sec for sequential and parallel parsing of bill and vote files."""
+    configure_logger(level="INFO")
+    with tempfile.TemporaryDirectory(prefix="congress-benchmark-") as temporary:
+        if data_dir is None:
+            typer.echo(f"Writing {bills} bills and {votes} votes with {voters} voters each")
+            congress_dirs = [write_synthetic_tree(Path(temporary), bills, votes, voters)]
+        else:
+            congress_dirs = sorted(path for path in data_dir.iterdir() if path.is_dir() and path.name.isdigit())
+
+        for timing in run(congress_dirs, workers):
+            typer.echo(
+                f"{timing.label:<18} {timing.files:>8} files  {timing.seconds:>7.2f}s  "
+                f"{timing.files_per_second:>9.0f} files/s"
+            )
+
+
+if __name__ == "__main__":
+    app()
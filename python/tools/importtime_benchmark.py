@@ -0,0 +1,121 @@
+"""Measure the import time of each CLI entry point with `python -X importtime`.
+
+Every module is imported in a fresh interpreter so nothing is cached between runs.
+The report lists the cumulative import time of each entry point and its slowest
+dependencies, which makes regressions like eagerly built ORM classes easy to spot.
+
+Usage:
+    python -m python.tools.importtime_benchmark
+    python -m python.tools.importtime_benchmark --module python.data_science.ingest_posts --runs 10 --top 15
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Annotated
+
+import typer
+
+from python.common import configure_logger
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer(help="Benchmark the import time of the CLI entry points.")
+
+ENTRY_POINTS = (
+    "python.data_science.ingest_posts",
+    "python.data_science.ingest_congress",
+    "python.database_cli",
+    "python.orm.data_science_dev.models",
+    "python.orm.data_science_dev.autogenerate_models",
+    "python.signal_bot.main",
+)
+
+# import time:       123 |        456 |   package.module
+IMPORTTIME_LINE = re.compile(r"import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<indent>\s+)(?P<module>\S+)")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """One line of `-X importtime` output, in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse the stderr of `python -X importtime` into ImportTiming records."""
+    timings: list[ImportTiming] = []
+    for line in output.splitlines():
+        if (match := IMPORTTIME_LINE.match(line)) is None:
+            continue
+        timings.append(
+            ImportTiming(
+                module=match["module"],
+                self_us=int(match["self"]),
+                cumulative_us=int(match["cumulative"]),
+                depth=(len(match["indent"]) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def measure_import(module: str | None) -> list[ImportTiming]:
+    """Import module in a fresh interpreter and return its import timings; None measures startup only."""
+    statement = "pass" if module is None else f"import {module}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        error = f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}"
+        raise RuntimeError(error)
+    return parse_importtime(result.stderr)
+
+
+def total_import_us(timings: list[ImportTiming], startup: frozenset[str] = frozenset()) -> int:
+    """Sum the cumulative time of the top-level imports, leaving out modules imported at interpreter startup."""
+    return sum(timing.cumulative_us for timing in timings if timing.depth == 0 and timing.module not in startup)
+
+
+@app.command()
+def main(
+    module: Annotated[list[str] | None, typer.Option(help="Module to import; repeat for several")] = None,
+    runs: Annotated[int, typer.Option(help="Fresh interpreters per module; the median is reported")] = 5,
+    top: Annotated[int, typer.Option(help="Slowest dependencies to list per module")] = 10,
+) -> None:
+    """Report the median import time of each entry point and its slowest dependencies."""
+    configure_logger(level="INFO")
+    startup = frozenset(timing.module for timing in measure_import(None))
+
+    for entry_point in module or ENTRY_POINTS:
+        try:
+            samples = [measure_import(entry_point) for _ in range(runs)]
+        except RuntimeError:
+            logger.exception("Skipping %s", entry_point)
+            continue
+
+        totals_ms = [total_import_us(sample, startup) / 1000 for sample in samples]
+        median_run = sorted(samples, key=lambda sample: total_import_us(sample, startup))[len(samples) // 2]
+        typer.echo(
+            f"{entry_point}: median={statistics.median(totals_ms):.1f}ms "
+            f"min={min(totals_ms):.1f}ms max={max(totals_ms):.1f}ms"
+        )
+        imported = [timing for timing in median_run if timing.module not in startup]
+        for timing in sorted(imported, key=lambda timing: timing.self_us, reverse=True)[:top]:
+            typer.echo(
+                f"    {timing.self_us / 1000:>8.1f}ms self {timing.cumulative_us / 1000:>8.1f}ms cum  {timing.module}"
+            )
+
+
+if __name__ == "__main__":
+    app()
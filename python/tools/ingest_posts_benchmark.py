@@ -0,0 +1,350 @@
+"""Benchmarks for the ingest-posts pipeline against a synthetic JSONL corpus.
+
+Each benchmark writes its own corpus with a distinct post_id range so runs never
+collide with each other through ON CONFLICT DO NOTHING.
+
+Usage:
+    python -m python.tools.ingest_posts_benchmark copy-format --rows 1000000
+    python -m python.tools.ingest_posts_benchmark route --rows 1000000
+    python -m python.tools.ingest_posts_benchmark reader --size-mb 4096
+    python -m python.tools.ingest_posts_benchmark bad-rows --rows 100000 --rate 0.001 --rate 0.05
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, Annotated
+
+import orjson
+import typer
+
+from python.common import configure_logger
+from python.data_science.ingest_posts import (
+    BatchStats,
+    CopyFormat,
+    IngestOptions,
+    Route,
+    get_psycopg_connection,
+    ingest_batch,
+    ingest_file,
+    read_jsonl_batches,
+    transform_row,
+)
+from python.data_science.ingest_posts_columnar import read_frame_batches
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer(help="Benchmark the ingest-posts pipeline on synthetic data.")
+
+LANGS = (["en"], ["de"], ["en", "es"], ["ja"], None)
+INSTANCES = ("bsky.social", "mastodon.social", "fosstodon.org", "hachyderm.io")
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Wall-clock and client CPU time for one benchmark run."""
+
+    label: str
+    rows: int
+    wall_seconds: float
+    cpu_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows ingested per wall-clock second."""
+        return self.rows / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def cpu_seconds_per_million(self) -> float:
+        """Client CPU seconds spent per million rows."""
+        return self.cpu_seconds * 1_000_000 / self.rows if self.rows else 0.0
+
+    def __str__(self) -> str:
+        """Return a single report line."""
+        return (
+            f"{self.label:<12} rows={self.rows:>10,} wall={self.wall_seconds:>8.2f}s "
+            f"rows/s={self.rows_per_second:>12,.0f} cpu_s/1M={self.cpu_seconds_per_million:>8.2f}"
+        )
+
+
+def synthetic_post(post_id: int, rng: random.Random) -> dict:
+    """Build one raw JSONL post in the same shape as the production dumps."""
+    minute = rng.randrange(60)
+    hour = rng.randrange(24)
+    day = rng.randrange(1, 29)
+    month = rng.randrange(1, 13)
+    is_reply = rng.random() < 0.3  # noqa: PLR2004
+    return {
+        "post_id": post_id,
+        "user_id": rng.randrange(1, 50_000_000),
+        "instance": rng.choice(INSTANCES),
+        "date": 202400000000 + month * 1_000_000 + day * 10_000 + hour * 100 + minute,
+        "text": " ".join(rng.choices(("lorem", "ipsum", "dolor", "sit", "amet", "post"), k=rng.randrange(3, 40))),
+        "langs": rng.choice(LANGS),
+        "like_count": rng.randrange(1000),
+        "reply_count": rng.randrange(100),
+        "repost_count": rng.randrange(100),
+        "reply_to": rng.randrange(1, 10**12) if is_reply else None,
+        "replied_author": rng.randrange(1, 50_000_000) if is_reply else None,
+        "thread_root": rng.randrange(1, 10**12) if is_reply else None,
+        "thread_root_author": rng.randrange(1, 50_000_000) if is_reply else None,
+        "repost_from": None,
+        "reposted_author": None,
+        "quotes": None,
+        "quoted_author": None,
+        "labels": None,
+        "sent_label": rng.randrange(3),
+        "sent_score": rng.random(),
+    }
+
+
+def corrupt_post(post: dict, rng: random.Random) -> dict:
+    """Break a post in one of the ways the posts INSERT rejects."""
+    corruption = rng.randrange(4)
+    if corruption == 0:
+        post["user_id"] = None
+    elif corruption == 1:
+        post["instance"] += "\x00"
+    elif corruption == 2:  # noqa: PLR2004
+        post["date"] = 203001010000
+    else:
+        post["like_count"] = 2**40
+    return post
+
+
+def write_synthetic_corpus(
+    path: Path,
+    *,
+    rows: int,
+    start_id: int,
+    seed: int = 0,
+    bad_row_rate: float = 0.0,
+) -> Path:
+    """Write `rows` synthetic posts to a JSONL file with post_ids starting at start_id.
+
+    A bad_row_rate fraction of the posts is passed through corrupt_post.
+    """
+    rng = random.Random(seed)  # noqa: S311 not used for security
+    with path.open("wb") as handle:
+        for post_id in range(start_id, start_id + rows):
+            post = synthetic_post(post_id, rng)
+            if rng.random() < bad_row_rate:
+                post = corrupt_post(post, rng)
+            handle.write(orjson.dumps(post))
+            handle.write(b"\n")
+    return path
+
+
+def write_synthetic_corpus_of_size(path: Path, *, size_bytes: int, start_id: int, seed: int = 0) -> int:
+    """Write synthetic posts until the file reaches size_bytes. Returns the number of rows written."""
+    rng = random.Random(seed)  # noqa: S311 not used for security
+    rows = 0
+    written = 0
+    with path.open("wb") as handle:
+        while written < size_bytes:
+            line = orjson.dumps(synthetic_post(start_id + rows, rng)) + b"\n"
+            handle.write(line)
+            written += len(line)
+            rows += 1
+    return rows
+
+
+def measure(label: str, rows: int, func: Callable[[], object]) -> BenchmarkResult:
+    """Run func once and record its wall-clock and client CPU time."""
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    func()
+    return BenchmarkResult(
+        label=label,
+        rows=rows,
+        wall_seconds=time.perf_counter() - wall_start,
+        cpu_seconds=time.process_time() - cpu_start,
+    )
+
+
+@app.command("copy-format")
+def copy_format_benchmark(
+    rows: Annotated[int, typer.Option(help="Synthetic rows per COPY format")] = 1_000_000,
+    batch_size: Annotated[int, typer.Option(help="Rows per INSERT batch")] = 10000,
+    start_id: Annotated[int, typer.Option(help="First synthetic post_id; use a fresh range per run")] = 9 * 10**17,
+) -> None:
+    """Compare text and binary COPY throughput for ingest_file."""
+    configure_logger(level="INFO")
+
+    results: list[BenchmarkResult] = []
+    with TemporaryDirectory() as temp_dir:
+        for offset, copy_format in enumerate(CopyFormat):
+            corpus = write_synthetic_corpus(
+                Path(temp_dir) / f"{copy_format}.jsonl",
+                rows=rows,
+                start_id=start_id + offset * rows,
+            )
+            logger.info("Benchmarking %s COPY on %s", copy_format, corpus)
+            results.append(
+                measure(
+                    str(copy_format),
+                    rows,
+                    partial(ingest_file, corpus, IngestOptions(batch_size=batch_size, copy_format=copy_format)),
+                )
+            )
+
+    for result in results:
+        typer.echo(result)
+
+
+@app.command("route")
+def route_benchmark(
+    rows: Annotated[int, typer.Option(help="Synthetic rows per route")] = 1_000_000,
+    batch_size: Annotated[int, typer.Option(help="Rows per INSERT batch")] = 10000,
+    copy_format: Annotated[CopyFormat, typer.Option(help="COPY wire format")] = CopyFormat.TEXT,
+    start_id: Annotated[int, typer.Option(help="First synthetic post_id; use a fresh range per run")] = 9 * 10**17,
+) -> None:
+    """Compare inserting through main.posts with routing rows straight into weekly partitions."""
+    configure_logger(level="INFO")
+
+    results: list[BenchmarkResult] = []
+    with TemporaryDirectory() as temp_dir:
+        for offset, route in enumerate(Route):
+            corpus = write_synthetic_corpus(
+                Path(temp_dir) / f"{route}.jsonl",
+                rows=rows,
+                start_id=start_id + offset * rows,
+            )
+            logger.info("Benchmarking %s route on %s", route, corpus)
+            results.append(
+                measure(
+                    str(route),
+                    rows,
+                    partial(
+                        ingest_file,
+                        corpus,
+                        IngestOptions(batch_size=batch_size, copy_format=copy_format, route=route),
+                    ),
+                )
+            )
+
+    for result in results:
+        typer.echo(result)
+
+
+@app.command("bad-rows")
+def bad_rows_benchmark(
+    rows: Annotated[int, typer.Option(help="Synthetic rows per run")] = 100_000,
+    batch_size: Annotated[int, typer.Option(help="Rows per INSERT batch")] = 10000,
+    rate: Annotated[list[float] | None, typer.Option(help="Injected bad-row rate; repeat for several")] = None,
+    start_id: Annotated[int, typer.Option(help="First synthetic post_id; use a fresh range per run")] = 9 * 10**17,
+) -> None:
+    """Compare INSERT round trips per batch with and without client-side validation."""
+    configure_logger(level="WARNING")
+    rates = rate or [0.001, 0.01, 0.05]
+
+    with TemporaryDirectory() as temp_dir, get_psycopg_connection() as connection:
+        run = 0
+        for bad_row_rate in rates:
+            for validate in (False, True):
+                corpus = write_synthetic_corpus(
+                    Path(temp_dir) / f"bad_rows_{run}.jsonl",
+                    rows=rows,
+                    start_id=start_id + run * rows,
+                    seed=run,
+                    bad_row_rate=bad_row_rate,
+                )
+                run += 1
+                stats = BatchStats()
+                wall_start = time.perf_counter()
+                for batch, _ in read_jsonl_batches(corpus, batch_size, []):
+                    ingest_batch(connection, batch, validate=validate, stats=stats)
+                typer.echo(
+                    f"rate={bad_row_rate:<6} validate={validate!s:<5} wall={time.perf_counter() - wall_start:>8.2f}s "
+                    f"round_trips/batch={stats.round_trips_per_batch:>8.2f} "
+                    f"rejected={stats.rejected_rows:>7,} failed_on_server={stats.failed_rows:>7,}"
+                )
+
+
+def read_jsonl_batches_text(file_path: Path, batch_size: int) -> Iterator[list[dict]]:
+    """Baseline reader: text-mode line iteration that decodes and strips every line before orjson."""
+    batch: list[dict] = []
+    with file_path.open("r", encoding="utf-8") as handle:
+        for raw_line in handle:
+            line = raw_line.strip()
+            if not line:
+                continue
+            batch.append(transform_row(orjson.loads(line)))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _drain_text(corpus: Path, batch_size: int) -> None:
+    for _ in read_jsonl_batches_text(corpus, batch_size):
+        pass
+
+
+def _drain_mmap(corpus: Path, batch_size: int) -> None:
+    for _ in read_jsonl_batches(corpus, batch_size, []):
+        pass
+
+
+def _drain_columnar(corpus: Path, batch_size: int) -> None:
+    for _ in read_frame_batches(corpus, batch_size):
+        pass
+
+
+def peak_traced_memory(func: Callable[[], object]) -> int:
+    """Run func under tracemalloc and return the peak traced allocation in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@app.command("reader")
+def reader_benchmark(
+    size_mb: Annotated[int, typer.Option(help="Size of the synthetic corpus in MiB")] = 2048,
+    batch_size: Annotated[int, typer.Option(help="Rows per batch")] = 10000,
+    corpus: Annotated[Path | None, typer.Option(help="Existing JSONL file to read instead of a synthetic one")] = None,
+) -> None:
+    """Compare the text-mode, mmap and Polars columnar readers, without touching the database.
+
+    CPU time is measured on a plain run; allocation peaks come from a second run under
+    tracemalloc, which is much slower and would distort the timings. tracemalloc only sees
+    Python allocations, so the columnar peak leaves out the frames Polars allocates natively.
+    """
+    configure_logger(level="INFO")
+
+    with TemporaryDirectory() as temp_dir:
+        if corpus is None:
+            corpus = Path(temp_dir) / "reader.jsonl"
+            logger.info("Writing %d MiB synthetic corpus to %s", size_mb, corpus)
+            rows = write_synthetic_corpus_of_size(corpus, size_bytes=size_mb * 1024 * 1024, start_id=0)
+        else:
+            with corpus.open("rb") as handle:
+                rows = sum(1 for _ in handle)
+
+        readers = {
+            "text": partial(_drain_text, corpus, batch_size),
+            "mmap": partial(_drain_mmap, corpus, batch_size),
+            "columnar": partial(_drain_columnar, corpus, batch_size),
+        }
+        for label, reader in readers.items():
+            result = measure(label, rows, reader)
+            peak = peak_traced_memory(reader)
+            typer.echo(f"{result} peak_alloc={peak / (1024 * 1024):>8.1f}MiB")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,117 @@
+"""Find where chunked dispatch stops paying off in parallelize_process.
+
+Every task submitted to a process pool pickles its kwargs and result and costs one IPC
+round trip. For cheap functions that overhead dominates, and sending chunks of calls to
+each worker is much faster; for expensive ones it makes no difference. This benchmark
+runs a CPU-bound function of increasing cost with per-task and chunked dispatch and
+reports the cost at which per-task dispatch catches up.
+
+Usage:
+    python -m python.tools.parallelize_benchmark
+    python -m python.tools.parallelize_benchmark --tasks 5000 --workers 4 --cost 10 --cost 1000 --cost 100000
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Annotated
+
+import typer
+
+from python.common import configure_logger
+from python.parallelize import auto_chunksize, parallelize_process
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer(help="Benchmark per-task against chunked dispatch in parallelize_process.")
+
+DEFAULT_COSTS = [1, 10, 100, 1_000, 10_000, 100_000]
+
+# Per-task dispatch counts as caught up once it is within this factor of chunked dispatch.
+CROSSOVER_TOLERANCE = 1.05
+
+
+def spin(iterations: int) -> int:
+    """CPU-bound task whose cost grows linearly with iterations."""
+    total = 0
+    for value in range(iterations):
+        total += value * value
+    return total
+
+
+@dataclass(frozen=True)
+class DispatchTiming:
+    """Wall time of one task cost with per-task and chunked dispatch, in seconds."""
+
+    cost: int
+    per_task: float
+    chunked: float
+
+    @property
+    def speedup(self) -> float:
+        """How many times faster chunked dispatch was."""
+        return self.per_task / self.chunked
+
+
+def time_dispatch(cost: int, tasks: int, workers: int, chunksize: int) -> float:
+    """Run tasks spin calls of the given cost and return the wall time in seconds."""
+    started = time.perf_counter()
+    results = parallelize_process(
+        func=spin,
+        kwargs_list=[{"iterations": cost}] * tasks,
+        max_workers=workers,
+        chunksize=chunksize,
+    )
+    elapsed = time.perf_counter() - started
+    if results.exceptions:
+        error = f"spin({cost}) failed: {results.exceptions[0]}"
+        raise RuntimeError(error)
+    return elapsed
+
+
+def crossover(timings: list[DispatchTiming], tolerance: float = CROSSOVER_TOLERANCE) -> int | None:
+    """Return the smallest cost from which per-task dispatch stays within tolerance of chunked, if any."""
+    found = None
+    for timing in sorted(timings, key=lambda timing: timing.cost, reverse=True):
+        if timing.speedup > tolerance:
+            break
+        found = timing.cost
+    return found
+
+
+@app.command()
+def main(
+    cost: Annotated[list[int] | None, typer.Option(help="spin iterations per task; repeat for several")] = None,
+    tasks: Annotated[int, typer.Option(help="Tasks per run")] = 2000,
+    workers: Annotated[int, typer.Option(help="Worker processes")] = 4,
+    chunksize: Annotated[int | None, typer.Option(help="Calls per chunk; defaults to auto_chunksize")] = None,
+) -> None:
+    """Time per-task and chunked dispatch for each task cost and report the crossover."""
+    configure_logger(level="INFO")
+    chunksize = chunksize or auto_chunksize(tasks, workers)
+    typer.echo(f"{tasks} tasks, {workers} workers, chunksize={chunksize}")
+
+    timings: list[DispatchTiming] = []
+    for iterations in cost or DEFAULT_COSTS:
+        timing = DispatchTiming(
+            cost=iterations,
+            per_task=time_dispatch(iterations, tasks, workers, 1),
+            chunked=time_dispatch(iterations, tasks, workers, chunksize),
+        )
+        timings.append(timing)
+        typer.echo(
+            f"cost={timing.cost:>8}  per-task={timing.per_task:>7.3f}s  "
+            f"chunked={timing.chunked:>7.3f}s  speedup={timing.speedup:>5.2f}x"
+        )
+
+    point = crossover(timings)
+    if point is None:
+        typer.echo("Chunked dispatch was faster at every cost")
+    else:
+        typer.echo(f"Per-task dispatch is within {CROSSOVER_TOLERANCE:.2f}x of chunked from cost={point} upwards")
+
+
+if __name__ == "__main__":
+    app()
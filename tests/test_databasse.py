@@ -65,3 +65,17 @@ def test_unmapped_object_raises(session: Session) -> None:
     """Non-ORM instances should raise TypeError immediately."""
     with pytest.raises(TypeError):
         safe_insert([object()], session)
+
+
+def test_invalid_objects_rejected_before_insert(session: Session) -> None:
+    """NOT NULL, length and NUL byte violations are rejected without a round trip."""
+    objs = [Item(name="ok"), Item(name=None), Item(name="x" * 51), Item(name="nul\x00")]
+    failures = safe_insert(objs, session)
+
+    assert [str(exc) for exc, _ in failures] == [
+        "name is null",
+        "name is longer than 50 characters",
+        "name contains a NUL byte",
+    ]
+    assert all(isinstance(exc, ValueError) for exc, _ in failures)
+    assert session.scalars(select(Item.name)).all() == ["ok"]
@@ -0,0 +1,34 @@
+"""Tests for the import-time benchmark parser."""
+
+from __future__ import annotations
+
+from python.tools.importtime_benchmark import ImportTiming, parse_importtime, total_import_us
+
+OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       249 |        249 |   _io
+import time:       514 |        763 | _frozen_importlib_external
+import time:        68 |         68 |     _codecs
+import time:       120 |        188 |   codecs
+import time:       300 |        488 | encodings
+"""
+
+
+def test_parse_importtime():
+    timings = parse_importtime(OUTPUT)
+
+    assert timings[0] == ImportTiming(module="_io", self_us=249, cumulative_us=249, depth=1)
+    assert [(timing.module, timing.depth) for timing in timings] == [
+        ("_io", 1),
+        ("_frozen_importlib_external", 0),
+        ("_codecs", 2),
+        ("codecs", 1),
+        ("encodings", 0),
+    ]
+
+
+def test_total_import_us_skips_startup_modules():
+    timings = parse_importtime(OUTPUT)
+
+    assert total_import_us(timings) == 763 + 488
+    assert total_import_us(timings, frozenset({"_frozen_importlib_external"})) == 488
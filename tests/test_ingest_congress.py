@@ -0,0 +1,114 @@
+"""Tests for the congress ingestion lookups and bulk insert helpers."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from python.data_science.ingest_congress import (
+    BillTextVersion,
+    _build_bill_map,
+    _build_legislator_map,
+    _content_row,
+    _iter_bill_texts,
+    _load_bill_text_keys,
+    _load_content_ids,
+    _vote_record_rows,
+    _vote_rows,
+)
+from python.data_science.ingest_congress_files import ParsedVote
+from python.tools.congress_lookup_memory_benchmark import write_synthetic_database
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _vote(number: int, positions: tuple[tuple[str, str], ...], bill: tuple[int, str, int] | None = None) -> ParsedVote:
+    return ParsedVote(
+        congress=118,
+        chamber="House",
+        session=2023,
+        number=number,
+        vote_type=None,
+        question=None,
+        result=None,
+        result_text=None,
+        vote_date="2023-03-01",
+        bill=bill,
+        yea_count=1,
+        nay_count=1,
+        not_voting_count=0,
+        present_count=0,
+        positions=positions,
+    )
+
+
+def test_vote_rows_resolve_bill_ids():
+    batch = [_vote(1, (), bill=(118, "hr", 42)), _vote(2, (), bill=(118, "hr", 43)), _vote(3, ())]
+
+    rows = _vote_rows(batch, {(118, "hr", 42): 7})
+
+    assert [row["bill_id"] for row in rows] == [7, None, None]
+    assert "positions" not in rows[0]
+    assert "bill" not in rows[0]
+    assert rows[0]["vote_date"] == "2023-03-01"
+
+
+def test_vote_record_rows_skip_unknown_votes_and_legislators():
+    batch = [
+        _vote(1, (("A000001", "Yea"), ("Z999999", "Nay"), ("B000002", "Nay"))),
+        _vote(2, (("A000001", "Nay"),)),
+    ]
+
+    records = _vote_record_rows(batch, {(118, "House", 2023, 1): 10}, {"A000001": 1, "B000002": 2})
+
+    assert records == [(10, 1, "Yea"), (10, 2, "Nay")]
+
+
+def test_lookups_select_only_key_columns(tmp_path: Path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'data_science_dev.db'}")
+    write_synthetic_database(engine, legislators=3, bills=16, bill_texts=12, text_kib=1)
+
+    with Session(engine) as session:
+        legislator_map = _build_legislator_map(session)
+        bill_map = _build_bill_map(session)
+        bill_text_keys = _load_bill_text_keys(session)
+        content_ids = _load_content_ids(session)
+
+    assert legislator_map == {"S000000": 1, "S000001": 2, "S000002": 3}
+    assert len(bill_map) == 16
+    assert bill_map[93, "hr", 1] == 1
+    hr_keys = [key for key in bill_map if key[1] == "hr"]
+    assert hr_keys[0][1] is hr_keys[1][1]
+    assert bill_text_keys == {(bill_id, code) for bill_id in (1, 2) for code in ("ih", "rh", "eh", "rs", "es", "enr")}
+    assert sorted(content_ids.values()) == list(range(1, 13))
+    assert all(len(content_hash) == 32 for content_hash in content_ids)
+
+
+def test_iter_bill_texts_hashes_documents(tmp_path: Path):
+    congress_dir = tmp_path / "118"
+    versions_dir = congress_dir / "bills" / "hr" / "hr42" / "text-versions"
+    for code, document in (("ih", b"SEC. 1."), ("rh", b"SEC. 1."), ("enr", b"\xff not utf-8"), ("eh", b"old")):
+        (versions_dir / code).mkdir(parents=True)
+        (versions_dir / code / "document.txt").write_bytes(document)
+    (versions_dir / "ih" / "data.json").write_bytes(
+        b'{"version_name": "Introduced in House", "issued_on": "2023-01-09"}'
+    )
+
+    found = {
+        version.version_code: (version, document)
+        for version, document in _iter_bill_texts(congress_dir, {(118, "hr", 42): 7}, {(7, "eh")})
+    }
+
+    sec_hash = hashlib.sha256(b"SEC. 1.").digest()
+    assert sorted(found) == ["enr", "ih", "rh"]
+    assert found["ih"] == (BillTextVersion(7, "ih", "Introduced in House", "2023-01-09", sec_hash), b"SEC. 1.")
+    assert found["rh"][0].content_hash == sec_hash
+    assert found["enr"] == (BillTextVersion(7, "enr", None, None, None), None)
+
+
+def test_content_row_uncompressed():
+    assert _content_row(b"hash", b"SEC. 1.", compress=False) == (b"hash", None, 7, b"SEC. 1.")
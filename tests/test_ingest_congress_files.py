@@ -0,0 +1,122 @@
+"""Tests for the parallel congress file parsing."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import orjson
+
+from python.data_science.ingest_congress_files import (
+    ParsedBill,
+    iter_data_files,
+    iter_parsed,
+    parse_bill,
+    parse_vote,
+    scan_bills,
+    scan_votes,
+    shard_dirs,
+)
+from python.tools.congress_parse_benchmark import write_synthetic_tree
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_parse_bill():
+    bill = parse_bill(
+        {
+            "congress": "118",
+            "bill_type": "hr",
+            "number": "42",
+            "official_title": "To do a thing.",
+            "sponsor": {"bioguide_id": "A000001"},
+        }
+    )
+
+    assert bill == ParsedBill(118, "hr", 42, "To do a thing.", None, "To do a thing.", None, None, "A000001", None)
+    assert bill.key == (118, "hr", 42)
+    assert parse_bill({"congress": "118", "bill_type": "hr"}) is None
+
+
+def test_parse_vote():
+    vote = parse_vote(
+        {
+            "congress": 118,
+            "chamber": "h",
+            "session": "2023",
+            "number": 7,
+            "date": "2023-03-01T12:00:00-05:00",
+            "bill": {"type": "hr", "number": 42},
+            "votes": {
+                "Yea": [{"id": "A000001"}, {"id": "B000002"}],
+                "Nay": {"id": "C000003"},
+                "Not Voting": [{"display_name": "no id"}],
+                "VP": "Harris",
+            },
+        }
+    )
+
+    assert vote.key == (118, "House", 2023, 7)
+    assert vote.vote_date == "2023-03-01"
+    assert vote.bill == (118, "hr", 42)
+    assert (vote.yea_count, vote.nay_count, vote.not_voting_count, vote.present_count) == (2, 1, 1, 0)
+    assert vote.positions == (("A000001", "Yea"), ("B000002", "Yea"), ("C000003", "Nay"))
+    assert parse_vote({"congress": 118, "chamber": "h", "number": 7, "date": "2023-03-01"}) is None
+
+
+def test_iter_data_files_skips_text_versions(tmp_path: Path):
+    version_dir = tmp_path / "hr1" / "text-versions" / "ih"
+    version_dir.mkdir(parents=True)
+    (tmp_path / "hr1" / "data.json").write_bytes(b"{}")
+    (version_dir / "data.json").write_bytes(b"{}")
+
+    assert list(iter_data_files(tmp_path, skip=frozenset({"text-versions"}))) == [tmp_path / "hr1" / "data.json"]
+    assert len(list(iter_data_files(tmp_path))) == 2
+
+
+def test_scan_skips_unparsable_files(tmp_path: Path):
+    (tmp_path / "hr1").mkdir()
+    (tmp_path / "hr1" / "data.json").write_bytes(b"{not json")
+    (tmp_path / "hr2").mkdir()
+    (tmp_path / "hr2" / "data.json").write_bytes(orjson.dumps({"congress": 1, "bill_type": "hr", "number": 2}))
+
+    assert [bill.key for bill in scan_bills(str(tmp_path)).records] == [(1, "hr", 2)]
+
+
+def test_scan_skips_files_in_manifest(tmp_path: Path):
+    shard = tmp_path / "118" / "bills" / "hr"
+    for number in (1, 2, 3):
+        (shard / f"hr{number}").mkdir(parents=True)
+        (shard / f"hr{number}" / "data.json").write_bytes(
+            orjson.dumps({"congress": 118, "bill_type": "hr", "number": number})
+        )
+    first = scan_bills(str(shard), root=str(tmp_path))
+    known = {entry.path: entry for entry in first.files}
+
+    touched = shard / "hr2" / "data.json"
+    os.utime(touched, ns=(0, 0))
+    changed = shard / "hr3" / "data.json"
+    changed.write_bytes(orjson.dumps({"congress": 118, "bill_type": "hr", "number": 3, "status": "ENACTED"}))
+    second = scan_bills(str(shard), root=str(tmp_path), known=known)
+
+    assert len(first.records) == 3
+    assert set(known) == {f"118/bills/hr/hr{number}/data.json" for number in (1, 2, 3)}
+    assert [bill.status for bill in second.records] == ["ENACTED"]
+    assert second.unchanged == 2
+    assert sorted(entry.path for entry in second.files) == ["118/bills/hr/hr2/data.json", "118/bills/hr/hr3/data.json"]
+    touched_entry = next(entry for entry in second.files if entry.path.endswith("hr2/data.json"))
+    assert touched_entry == known[touched_entry.path]._replace(mtime_ns=0)
+
+
+def test_iter_parsed_over_synthetic_tree(tmp_path: Path):
+    congress_dir = write_synthetic_tree(tmp_path, bills=20, votes=4, voters=8)
+
+    bill_shards = shard_dirs([congress_dir], "bills")
+    bills = [bill for scan in iter_parsed(scan_bills, bill_shards) for bill in scan.records]
+    votes = [vote for scan in iter_parsed(scan_votes, shard_dirs([congress_dir], "votes")) for vote in scan.records]
+
+    assert len(bill_shards) == 8
+    assert len({bill.key for bill in bills}) == 20
+    assert len(votes) == 4
+    assert all(len(vote.positions) == 8 for vote in votes)
@@ -0,0 +1,364 @@
+"""Tests for the ingest-posts JSONL reader."""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import lzma
+from datetime import UTC, datetime
+from itertools import pairwise
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import orjson
+import pytest
+from compression import zstd
+
+from python.data_science import ingest_posts
+from python.data_science.ingest_posts import (
+    Compression,
+    FileChunk,
+    FileState,
+    IngestOptions,
+    LedgerEntry,
+    StageTimings,
+    background_iter,
+    detect_compression,
+    find_files,
+    group_by_partition,
+    ingest_chunk,
+    ingest_files,
+    parse_date,
+    pending_chunks,
+    plan_chunks,
+    read_batches_with_failures,
+    read_jsonl_batches,
+    split_byte_ranges,
+    split_valid_rows,
+    transform_row,
+    validate_row,
+)
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+def _post(post_id: int) -> dict:
+    return {"post_id": post_id, "date": 202401021530, "text": "hi\x00", "langs": ["en"]}
+
+
+def _write_jsonl(path: Path, lines: list[bytes]) -> Path:
+    path.write_bytes(b"".join(line + b"\n" for line in lines))
+    return path
+
+
+def test_parse_date():
+    assert parse_date(202401021530) == datetime(2024, 1, 2, 15, 30, tzinfo=UTC)
+
+
+def test_read_jsonl_batches_offsets(tmp_path):
+    path = _write_jsonl(tmp_path / "posts.jsonl", [orjson.dumps(_post(post_id)) for post_id in range(5)])
+    failed_lines: list[dict] = []
+
+    batches = list(read_jsonl_batches(path, 2, failed_lines))
+
+    assert [[row["post_id"] for row in batch] for batch, _ in batches] == [[0, 1], [2, 3], [4]]
+    assert batches[-1][1] == path.stat().st_size
+    assert batches[0][0][0]["text"] == "hi"
+    assert batches[0][0][0]["langs"] == b'["en"]'
+    assert not failed_lines
+
+
+def test_read_jsonl_batches_resumes_at_offset(tmp_path):
+    path = _write_jsonl(tmp_path / "posts.jsonl", [orjson.dumps(_post(post_id)) for post_id in range(5)])
+    first_batch, offset = next(read_jsonl_batches(path, 2, []))
+
+    resumed = list(read_jsonl_batches(path, 2, [], start_offset=offset))
+
+    assert [row["post_id"] for row in first_batch] == [0, 1]
+    assert [[row["post_id"] for row in batch] for batch, _ in resumed] == [[2, 3], [4]]
+
+
+def test_read_jsonl_batches_concatenated_and_malformed(tmp_path):
+    lines = [
+        orjson.dumps(_post(1)) + orjson.dumps(_post(2)),
+        b"{not json",
+        b"",
+        orjson.dumps(_post(3)),
+    ]
+    path = _write_jsonl(tmp_path / "posts.jsonl", lines)
+    failed_lines: list[dict] = []
+
+    batches = list(read_jsonl_batches(path, 10, failed_lines))
+
+    assert [row["post_id"] for row in batches[0][0]] == [1, 2, 3]
+    assert failed_lines == [{"raw_line": "{not json", "error": "malformed JSON"}]
+
+
+def test_read_jsonl_batches_whitespace_and_bad_utf8(tmp_path):
+    path = tmp_path / "posts.jsonl"
+    path.write_bytes(b"  \r\n" + orjson.dumps(_post(1)) + b"\r\n\xff\xfe\n" + orjson.dumps(_post(2)))
+    failed_lines: list[dict] = []
+
+    batches = list(read_jsonl_batches(path, 10, failed_lines))
+
+    assert [row["post_id"] for row in batches[0][0]] == [1, 2]
+    assert batches[0][1] == path.stat().st_size
+    assert len(failed_lines) == 1
+
+
+def test_read_jsonl_batches_empty_file(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_bytes(b"")
+
+    assert list(read_jsonl_batches(path, 10, [])) == []
+
+
+def test_group_by_partition():
+    rows = [
+        {"post_id": 1, "date": datetime(2024, 1, 1, tzinfo=UTC)},
+        {"post_id": 2, "date": datetime(2024, 1, 7, 23, 59, tzinfo=UTC)},
+        {"post_id": 3, "date": datetime(2024, 1, 8, tzinfo=UTC)},
+        {"post_id": 4, "date": datetime(2022, 1, 3, tzinfo=UTC)},
+    ]
+
+    groups = group_by_partition(rows)
+
+    assert {table: [row["post_id"] for row in group] for table, group in groups.items()} == {
+        "posts_2024_01": [1, 2],
+        "posts_2024_02": [3],
+        "posts": [4],
+    }
+
+
+def test_group_by_partition_routable():
+    rows = [
+        {"post_id": 1, "date": datetime(2024, 1, 1, tzinfo=UTC)},
+        {"post_id": 2, "date": datetime(2031, 1, 8, tzinfo=UTC)},
+        {"post_id": 3, "date": datetime(2024, 1, 8, tzinfo=UTC)},
+    ]
+
+    groups = group_by_partition(rows, {"posts_2024_01", "posts_2031_02"})
+
+    assert {table: [row["post_id"] for row in group] for table, group in groups.items()} == {
+        "posts_2024_01": [1],
+        "posts_2031_02": [2],
+        "posts": [3],
+    }
+
+
+def test_split_byte_ranges_aligns_to_newlines(tmp_path):
+    path = _write_jsonl(tmp_path / "posts.jsonl", [orjson.dumps(_post(post_id)) for post_id in range(10)])
+    size = path.stat().st_size
+    data = path.read_bytes()
+
+    ranges = split_byte_ranges(path, size, size // 3)
+
+    assert len(ranges) > 1
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == size
+    for (_, end), (start, _) in pairwise(ranges):
+        assert end == start
+        assert data[end - 1 : end] == b"\n"
+
+    post_ids = [
+        row["post_id"]
+        for start, end in ranges
+        for batch, _ in read_jsonl_batches(path, 100, [], start_offset=start, end_offset=end)
+        for row in batch
+    ]
+    assert post_ids == list(range(10))
+
+
+def test_split_byte_ranges_small_file(tmp_path):
+    path = _write_jsonl(tmp_path / "posts.jsonl", [orjson.dumps(_post(1))])
+    size = path.stat().st_size
+
+    assert split_byte_ranges(path, size, size * 2) == [(0, size)]
+    assert split_byte_ranges(path, size, 0) == [(0, size)]
+
+
+def test_plan_chunks_largest_first(tmp_path):
+    small = _write_jsonl(tmp_path / "small.jsonl", [orjson.dumps(_post(1))])
+    large = _write_jsonl(tmp_path / "large.jsonl", [orjson.dumps(_post(post_id)) for post_id in range(20)])
+
+    chunks = plan_chunks([small, large], 0)
+
+    assert [chunk.path for chunk in chunks] == [large, small]
+    assert chunks[0].ledger_key == str(large.resolve())
+
+
+def test_read_jsonl_batches_compressed(tmp_path):
+    data = b"".join(orjson.dumps(_post(post_id)) + b"\n" for post_id in range(5))
+    gzip_path = tmp_path / "posts.jsonl.gz"
+    gzip_path.write_bytes(gzip.compress(data))
+    xz_path = tmp_path / "posts_without_extension"
+    xz_path.write_bytes(lzma.compress(data))
+    zstd_path = tmp_path / "posts.jsonl.zst"
+    zstd_path.write_bytes(zstd.compress(data))
+
+    compressed = ((gzip_path, Compression.GZIP), (xz_path, Compression.XZ), (zstd_path, Compression.ZSTD))
+    for path, compression in compressed:
+        assert detect_compression(path) == compression
+        batches = list(read_jsonl_batches(path, 2, []))
+        assert [[row["post_id"] for row in batch] for batch, _ in batches] == [[0, 1], [2, 3], [4]]
+        assert batches[-1][1] == len(data)
+
+        resumed = list(read_jsonl_batches(path, 2, [], start_offset=batches[0][1]))
+        assert [[row["post_id"] for row in batch] for batch, _ in resumed] == [[2, 3], [4]]
+
+
+def test_find_files_includes_compressed(tmp_path):
+    for name in ("a.jsonl", "b.jsonl.gz", "c.jsonl.zst", "d.jsonl.xz", "e.txt"):
+        (tmp_path / name).write_bytes(b"")
+
+    assert [path.name for path in find_files(tmp_path, "*.jsonl")] == [
+        "a.jsonl",
+        "b.jsonl.gz",
+        "c.jsonl.zst",
+        "d.jsonl.xz",
+    ]
+
+
+def test_read_batches_with_failures(tmp_path):
+    lines = [orjson.dumps(_post(1)), b"{bad", orjson.dumps(_post(2)), b"{worse"]
+    path = _write_jsonl(tmp_path / "posts.jsonl", lines)
+
+    batches = list(read_batches_with_failures(path, 2))
+
+    assert [[row["post_id"] for row in batch] for batch, _, _ in batches] == [[1, 2], []]
+    assert [[line["raw_line"] for line in failed] for _, _, failed in batches] == [["{bad"], ["{worse"]]
+    assert batches[-1][1] == path.stat().st_size
+
+
+def test_background_iter():
+    timings = StageTimings()
+
+    assert list(background_iter(iter(range(100)), depth=2, name="test", timings=timings)) == list(range(100))
+    assert timings.produce_seconds > 0
+
+
+def test_background_iter_reraises():
+    def items():
+        yield 1
+        error = "boom"
+        raise RuntimeError(error)
+
+    consumed = []
+    with pytest.raises(RuntimeError, match="boom"):
+        consumed.extend(background_iter(items(), depth=1, name="test"))
+    assert consumed == [1]
+
+
+def test_background_iter_close_stops_producer():
+    closed = []
+
+    def items():
+        try:
+            yield from range(1000)
+        finally:
+            closed.append(True)
+
+    iterator = background_iter(items(), depth=1, name="test")
+    assert next(iterator) == 0
+    iterator.close()
+
+    assert closed == [True]
+
+
+def _row(**overrides: object) -> dict:
+    raw = {
+        "post_id": 1,
+        "user_id": 2,
+        "instance": "bsky.social",
+        "date": 202401021530,
+        "text": "hi",
+        "langs": ["en"],
+        "like_count": 0,
+        "reply_count": 0,
+        "repost_count": 0,
+    }
+    return transform_row(raw) | overrides
+
+
+@pytest.mark.parametrize(
+    ("overrides", "reason"),
+    [
+        ({}, None),
+        ({"user_id": None}, "user_id is null"),
+        ({"like_count": 2**31}, "like_count is not an integer within its column type: 2147483648"),
+        ({"like_count": "3"}, "like_count is not an integer within its column type: '3'"),
+        ({"instance": "bsky\x00social"}, "instance contains a NUL byte"),
+        ({"sent_score": "high"}, "sent_score is not a number: 'high'"),
+        ({"date": datetime(2030, 1, 1, tzinfo=UTC)}, "date 2030-01-01T00:00:00+00:00 has no partition"),
+    ],
+)
+def test_validate_row(overrides, reason):
+    assert validate_row(_row(**overrides)) == reason
+
+
+def test_validate_row_years():
+    row = _row(date=datetime(2030, 1, 1, tzinfo=UTC))
+
+    assert validate_row(row, years=(2023, 2030)) is None
+    assert validate_row(row, years=None) is None
+    assert validate_row(row, years=(2023, 2029)) == "date 2030-01-01T00:00:00+00:00 has no partition"
+
+
+def test_split_valid_rows():
+    valid, rejected = split_valid_rows([_row(), _row(post_id=2, user_id=None), _row(post_id=3)])
+
+    assert [row["post_id"] for row in valid] == [1, 3]
+    assert [record["error"] for record in rejected] == ["user_id is null"]
+    assert orjson.loads(rejected[0]["raw_line"])["post_id"] == 2
+
+
+@pytest.mark.parametrize(("committed_offset", "warnings"), [(100, 0), (140, 1)])
+def test_pending_chunks_warns_only_about_partial_initial_load(
+    mocker: MockerFixture, caplog, committed_offset, warnings
+):
+    state = FileState(path="/data/posts.jsonl", size=300, mtime_ns=1)
+    chunks = [FileChunk(Path(state.path), state, start, start + 100) for start in (0, 100, 200)]
+    ledger = {
+        chunks[0].ledger_key: LedgerEntry(chunks[0].ledger_key, 300, 1, 100, 5, completed=True),
+        chunks[1].ledger_key: LedgerEntry(chunks[1].ledger_key, 300, 1, committed_offset, 2, completed=False),
+    }
+    mocker.patch.object(ingest_posts, "get_psycopg_connection")
+    mocker.patch.object(ingest_posts, "read_ledger", return_value=ledger)
+
+    with caplog.at_level(logging.INFO):
+        assert pending_chunks(chunks, initial_load=True) == chunks[1:]
+
+    assert sum(record.levelno == logging.WARNING for record in caplog.records) == warnings
+
+
+def test_ingest_files_caps_workers_at_chunks_and_cpus(tmp_path, mocker: MockerFixture):
+    path = _write_jsonl(tmp_path / "posts.jsonl", [orjson.dumps(_post(post_id)) for post_id in range(10)])
+    pool = mocker.patch.object(ingest_posts, "WorkerPool")
+    pool.return_value.__enter__.return_value.imap.return_value = iter([])
+    mocker.patch.object(ingest_posts, "cpu_count", return_value=2)
+    mocker.patch.object(ingest_posts, "finalize_partitions")
+
+    ingest_files([path], IngestOptions(resume=False), max_workers=4)
+    assert pool.call_args.kwargs["max_workers"] == 1
+
+    ingest_files([path], IngestOptions(resume=False), max_workers=4, chunk_bytes=64)
+    assert pool.call_args.kwargs["max_workers"] == 2
+
+
+def test_ingest_chunk_counts_only_rows_that_passed_validation(tmp_path, mocker: MockerFixture):
+    raw = {"user_id": 2, "instance": "bsky.social", "date": 202401021530, "text": "hi", "langs": ["en"]}
+    raw |= {"like_count": 0, "reply_count": 0, "repost_count": 0}
+    lines = [orjson.dumps(raw | {"post_id": 1}), orjson.dumps(raw | {"post_id": 2, "user_id": None})]
+    path = _write_jsonl(tmp_path / "posts.jsonl", [*lines, orjson.dumps(raw | {"post_id": 3})])
+    mocker.patch.object(ingest_posts, "worker_connection")
+    insert_batch = mocker.patch.object(ingest_posts, "insert_batch")
+    checkpoint = mocker.patch.object(ingest_posts, "checkpoint")
+    options = IngestOptions(resume=False, pipeline_depth=0, provision_partitions=False)
+
+    result = ingest_chunk(FileChunk(path, FileState.from_path(path), 0, path.stat().st_size), options)
+
+    assert [row["post_id"] for row in insert_batch.call_args.args[1]] == [1, 3]
+    assert [call.kwargs["row_count"] for call in checkpoint.call_args_list] == [2, 2]
+    assert checkpoint.call_args_list[0].kwargs["failed_lines"][0]["error"] == "user_id is null"
+    assert result.rows == 2
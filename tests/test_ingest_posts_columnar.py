@@ -0,0 +1,135 @@
+"""Tests for the Polars columnar ingest-posts path."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import orjson
+import polars as pl
+import pytest
+
+from python.data_science.ingest_posts import COLUMNS, read_batches_with_failures
+from python.data_science.ingest_posts_columnar import (
+    frame_to_rows,
+    group_frame_by_partition,
+    read_frame_batches,
+    split_valid_frame,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _post(post_id: int, date: int = 202401021530) -> dict:
+    return {"post_id": post_id, "date": date, "text": "hi\x00", "langs": ["en", "日本"]}
+
+
+def _write_jsonl(path: Path, lines: list[bytes]) -> Path:
+    path.write_bytes(b"".join(line + b"\n" for line in lines))
+    return path
+
+
+def test_read_frame_batches_transforms(tmp_path):
+    path = _write_jsonl(tmp_path / "posts.jsonl", [orjson.dumps(_post(post_id)) for post_id in range(5)])
+
+    batches = list(read_frame_batches(path, 2))
+
+    assert all(isinstance(frame, pl.DataFrame) for frame, _, _ in batches)
+    assert [frame["post_id"].to_list() for frame, _, _ in batches] == [[0, 1], [2, 3], [4]]
+    assert batches[-1][1] == path.stat().st_size
+    frame = batches[0][0]
+    assert frame.columns == list(COLUMNS)
+    assert frame["date"][0] == datetime(2024, 1, 2, 15, 30)  # noqa: DTZ001 naive UTC, as in the posts table
+    assert frame["text"][0] == "hi"
+    assert frame["langs"][0] == orjson.dumps(["en", "日本"]).decode()
+
+
+def test_read_frame_batches_resumes_at_offset(tmp_path):
+    path = _write_jsonl(tmp_path / "posts.jsonl", [orjson.dumps(_post(post_id)) for post_id in range(5)])
+    _, offset, _ = next(read_frame_batches(path, 2))
+
+    resumed = list(read_frame_batches(path, 2, start_offset=offset))
+
+    assert [frame["post_id"].to_list() for frame, _, _ in resumed] == [[2, 3], [4]]
+
+
+def test_read_frame_batches_falls_back_to_dict_path(tmp_path):
+    lines = [orjson.dumps(_post(1)), b"{not json", orjson.dumps(_post(2)), orjson.dumps(_post(3))]
+    path = _write_jsonl(tmp_path / "posts.jsonl", lines)
+
+    batches = list(read_frame_batches(path, 2))
+
+    fallback, _, failed_lines = batches[0]
+    assert isinstance(fallback, list)
+    assert [row["post_id"] for row in fallback] == [1]
+    assert failed_lines == [{"raw_line": "{not json", "error": "malformed JSON"}]
+    assert isinstance(batches[1][0], pl.DataFrame)
+    assert batches[1][0]["post_id"].to_list() == [2, 3]
+
+
+def test_read_frame_batches_records_impossible_dates(tmp_path):
+    lines = [orjson.dumps(_post(1)), orjson.dumps(_post(2, date=202413021530)), orjson.dumps(_post(3))]
+    path = _write_jsonl(tmp_path / "posts.jsonl", lines)
+
+    batches = list(read_frame_batches(path, 3))
+
+    assert len(batches) == 1
+    rows, offset, failed_lines = batches[0]
+    assert [row["post_id"] for row in rows] == [1, 3]
+    assert offset == path.stat().st_size
+    assert len(failed_lines) == 1
+    assert failed_lines[0]["raw_line"] == lines[1].decode()
+
+
+def test_group_frame_by_partition(tmp_path):
+    dates = [202401010000, 202401072359, 202401080000, 202201030000]
+    lines = [orjson.dumps(_post(post_id, date)) for post_id, date in enumerate(dates, 1)]
+    path = _write_jsonl(tmp_path / "posts.jsonl", lines)
+    frame, _, _ = next(read_frame_batches(path, 10))
+
+    groups = group_frame_by_partition(frame)
+
+    assert {table: group["post_id"].to_list() for table, group in groups.items()} == {
+        "posts_2024_01": [1, 2],
+        "posts_2024_02": [3],
+        "posts": [4],
+    }
+
+
+def test_frame_to_rows_matches_dict_path(tmp_path):
+    path = _write_jsonl(tmp_path / "posts.jsonl", [orjson.dumps(_post(1))])
+    frame, _, _ = next(read_frame_batches(path, 10))
+
+    row = frame_to_rows(frame)[0]
+
+    assert row["date"].utcoffset().total_seconds() == 0
+    assert row["text"] == "hi"
+
+
+def test_split_valid_frame(tmp_path):
+    lines = [
+        orjson.dumps(_post(1) | {"user_id": 1, "instance": "a", "like_count": 0, "reply_count": 0, "repost_count": 0}),
+        orjson.dumps(_post(2) | {"instance": "a", "like_count": 0, "reply_count": 0, "repost_count": 0}),
+        orjson.dumps(_post(3, 203001010000) | {"user_id": 1, "instance": "a", "like_count": 0, "reply_count": 0}),
+    ]
+    path = _write_jsonl(tmp_path / "posts.jsonl", lines)
+    frame, _, _ = next(read_frame_batches(path, 10))
+
+    valid, rejected = split_valid_frame(frame)
+
+    assert valid["post_id"].to_list() == [1]
+    assert [record["error"] for record in rejected] == ["user_id is null", "repost_count is null"]
+
+
+@pytest.mark.parametrize("overrides", [{"text": 123}, {"instance": 5}, {"labels": ["spam"]}, {"text": True}])
+def test_read_frame_batches_matches_dict_path_on_non_string_text(tmp_path, overrides):
+    lines = [orjson.dumps(_post(1)), orjson.dumps(_post(2) | overrides), orjson.dumps(_post(3))]
+    path = _write_jsonl(tmp_path / "posts.jsonl", lines)
+    nulls = _write_jsonl(tmp_path / "nulls.jsonl", [orjson.dumps(_post(4) | {"text": None, "labels": None})])
+
+    columnar = list(read_frame_batches(path, 10))
+
+    assert isinstance(columnar[0][0], list)
+    assert columnar == list(read_batches_with_failures(path, 10))
+    assert isinstance(next(read_frame_batches(nulls, 10))[0], pl.DataFrame)
@@ -0,0 +1,109 @@
+"""Tests for the ingest-posts finalization stage."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Self
+
+import pytest
+
+from python.data_science import ingest_posts_finalize
+from python.data_science.ingest_posts_finalize import (
+    INDEX_VALID_SELECT,
+    finalize_partitions,
+    maintain_partition,
+    touched_tables,
+)
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+class StubConnection:
+    """Records each statement with the autocommit setting it ran under."""
+
+    def __init__(self, statements: list[tuple[str, bool]], valid_indexes: dict[str, bool]) -> None:
+        self.statements = statements
+        self.valid_indexes = valid_indexes
+        self.autocommit = False
+        self._row: tuple | None = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        pass
+
+    def execute(self, query: str, params: dict | None = None) -> Self:
+        if query == INDEX_VALID_SELECT:
+            valid = self.valid_indexes.get(params["index"])
+            self._row = None if valid is None else (valid,)
+        else:
+            self.statements.append((query, self.autocommit))
+        return self
+
+    def fetchone(self) -> tuple | None:
+        return self._row
+
+
+@pytest.fixture
+def statements() -> list[tuple[str, bool]]:
+    return []
+
+
+@pytest.fixture
+def connect(statements):
+    return lambda: StubConnection(statements, {"ix_posts_2024_01_user_id": True, "ix_posts_2024_01_reply_to": False})
+
+
+def test_touched_tables():
+    attached = {"posts_2024_01", "posts_2024_02", "posts_default"}
+
+    assert touched_tables({(2024, 1), (2024, 2), (2031, 5)}, attached) == [
+        "posts_2024_01",
+        "posts_2024_02",
+        "posts_default",
+    ]
+
+
+def test_touched_tables_without_default():
+    assert touched_tables({(2024, 1), (2031, 5)}, {"posts_2024_01"}) == ["posts_2024_01"]
+
+
+def test_finalize_partitions_analyzes_only_touched_partitions(mocker: MockerFixture, connect, statements):
+    manager = mocker.patch.object(ingest_posts_finalize, "PartitionManager")
+    manager.return_value.existing = {"posts_2024_01", "posts_2024_02", "posts_2024_03", "posts_default"}
+
+    finalize_partitions({(2024, 1), (2024, 3), (2031, 5)}, connect=connect, schema="main")
+
+    assert sorted(statements) == [
+        ("ANALYZE main.posts_2024_01", True),
+        ("ANALYZE main.posts_2024_03", True),
+        ("ANALYZE main.posts_default", True),
+    ]
+
+
+def test_finalize_partitions_without_work_opens_no_connection():
+    def connect():
+        pytest.fail("no connection should be opened")
+
+    finalize_partitions({(2024, 1)}, connect=connect, schema="main", analyze=False)
+
+
+def test_maintain_partition_skips_indexes_by_default(connect, statements):
+    assert maintain_partition(connect=connect, schema="main", table="posts_2024_01", analyze=True, build_indexes=False)
+
+    assert statements == [("ANALYZE main.posts_2024_01", True)]
+
+
+def test_maintain_partition_builds_indexes_concurrently_with_autocommit(connect, statements):
+    maintain_partition(connect=connect, schema="main", table="posts_2024_01", analyze=True, build_indexes=True)
+
+    assert statements == [
+        (
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_2024_01_thread_root ON main.posts_2024_01 (thread_root)",
+            True,
+        ),
+        ("DROP INDEX CONCURRENTLY IF EXISTS main.ix_posts_2024_01_reply_to", True),
+        ("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_2024_01_reply_to ON main.posts_2024_01 (reply_to)", True),
+        ("ANALYZE main.posts_2024_01", True),
+    ]
@@ -0,0 +1,181 @@
+"""Tests for the ingest-posts initial-load path."""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from typing import TYPE_CHECKING, Self
+
+import polars as pl
+import pytest
+
+from python.data_science import ingest_posts_initial_load
+from python.data_science.ingest_posts import COLUMNS, BatchStats, transform_row
+from python.data_science.ingest_posts_initial_load import (
+    LOAD_TABLE,
+    InitialLoader,
+    load_table_name,
+    merge_load_table,
+)
+from python.data_science.partition_manager import PARTITION_LOCK, PARTITIONS_SELECT
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+INSERT_SELECT = re.compile(r"INSERT INTO (?P<table>\S+) \(.*?\) (?P<select>SELECT .*)")
+
+
+class FakeCursor:
+    """Records statements and runs INSERT ... SELECT DISTINCT ON over in-memory frames with Polars SQL."""
+
+    def __init__(self, connection: FakeConnection) -> None:
+        self.connection = connection
+        self._rows: list[tuple] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        pass
+
+    def execute(self, query: str, _params: dict | None = None) -> Self:
+        statement = " ".join(query.split())
+        self.connection.statements.append(statement)
+        self._rows = self.connection.partitions if query == PARTITIONS_SELECT else []
+        if (match := INSERT_SELECT.fullmatch(statement)) and "DISTINCT ON" in statement:
+            tables = {name.removeprefix("main."): frame for name, frame in self.connection.tables.items()}
+            select = match["select"].replace("main.", "")
+            self.connection.tables[match["table"]] = pl.SQLContext(tables).execute(select, eager=True)
+        return self
+
+    def fetchall(self) -> list[tuple]:
+        return self._rows
+
+
+class FakeConnection:
+    """Stands in for a psycopg connection in merge_load_table and InitialLoader."""
+
+    def __init__(self, tables: dict[str, pl.DataFrame] | None = None, partitions: list[tuple] | None = None) -> None:
+        self.tables = tables or {}
+        self.partitions = partitions or []
+        self.statements: list[str] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        pass
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def commit(self) -> None:
+        self.statements.append("COMMIT")
+
+    def rollback(self) -> None:
+        self.statements.append("ROLLBACK")
+
+
+def _row(post_id: int, date: int) -> dict:
+    raw = {"post_id": post_id, "user_id": 2, "instance": "bsky.social", "date": date, "text": "hi", "langs": ["en"]}
+    return transform_row(raw | {"like_count": 0, "reply_count": 0, "repost_count": 0})
+
+
+def _load_frame(post_ids: list[int], texts: list[str]) -> pl.DataFrame:
+    date = datetime(2019, 1, 30, 12)  # noqa: DTZ001 naive UTC, as in the posts table
+    columns: dict[str, list] = {column: [None] * len(post_ids) for column in COLUMNS}
+    return pl.DataFrame(columns | {"post_id": post_ids, "date": [date] * len(post_ids), "text": texts})
+
+
+def test_load_table_name_round_trips():
+    name = load_table_name(2019, 5)
+
+    assert name == "load_posts_2019_05"
+    match = LOAD_TABLE.fullmatch(name)
+    assert (int(match["year"]), int(match["week"])) == (2019, 5)
+
+
+def test_merge_load_table_rejects_other_tables():
+    def connect():
+        pytest.fail("no connection should be opened")
+
+    with pytest.raises(ValueError, match="not a load table"):
+        merge_load_table(connect=connect, schema="main", table="posts_2019_05")
+
+
+def test_merge_load_table_builds_and_attaches_partition():
+    connection = FakeConnection({"main.load_posts_2019_05": _load_frame([2, 1, 2, 1], ["b", "a", "b", "a"])})
+
+    assert merge_load_table(connect=lambda: connection, schema="main", table="load_posts_2019_05") == (
+        "main.posts_2019_05"
+    )
+
+    steps = [
+        "CREATE TABLE main.posts_2019_05",
+        "INSERT INTO main.posts_2019_05",
+        "ALTER TABLE main.posts_2019_05 ADD CONSTRAINT pk_posts_2019_05 PRIMARY KEY (post_id, date)",
+        "ALTER TABLE main.posts_2019_05 ADD CONSTRAINT posts_2019_05_bounds CHECK",
+        PARTITION_LOCK,
+        "ALTER TABLE main.posts ATTACH PARTITION main.posts_2019_05",
+        "ALTER TABLE main.posts_2019_05 DROP CONSTRAINT posts_2019_05_bounds",
+        "DROP TABLE main.load_posts_2019_05",
+        "COMMIT",
+    ]
+    issued = connection.statements[1:]
+    assert len(issued) == len(steps)
+    assert all(statement.startswith(step) for statement, step in zip(issued, steps, strict=True))
+    assert "SELECT DISTINCT ON (post_id, date)" in issued[1]
+    merged = connection.tables["main.posts_2019_05"]
+    assert merged.select("post_id", "text").rows() == [(1, "a"), (2, "b")]
+
+
+def test_merge_load_table_into_existing_partition():
+    connection = FakeConnection(partitions=[("posts_2019_05", False)])
+
+    merge_load_table(connect=lambda: connection, schema="main", table="load_posts_2019_05")
+
+    issued = connection.statements[1:]
+    assert issued[0].startswith("INSERT INTO main.posts_2019_05")
+    assert issued[0].endswith("ON CONFLICT (post_id, date) DO NOTHING")
+    assert issued[1:] == ["DROP TABLE main.load_posts_2019_05", "COMMIT"]
+
+
+@pytest.fixture
+def loader(mocker: MockerFixture) -> InitialLoader:
+    manager = mocker.patch.object(ingest_posts_initial_load, "PartitionManager")
+    manager.return_value.existing = {"posts_2024_01"}
+    return InitialLoader(FakeConnection(), "main")
+
+
+def test_initial_loader_splits_existing_and_new_weeks(loader: InitialLoader, mocker: MockerFixture):
+    insert_batch = mocker.patch.object(ingest_posts_initial_load, "insert_batch")
+    copy_rows = mocker.patch.object(ingest_posts_initial_load, "copy_rows")
+    batch = [_row(1, 202401021530), _row(2, 201901301200), _row(3, 201902061200), _row(4, 201901311200)]
+    stats = BatchStats()
+
+    assert loader.load_batch(batch, stats=stats) == []
+
+    assert [row["post_id"] for row in insert_batch.call_args.args[1]] == [1]
+    copied = {call.args[1]: [row["post_id"] for row in call.args[2]] for call in copy_rows.call_args_list}
+    assert copied == {"main.load_posts_2019_05": [2, 4], "main.load_posts_2019_06": [3]}
+    assert "CREATE UNLOGGED TABLE IF NOT EXISTS main.load_posts_2019_05" in loader.connection.statements[1]
+    assert stats.weeks == {(2024, 1), (2019, 5), (2019, 6)}
+
+
+def test_initial_loader_isolates_bad_rows(loader: InitialLoader, mocker: MockerFixture):
+    copied: list[int] = []
+
+    def copy_rows(_cursor, _table, rows, _binary_types):
+        if any(row["post_id"] == 13 for row in rows):
+            error = "bad row"
+            raise ValueError(error)
+        copied.extend(row["post_id"] for row in rows)
+
+    mocker.patch.object(ingest_posts_initial_load, "copy_rows", side_effect=copy_rows)
+    record_failed_row = mocker.patch.object(ingest_posts_initial_load, "record_failed_row")
+
+    loader.copy_to_load_tables([_row(post_id, 201901301200) for post_id in (11, 12, 13, 14)], BatchStats())
+
+    assert sorted(copied) == [11, 12, 14]
+    assert record_failed_row.call_count == 1
+    assert record_failed_row.call_args.args[1]["post_id"] == 13
@@ -2,19 +2,37 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import time
 from concurrent.futures import Future, ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
 
 import pytest
 
-from python.parallelize import _parallelize_base, parallelize_process, parallelize_thread
+from python.parallelize import (
+    AdaptiveConcurrency,
+    WorkerPool,
+    _parallelize_base,
+    auto_chunksize,
+    iter_parallelize_async,
+    iter_parallelize_process,
+    iter_parallelize_thread,
+    parallelize_async,
+    parallelize_process,
+    parallelize_process_adaptive,
+    parallelize_thread,
+    worker_state,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator
 
     from pytest_mock import MockerFixture
 
+    from python.parallelize_progress import ProgressSnapshot
+
 
 class MockFuture(Future):
     """MockFuture."""
@@ -97,6 +115,21 @@ def test_parallelize_process_to_many_max_workers(mocker: MockerFixture) -> None:
         parallelize_process(func=add, kwargs_list=[{"a": 1, "b": 2}], max_workers=8)
 
 
+@pytest.mark.parametrize(
+    "start",
+    [
+        lambda: WorkerPool(max_workers=8),
+        lambda: iter_parallelize_process(func=add, kwargs_list=[{"a": 1, "b": 2}], max_workers=8),
+    ],
+)
+def test_process_pools_refuse_more_workers_than_cpus(mocker: MockerFixture, start: Callable[[], object]) -> None:
+    """test_process_pools_refuse_more_workers_than_cpus."""
+    mocker.patch(target="python.parallelize.cpu_count", return_value=1)
+
+    with pytest.raises(RuntimeError, match="max_workers must be less than or equal to 1"):
+        start()
+
+
 def test_executor_results_repr() -> None:
     """test_ExecutorResults_repr."""
     results = parallelize_thread(func=add, kwargs_list=[{"a": 1, "b": 2}])
@@ -121,3 +154,239 @@ def test_mock_pool_executor() -> None:
         mode="normal",
     )
     assert repr(results) == "results=[3, 7] exceptions=[]"
+
+
+async def async_add(a: int, b: int) -> int:
+    """Async add."""
+    await asyncio.sleep(0.01 * a)
+    return a + b
+
+
+def test_parallelize_async() -> None:
+    """test_parallelize_async."""
+    kwargs_list: list[dict[str, int | None]] = [{"a": 3, "b": 4}, {"a": 1, "b": 2}, {"a": 2, "b": None}]
+    results = asyncio.run(parallelize_async(func=async_add, kwargs_list=kwargs_list, max_concurrency=2))
+    assert results.results == [7, 3]
+    assert [type(exception) for exception in results.exceptions] == [TypeError]
+
+
+def test_iter_parallelize_async_yields_in_completion_order() -> None:
+    """test_iter_parallelize_async_yields_in_completion_order."""
+
+    async def collect() -> list[int]:
+        kwargs_list = ({"a": a, "b": 0} for a in (3, 1, 2))
+        return [outcome.index async for outcome in iter_parallelize_async(async_add, kwargs_list, max_concurrency=3)]
+
+    assert asyncio.run(collect()) == [1, 2, 0]
+
+
+def test_parallelize_async_bounds_concurrency() -> None:
+    """test_parallelize_async_bounds_concurrency."""
+    running = 0
+    peak = 0
+
+    async def track() -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+
+    asyncio.run(parallelize_async(func=track, kwargs_list=[{}] * 50, max_concurrency=5))
+    assert peak == 5
+
+
+def test_parallelize_async_early_error() -> None:
+    """test_parallelize_async_early_error."""
+    kwargs_list: list[dict[str, int | None]] = [{"a": 1, "b": None}, {"a": 50, "b": 1}]
+    with pytest.raises(TypeError):
+        asyncio.run(parallelize_async(func=async_add, kwargs_list=kwargs_list, mode="early_error"))
+
+
+def test_iter_parallelize_thread_streams_generator_input() -> None:
+    """test_iter_parallelize_thread_streams_generator_input."""
+    read = 0
+
+    def kwargs_generator() -> Iterator[dict[str, int]]:
+        nonlocal read
+        for a in range(1000):
+            read += 1
+            yield {"a": a, "b": 1}
+
+    outcomes = iter_parallelize_thread(func=add, kwargs_list=kwargs_generator(), max_workers=2, in_flight_per_worker=2)
+    first = next(outcomes)
+    assert read <= 4
+    results = {outcome.index: outcome.result for outcome in outcomes} | {first.index: first.result}
+    assert results == {a: a + 1 for a in range(1000)}
+
+
+def test_iter_parallelize_process_reports_exceptions() -> None:
+    """test_iter_parallelize_process_reports_exceptions."""
+    kwargs_list: list[dict[str, int | None]] = [{"a": 1, "b": 2}, {"a": 3, "b": None}]
+    outcomes = sorted(iter_parallelize_process(func=add, kwargs_list=kwargs_list), key=lambda outcome: outcome.index)
+    assert outcomes[0].result == 3
+    assert isinstance(outcomes[1].exception, TypeError)
+
+
+@pytest.mark.parametrize("chunksize", [2, 3, None])
+def test_parallelize_process_chunksize(chunksize: int | None) -> None:
+    """test_parallelize_process_chunksize."""
+    kwargs_list: list[dict[str, int | None]] = [{"a": a, "b": 1} for a in range(7)]
+    kwargs_list[4]["b"] = None
+    results = parallelize_process(func=add, kwargs_list=kwargs_list, chunksize=chunksize)
+    assert results.results == [1, 2, 3, 4, 6, 7]
+    assert [type(exception) for exception in results.exceptions] == [TypeError]
+
+
+def test_parallelize_process_chunksize_early_error() -> None:
+    """test_parallelize_process_chunksize_early_error."""
+    kwargs_list: list[dict[str, int | None]] = [{"a": 1, "b": 2}, {"a": 3, "b": None}]
+    with pytest.raises(TypeError):
+        parallelize_process(func=add, kwargs_list=kwargs_list, mode="early_error", chunksize=2)
+
+
+def test_auto_chunksize() -> None:
+    """test_auto_chunksize."""
+    assert auto_chunksize(1000, 4) == 63
+    assert auto_chunksize(3, 8) == 1
+
+
+def make_state(offset: int) -> dict[str, int]:
+    """Worker initializer."""
+    return {"offset": offset, "pid": os.getpid()}
+
+
+def add_offset(a: int) -> tuple[int, int]:
+    """Add the worker's offset."""
+    state = worker_state()
+    return a + state["offset"], state["pid"]
+
+
+def test_worker_pool_initializer_survives_map_calls() -> None:
+    """test_worker_pool_initializer_survives_map_calls."""
+    with WorkerPool(max_workers=1, initializer=make_state, initargs=(10,)) as pool:
+        first = pool.map(func=add_offset, kwargs_list=[{"a": 1}, {"a": 2}])
+        second = pool.map(func=add_offset, kwargs_list=[{"a": 3}], chunksize=None)
+        streamed = [outcome.result for outcome in pool.imap(func=add_offset, kwargs_list=iter([{"a": 4}]))]
+
+    assert [value for value, _ in first.results + second.results + streamed] == [11, 12, 13, 14]
+    assert len({pid for _, pid in first.results + second.results + streamed}) == 1
+
+
+def test_worker_state_outside_pool() -> None:
+    """test_worker_state_outside_pool."""
+    assert worker_state() is None
+
+
+def sleep_then_add(a: int, b: int, seconds: float) -> int:
+    """Sleep, then add."""
+    time.sleep(seconds)
+    return add(a, b)
+
+
+def test_early_error_cancels_queued_tasks() -> None:
+    """test_early_error_cancels_queued_tasks."""
+    kwargs_list: list[dict[str, Any]] = [{"a": 1, "b": None, "seconds": 0}]
+    kwargs_list += [{"a": 1, "b": 1, "seconds": 0.2}] * 20
+    started = time.perf_counter()
+    with pytest.raises(TypeError):
+        parallelize_thread(func=sleep_then_add, kwargs_list=kwargs_list, max_workers=2, mode="early_error")
+    assert time.perf_counter() - started < 1
+
+
+def test_chunked_early_error_cancels_remaining_chunks() -> None:
+    """test_chunked_early_error_cancels_remaining_chunks."""
+    kwargs_list: list[dict[str, Any]] = [{"a": 1, "b": None, "seconds": 0}]
+    kwargs_list += [{"a": 1, "b": 1, "seconds": 0.1}] * 19
+    started = time.perf_counter()
+    with pytest.raises(TypeError):
+        parallelize_process(
+            func=sleep_then_add, kwargs_list=kwargs_list, max_workers=1, mode="early_error", chunksize=2
+        )
+    assert time.perf_counter() - started < 1
+
+
+def test_chunked_progress_counts_calls(caplog: pytest.LogCaptureFixture) -> None:
+    """test_chunked_progress_counts_calls."""
+    snapshots: list[ProgressSnapshot] = []
+    kwargs_list: list[dict[str, int | None]] = [{"a": a, "b": 1} for a in range(10)]
+    kwargs_list[4]["b"] = None
+    with caplog.at_level(logging.INFO, logger="python.parallelize"):
+        parallelize_process(
+            func=add,
+            kwargs_list=kwargs_list,
+            max_workers=1,
+            progress_tracker=4,
+            chunksize=3,
+            progress=snapshots.append,
+        )
+
+    progress = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Progress")]
+    # calls finish three at a time, and one line is logged for each fourth call passed
+    assert len(progress) == 2
+    assert all(message.endswith("/10") for message in progress)
+    assert (snapshots[-1].total, snapshots[-1].completed, snapshots[-1].failed) == (10, 10, 1)
+
+
+@pytest.mark.parametrize("chunksize", [2, None])
+def test_chunked_rejects_task_timeout(chunksize: int | None) -> None:
+    """test_chunked_rejects_task_timeout."""
+    with pytest.raises(ValueError, match="task_timeout"):
+        parallelize_process(func=add, kwargs_list=[{"a": 1, "b": 2}], chunksize=chunksize, task_timeout=1)
+
+
+def test_parallelize_thread_task_timeout() -> None:
+    """test_parallelize_thread_task_timeout."""
+    kwargs_list = [{"a": 1, "b": 2, "seconds": 0}, {"a": 3, "b": 4, "seconds": 2}, {"a": 5, "b": 6, "seconds": 0}]
+    started = time.perf_counter()
+    results = parallelize_thread(func=sleep_then_add, kwargs_list=kwargs_list, max_workers=3, task_timeout=0.2)
+    assert time.perf_counter() - started < 1.5
+    assert results.results == [3, 11]
+    assert results.timed_out == [1]
+    assert [type(exception) for exception in results.exceptions] == [TimeoutError]
+    assert repr(results).endswith("timed_out=[1]")
+
+
+def test_parallelize_thread_overall_timeout() -> None:
+    """test_parallelize_thread_overall_timeout."""
+    kwargs_list = [{"a": 1, "b": 2, "seconds": 0}] + [{"a": 3, "b": 4, "seconds": 2}] * 3
+    results = parallelize_thread(func=sleep_then_add, kwargs_list=kwargs_list, max_workers=2, timeout=0.3)
+    assert results.results == [3]
+    assert results.timed_out == [1, 2, 3]
+
+
+def test_adaptive_concurrency_climbs_while_throughput_grows() -> None:
+    """test_adaptive_concurrency_climbs_while_throughput_grows."""
+    controller = AdaptiveConcurrency(min_workers=1, max_workers=4)
+    assert [controller.update(throughput, 1.0) for throughput in (10, 20, 30, 40, 50)] == [2, 3, 4, 4, 4]
+
+
+def test_adaptive_concurrency_backs_off_and_holds() -> None:
+    """test_adaptive_concurrency_backs_off_and_holds."""
+    controller = AdaptiveConcurrency(min_workers=1, max_workers=8)
+    levels = [controller.update(throughput, 1.0) for throughput in (10, 20, 30, 20, 20.5, 20)]
+    assert levels == [2, 3, 4, 3, 3, 3]
+
+
+def test_adaptive_concurrency_shrinks_on_latency() -> None:
+    """test_adaptive_concurrency_shrinks_on_latency."""
+    controller = AdaptiveConcurrency(min_workers=2, max_workers=8, initial=4)
+    assert controller.update(40, 1.0) == 5
+    assert controller.update(60, 3.0) == 4
+    assert controller.history == [(4, 40, 1.0), (5, 60, 3.0)]
+
+
+def test_adaptive_concurrency_rejects_bad_bounds() -> None:
+    """test_adaptive_concurrency_rejects_bad_bounds."""
+    with pytest.raises(ValueError, match="min_workers <= max_workers"):
+        AdaptiveConcurrency(min_workers=3, max_workers=2)
+
+
+def test_parallelize_process_adaptive() -> None:
+    """test_parallelize_process_adaptive."""
+    kwargs_list = [{"a": 1, "b": 2}, {"a": 3, "b": None}, {"a": 5, "b": 6}]
+    results = parallelize_process_adaptive(func=add, kwargs_list=iter(kwargs_list), max_workers=2)
+    assert results.results == [3, 11]
+    assert [type(exception) for exception in results.exceptions] == [TypeError]
+    assert results.concurrency in {1, 2}
+    assert repr(results).endswith(f"concurrency={results.concurrency}")
@@ -0,0 +1,24 @@
+"""Tests for the parallelize dispatch benchmark."""
+
+from __future__ import annotations
+
+from python.tools.parallelize_benchmark import DispatchTiming, crossover, spin
+
+
+def test_spin():
+    assert spin(4) == 0 + 1 + 4 + 9
+
+
+def test_crossover():
+    timings = [
+        DispatchTiming(cost=1, per_task=10.0, chunked=1.0),
+        DispatchTiming(cost=100, per_task=2.0, chunked=1.0),
+        DispatchTiming(cost=10_000, per_task=1.02, chunked=1.0),
+        DispatchTiming(cost=1_000_000, per_task=1.0, chunked=1.0),
+    ]
+
+    assert crossover(timings) == 10_000
+
+
+def test_crossover_never_reached():
+    assert crossover([DispatchTiming(cost=1, per_task=3.0, chunked=1.0)]) is None
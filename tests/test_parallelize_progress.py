@@ -0,0 +1,99 @@
+"""Tests for the parallelize progress metrics."""
+
+from __future__ import annotations
+
+import logging
+
+from python.parallelize import parallelize_thread
+from python.parallelize_progress import (
+    LogReporter,
+    ProgressMetrics,
+    ProgressSnapshot,
+    PrometheusTextfileExporter,
+    percentile,
+)
+
+
+def _snapshot(**overrides) -> ProgressSnapshot:
+    values = {
+        "total": 10,
+        "completed": 4,
+        "failed": 1,
+        "in_flight": 2,
+        "workers": 2,
+        "elapsed": 2.0,
+        "p50_latency": 0.5,
+        "p95_latency": 0.9,
+        "busy_seconds": 3.0,
+    }
+    return ProgressSnapshot(**(values | overrides))
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def test_snapshot_rate_and_utilization():
+    snapshot = _snapshot()
+
+    assert snapshot.rate == 2.0
+    assert snapshot.utilization == 0.75
+
+
+def test_percentile():
+    ordered = [float(value) for value in range(1, 101)]
+
+    assert percentile(ordered, 0.5) == 51.0
+    assert percentile(ordered, 0.95) == 96.0
+    assert percentile([], 0.5) is None
+
+
+def test_progress_metrics_reports_final_snapshot():
+    snapshots: list[ProgressSnapshot] = []
+    metrics = ProgressMetrics(snapshots.append, total=3, workers=2, interval=3600)
+
+    metrics.task_finished(0.2, failed=False, pending=2)
+    metrics.task_finished(None, failed=True, pending=1)
+    metrics.finish()
+
+    assert len(snapshots) == 1
+    assert snapshots[0].final
+    assert (snapshots[0].completed, snapshots[0].failed, snapshots[0].in_flight) == (2, 1, 0)
+    assert snapshots[0].p50_latency == 0.2
+
+
+def test_parallelize_thread_progress_callback():
+    snapshots: list[ProgressSnapshot] = []
+    kwargs_list = [{"a": 1, "b": 2}, {"a": 3, "b": None}, {"a": 5, "b": 6}]
+
+    results = parallelize_thread(func=add, kwargs_list=kwargs_list, max_workers=2, progress=snapshots.append)
+
+    assert results.results == [3, 11]
+    final = snapshots[-1]
+    assert final.final
+    assert (final.total, final.completed, final.failed, final.workers) == (3, 3, 1, 2)
+    assert final.p50_latency is not None
+
+
+def test_log_reporter_throttles(caplog):
+    reporter = LogReporter(name="ingest", every=10)
+
+    with caplog.at_level(logging.INFO):
+        reporter(_snapshot(elapsed=1.0))
+        reporter(_snapshot(elapsed=5.0))
+        reporter(_snapshot(elapsed=6.0, final=True))
+
+    assert len(caplog.records) == 2
+    assert caplog.records[0].getMessage().startswith("ingest progress: 4/10 done (1 failed), 4.0 tasks/s")
+
+
+def test_prometheus_textfile_exporter(tmp_path):
+    path = tmp_path / "ingest.prom"
+
+    PrometheusTextfileExporter(path, job="ingest")(_snapshot())
+
+    text = path.read_text()
+    assert 'parallelize_tasks_completed{job="ingest"} 4\n' in text
+    assert 'parallelize_task_latency_seconds{job="ingest",quantile="0.95"} 0.9\n' in text
+    assert "# TYPE parallelize_worker_utilization gauge\n" in text
+    assert list(tmp_path.iterdir()) == [path]